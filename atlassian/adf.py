@@ -1,5 +1,64 @@
 import logging
-from atlassian_doc_builder import load_adf, ADFDoc
+import jsonschema
+from functools import cache
+from atlassian_doc_builder.adf_object import adf_schema
+from pagination.pagination import DescriptionPaginator
+from log_handler.log_handler import LogSummary
+from findings.findings import Finding
+
+# Validate the documents against the ADF schema, set by set_schema_validation()
+schema_validation = True
+
+# Get the ADF JSON schema. It is downloaded once per process, instead of once per validated document.
+@cache
+def get_adf_schema() -> dict:
+    return adf_schema()
+
+# Enable or disable the validation of the documents against the ADF schema. The schema is downloaded, so it's disabled to run without network access, e.g. with the fake JIRA
+def set_schema_validation(enabled: bool):
+
+    global schema_validation
+    schema_validation = enabled
+
+# ADF Document - an Atlassian Document Format document rendered straight from dicts, without building a node object per heading or paragraph.
+# The document is validated against the ADF schema at most once and its serialized payload is cached, so it can be logged, digested and sent to JIRA as is.
+class ADFDocument():
+
+    # ADFDocument Constructor
+    # content: List of ADF node dicts, e.g. headings and paragraphs
+    #
+    # Returns: ADFDocument object
+    # Raises: None
+    def __init__(self, content: list):
+        self.document = {
+            'version': 1,
+            'type': 'doc',
+            'content': content
+        }
+        self.__is_valid = False
+        self.__payload = None
+
+    # Validate the document against the ADF schema on the first call, unless the schema validation is disabled, returns the document dict
+    # Raises: jsonschema.ValidationError if the document is not valid ADF
+    def validate(self) -> dict:
+
+        if not self.__is_valid and schema_validation:
+            jsonschema.validate(self.document, get_adf_schema())
+            self.__is_valid = True
+
+        return self.document
+
+    # Serialized document, as sent in the description of a JIRA issue
+    @property
+    def payload(self) -> str:
+
+        if self.__payload is None:
+            self.__payload = str(self.validate())
+
+        return self.__payload
+
+    def __str__(self) -> str:
+        return self.payload
 
 # Atlassian Document Format Builder - Python class to build formatted documents for Atlassian products (Jira, Confluence)
 class AtlassianDocumentFormatBuilder():
@@ -145,15 +204,15 @@ class AtlassianDocumentFormatBuilder():
             ]
         }
     
-    def build_atlassian_document_format_from_SARIF(self, result: dict, index: str = "Unknown") -> tuple[str, ADFDoc]:
+    def build_atlassian_document_format_from_SARIF(self, result: dict, index: str = "Unknown") -> tuple[str, ADFDocument]:
 
         try:
-            self.logger.debug("SARIF Issue #" + index + " - " + str(result))
+            self.logger.debug("SARIF Issue #%s - %s", index, LogSummary(result))
 
             # Build a content block
-            adf_doc = ADFDoc()
+            adf_content = []
 
-            # TODO: Switch each location into a Sub-Task in JIRA instead of adding additional ADF formatted text in the JIRA Issue description 
+            # Each location is also a Sub-Task in JIRA when `jira.create_sub_tasks` is set, see SubTasks
             for location in result["locations"]:
 
                 self.logger.info(
@@ -166,14 +225,15 @@ class AtlassianDocumentFormatBuilder():
                     str(location["physicalLocation"]["region"]["endColumn"])
                 )
 
-                adf_doc.add(
-                    load_adf(self.__add_heading(heading_level=4, heading_text=result["ruleId"] + ": " + result["message"]["text"] + " - " + location["physicalLocation"]["artifactLocation"]["uri"]))
+                adf_content.append(
+                    self.__add_heading(heading_level=4, heading_text=result["ruleId"] + ": " + result["message"]["text"] + " - " + location["physicalLocation"]["artifactLocation"]["uri"])
                 )
 
-                adf_doc.add(
-                    load_adf(self.__add_paragraph(paragraph_text="Start Line: #" + str(location["physicalLocation"]["region"]["startLine"]) + ", character " + str(location["physicalLocation"]["region"]["startColumn"]) + "\nEnd Line: #" + str(location["physicalLocation"]["region"]["endLine"]) + ", character " + str(location["physicalLocation"]["region"]["endColumn"])))
+                adf_content.append(
+                    self.__add_paragraph(paragraph_text="Start Line: #" + str(location["physicalLocation"]["region"]["startLine"]) + ", character " + str(location["physicalLocation"]["region"]["startColumn"]) + "\nEnd Line: #" + str(location["physicalLocation"]["region"]["endLine"]) + ", character " + str(location["physicalLocation"]["region"]["endColumn"]))
                 )
 
+            adf_doc = ADFDocument(content=adf_content)
             adf_doc.validate()
             return (
                 result["ruleId"] + ": " + result["message"]["text"] + " - " + location["physicalLocation"]["artifactLocation"]["uri"],
@@ -184,36 +244,30 @@ class AtlassianDocumentFormatBuilder():
             self.logger.error(e)
             return None
         
-    def build_atlassian_document_format_from_dict(self, sarif_tool_name: str, key: str, results: list, index: str = "Unknown") -> tuple[str, ADFDoc]:
+    def build_atlassian_document_format_from_dict(self, sarif_tool_name: str, key: str, results: list, index: str = "Unknown") -> tuple[str, ADFDocument]:
 
         try:
-            self.logger.debug("Issue in " + key + " - " + str(results))
+            self.logger.debug("Issue in %s - %s", key, LogSummary(results))
 
             # Build a content block
-            adf_doc = ADFDoc()
+            adf_content = []
+
+            # Checked once, logging every finding is only worth its cost when debugging
+            debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
 
-            # TODO: Switch each location into a Sub-Task in JIRA instead of adding additional ADF formatted text in the JIRA Issue description 
+            # Each finding also gets a sub-task of its own when `jira.create_sub_tasks` is set, see SubTasks
             for result in results:
-                
-                self.logger.debug(__name__ + \
-                    ": [" + sarif_tool_name + "] " + \
-                    result["ruleId"] + ": " + \
-                    result["message"] + " - " + \
-                    key + " " + \
-                    str(result["startLine"]) + ":" + \
-                    str(result["startColumn"]) + "-" + \
-                    str(result["endLine"]) + ":" + \
-                    str(result["endColumn"])
-                )
 
-                adf_doc.add(
-                    load_adf(self.__add_heading(heading_level=4, heading_text=result["ruleId"] + ": " + result["message"] + " - " + key))
-                )
+                if debug_enabled:
+                    self.logger.debug(
+                        "%s: [%s] %s: %s - %s %s:%s-%s:%s", __name__, sarif_tool_name, result.ruleId, result.message, key,
+                        result.startLine, result.startColumn, result.endLine, result.endColumn
+                    )
 
-                adf_doc.add(
-                    load_adf(self.__add_paragraph(paragraph_text="Start Line: #" + str(result["startLine"]) + ", character " + str(result["startColumn"]) + "\nEnd Line: #" + str(result["endLine"]) + ", character " + str(result["endColumn"])))
-                )
+                adf_content += self.__build_finding_nodes(key=key, result=result)
 
+            # Validated once here, the payload is reused for logging, the digest and the JIRA request
+            adf_doc = ADFDocument(content=adf_content)
             adf_doc.validate()
             return (
                 key,
@@ -222,4 +276,65 @@ class AtlassianDocumentFormatBuilder():
         
         except Exception as e:
             self.logger.error(e)
-            return None
\ No newline at end of file
+            return None
+
+    # Build the heading and paragraph of a finding of a file. Findings grouped by something else than their file carry its name under `file`
+    def __build_finding_nodes(self, key: str, result: Finding) -> list:
+        return [
+            self.__add_heading(heading_level=4, heading_text=result.ruleId + ": " + result.message + " - " + (result.file or key)),
+            self.__add_paragraph(paragraph_text="Start Line: #" + str(result.startLine) + ", character " + str(result.startColumn) + "\nEnd Line: #" + str(result.endLine) + ", character " + str(result.endColumn))
+        ]
+
+    # Shorten the heading of a finding until its nodes fit in max_length characters of a description
+    def __truncate_finding_nodes(self, nodes: list, max_length: int) -> list:
+
+        heading_text = nodes[0]['content'][0]['text']
+
+        while self.__get_nodes_length(nodes) > max_length and len(heading_text) > 1:
+            heading_text = heading_text[:max(1, len(heading_text) - (self.__get_nodes_length(nodes) - max_length) - 1)]
+            nodes = [self.__add_heading(heading_level=4, heading_text=heading_text + '…')] + nodes[1:]
+
+        return nodes
+
+    # Length the nodes add to the serialized payload of a document, separators included
+    def __get_nodes_length(self, nodes: list) -> int:
+        return sum(len(str(node)) + len(', ') for node in nodes)
+
+    # Build the ADF description of a single finding of a file, e.g. for its sub-task. Returns None if the finding can't be rendered.
+    def build_atlassian_document_format_from_finding(self, key: str, result: Finding) -> ADFDocument:
+
+        try:
+            adf_doc = ADFDocument(content=self.__build_finding_nodes(key=key, result=result))
+            adf_doc.validate()
+            return adf_doc
+
+        except Exception as e:
+            self.logger.error(e)
+            return None
+
+    # Build the ADF descriptions of the findings of a file, split into pages whose payload fits in a JIRA issue description, see DescriptionPaginator.
+    # Returns a list of ADFDocument, one per page, or None if a finding can't be rendered.
+    def build_atlassian_document_format_pages_from_dict(self, sarif_tool_name: str, key: str, results: list, paginator: DescriptionPaginator) -> list[ADFDocument]:
+
+        try:
+            self.logger.debug("[" + sarif_tool_name + "] Issue in " + key + " - " + str(len(results)) + " finding(s)")
+
+            pages = paginator.paginate(
+                blocks=[self.__build_finding_nodes(key=key, result=result) for result in results],
+                get_length=self.__get_nodes_length,
+                envelope_length=len(str(ADFDocument(content=[]).document)),
+                continuation_block=[self.__add_paragraph(paragraph_text="Findings continued from " + key)],
+                truncate_block=self.__truncate_finding_nodes
+            )
+
+            adf_docs = []
+            for page in pages:
+                adf_doc = ADFDocument(content=[node for nodes in page for node in nodes])
+                adf_doc.validate()
+                adf_docs.append(adf_doc)
+
+            return adf_docs
+
+        except Exception as e:
+            self.logger.error(e)
+            return None
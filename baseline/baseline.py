@@ -0,0 +1,104 @@
+import logging
+import os
+from sarif_file_handler.sarif_file_handler import SARIFFileHandler
+from sarif_file_handler.sarif_source import get_file_sarif_sources
+from state.state import StateStore
+
+# SARIFBaseline - class to diff the findings of a run against a baseline, either baseline SARIF files or the fingerprints recorded by the previous run.
+# Findings are compared by fingerprint per tool and file, so only files whose set of findings changed need to be published to JIRA.
+class SARIFBaseline:
+
+    # SARIFBaseline Constructor
+    # logger: Logger object
+    #
+    # Returns: SARIFBaseline object
+    # Raises: None
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self.fingerprints = {} # tool name -> file name -> set of fingerprints
+
+    # Load the baseline from a SARIF file, or from the SARIF files in a directory. SARIF files may be gzip compressed or in zip bundles
+    def load_from_sarif_files(self, sarif_handler: SARIFFileHandler, baseline_path: str):
+
+        if os.path.isdir(baseline_path):
+            baseline_files_list = [ sarif_source for file in os.listdir(baseline_path) for sarif_source in get_file_sarif_sources(file_path=os.path.join(baseline_path, file), logger=self.logger) ]
+        elif os.path.isfile(baseline_path):
+            baseline_files_list = get_file_sarif_sources(file_path=baseline_path, logger=self.logger) or [ baseline_path ]
+        else:
+            raise Exception("Baseline SARIF file or directory does not exist - " + baseline_path)
+
+        for baseline_file_path, sarif_tool_name, _, _, sarif_fingerprints in sarif_handler.load_sarif_findings(sarif_files_list=baseline_files_list):
+            self.logger.debug("Baseline SARIF file loaded - " + baseline_file_path)
+            self.__add_fingerprints(fingerprints=self.fingerprints, sarif_tool_name=sarif_tool_name, sarif_fingerprints=sarif_fingerprints)
+
+        self.logger.info("Baseline loaded from SARIF file(s) - " + str(len(baseline_files_list)))
+
+    # Load the baseline from the fingerprints recorded in the state store by the previous run
+    def load_from_state(self, state_store: StateStore):
+
+        self.fingerprints = state_store.get_fingerprints()
+        self.logger.info("Baseline loaded from the previous run - " + str(sum(len(files) for files in self.fingerprints.values())) + " file(s)")
+
+    # Merge the fingerprints of a SARIF file into a tool name -> file name -> set of fingerprints dict
+    def __add_fingerprints(self, fingerprints: dict, sarif_tool_name: str, sarif_fingerprints: dict):
+
+        tool_fingerprints = fingerprints.setdefault(sarif_tool_name, {})
+
+        for file_name, file_fingerprints in sarif_fingerprints.items():
+            tool_fingerprints.setdefault(file_name, set()).update(file_fingerprints)
+
+    # Diff the fingerprints of a SARIF file against the baseline of its tool, returns a tuple of two lists of files:
+    # - files with new findings, or no findings in the baseline, to publish right away
+    # - files whose findings are a strict subset of the baseline. Some findings may be fixed, or reported by another SARIF file of the same tool,
+    #   so they are only known to have changed once all SARIF files are loaded, see get_fixed_files_of_tool()
+    def get_changed_files(self, sarif_tool_name: str, sarif_fingerprints: dict) -> tuple[list[str], list[str]]:
+
+        baseline_fingerprints = self.fingerprints.get(sarif_tool_name, {})
+        new_count = unchanged_count = 0
+        changed_files, subset_files = [], []
+
+        for file_name, file_fingerprints in sarif_fingerprints.items():
+
+            baseline_file_fingerprints = baseline_fingerprints.get(file_name, set())
+
+            new_findings = len(file_fingerprints - baseline_file_fingerprints)
+            new_count += new_findings
+            unchanged_count += len(file_fingerprints) - new_findings
+
+            if new_findings > 0:
+                changed_files.append(file_name)
+            elif file_fingerprints != baseline_file_fingerprints:
+                subset_files.append(file_name)
+
+        self.logger.info(
+            "[" + str(sarif_tool_name) + "]: Findings compared to the baseline - " + str(new_count) + " new, " + str(unchanged_count) + " unchanged. " + \
+            "File(s) to publish - " + str(len(changed_files)) + " of " + str(len(sarif_fingerprints)) + ", to check once all SARIF files are loaded - " + str(len(subset_files))
+        )
+
+        return changed_files, subset_files
+
+    # Get the files of a tool, out of file_names, whose findings across all SARIF files of this run differ from the baseline, i.e. some of their findings were fixed
+    def get_fixed_files_of_tool(self, current_fingerprints: dict, sarif_tool_name: str, file_names: list[str]) -> list[str]:
+
+        baseline_fingerprints = self.fingerprints.get(sarif_tool_name, {})
+        tool_fingerprints = current_fingerprints.get(sarif_tool_name, {})
+
+        return [ file_name for file_name in file_names if tool_fingerprints.get(file_name, set()) != baseline_fingerprints.get(file_name, set()) ]
+
+    # Get the files that had findings in the baseline and have none left in this run, across all tools. current_fingerprints is a tool name -> file name -> set of fingerprints dict.
+    def get_fixed_files(self, current_fingerprints: dict) -> list[str]:
+
+        current_files = set(file_name for tool_fingerprints in current_fingerprints.values() for file_name in tool_fingerprints)
+
+        fixed_files = []
+        for tool_fingerprints in self.fingerprints.values():
+            for file_name in tool_fingerprints:
+                if file_name not in current_files and file_name not in fixed_files:
+                    fixed_files.append(file_name)
+
+        self.logger.info("File(s) with all findings fixed since the baseline - " + str(len(fixed_files)))
+        return fixed_files
+
+    # Merge the fingerprints of a SARIF file of this run into current_fingerprints, a tool name -> file name -> set of fingerprints dict
+    def add_current_fingerprints(self, current_fingerprints: dict, sarif_tool_name: str, sarif_fingerprints: dict):
+        self.__add_fingerprints(fingerprints=current_fingerprints, sarif_tool_name=sarif_tool_name, sarif_fingerprints=sarif_fingerprints)
@@ -0,0 +1,54 @@
+import datetime
+import logging
+import time
+from sarif.sarif_file import SarifFile
+from sarif_file_handler.sarif_file_handler import SARIFFileHandler
+from utils.utils import Utils
+from benchmarks.synthetic_sarif import SYNTHETIC_TOOL_NAME, generate_sarif_report
+
+# Benchmark for SARIFFileHandler.build_sarif_findings_dict on synthetic reports of increasing size.
+# Run from the repository root: python -m benchmarks.benchmark_findings_grouping
+#
+# The grouping is expected to scale linearly with the number of results, i.e. the time per result stays flat
+# as the report grows. The file count grows with the report (3k files for a 40k-result report) to mirror real reports.
+
+REPORT_SIZES = [1000, 10000, 100000]
+RESULTS_PER_FILE = 13
+ROUNDS = 3
+
+def main():
+
+    logger = logging.getLogger(__name__)
+    logger.setLevel('INFO')
+
+    sarifObj = SARIFFileHandler(logger=logger, utils=Utils(logger=logger))
+
+    timings = []
+    for result_count in REPORT_SIZES:
+
+        sarif_data = SarifFile(
+            'synthetic-' + str(result_count) + '.sarif',
+            generate_sarif_report(result_count=result_count, file_count=max(1, result_count // RESULTS_PER_FILE)),
+            mtime=datetime.datetime.now()
+        )
+
+        best_time = None
+        for _ in range(ROUNDS):
+            start_time = time.perf_counter()
+            sarif_findings = sarifObj.build_sarif_findings_dict(sarif_tool_name=SYNTHETIC_TOOL_NAME, sarif_data=sarif_data)
+            elapsed_time = time.perf_counter() - start_time
+            best_time = elapsed_time if best_time is None else min(best_time, elapsed_time)
+
+        timings.append((result_count, best_time))
+        print(
+            str(result_count).rjust(7) + ' results, ' + str(len(sarif_findings)).rjust(6) + ' files: ' +
+            format(best_time * 1000, '.2f') + ' ms (' + format(best_time / result_count * 1e9, '.0f') + ' ns/result)'
+        )
+
+    # Compare the cost per result of the largest report with the smallest one. Linear scaling keeps the ratio close to 1.
+    smallest_cost = timings[0][1] / timings[0][0]
+    largest_cost = timings[-1][1] / timings[-1][0]
+    print('Cost per result ratio (' + str(REPORT_SIZES[-1]) + ' vs ' + str(REPORT_SIZES[0]) + '): ' + format(largest_cost / smallest_cost, '.2f'))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import datetime
+import logging
+import os
+import tempfile
+import time
+from sarif.sarif_file import SarifFile
+from sarif_file_handler.sarif_file_handler import SARIFFileHandler
+from log_handler.log_handler import LogSummary
+from utils.utils import Utils
+from benchmarks.synthetic_sarif import SYNTHETIC_TOOL_NAME, generate_sarif_report
+
+# Benchmark for the logging overhead of grouping the findings of a report and logging them per file, the way main.publish_sarif_findings does.
+# Run from the repository root: python -m benchmarks.benchmark_logging
+#
+# - eager: the log messages are concatenated before the logger checks its level, every result is stringified for a DEBUG record,
+#   and the findings of every file are logged at INFO in full, as before LogSummary
+# - lazy: the log messages are formatted only if emitted, the per-result records are behind a level guard, and values are capped at LOG_MAX_LENGTH
+#
+# Each mode runs at INFO and DEBUG, logging to a temporary file, and reports the time and the bytes written to the log file.
+# At INFO the lazy mode formats and writes nothing, at DEBUG both modes pay for the records they write.
+
+REPORT_SIZES = [ 10000, 40000 ]
+RESULTS_PER_FILE = 13
+ROUNDS = 3
+
+# Group the results and log them as before the logs were deferred
+def run_eager(logger: logging.Logger, sarifObj: SARIFFileHandler, sarif_data: SarifFile):
+
+    for result in sarif_data.get_results():
+        logger.debug("[" + SYNTHETIC_TOOL_NAME + "]: " + str(result))
+
+    sarif_findings = sarifObj.build_sarif_findings_dict(sarif_tool_name=SYNTHETIC_TOOL_NAME, sarif_data=sarif_data)
+
+    for sarif_per_file_key in sarif_findings.keys():
+        logger.info("[" + SYNTHETIC_TOOL_NAME + "]: " + str(sarif_findings[sarif_per_file_key]))
+
+# Group the results and log them as publish_sarif_findings does
+def run_lazy(logger: logging.Logger, sarifObj: SARIFFileHandler, sarif_data: SarifFile):
+
+    sarif_findings = sarifObj.build_sarif_findings_dict(sarif_tool_name=SYNTHETIC_TOOL_NAME, sarif_data=sarif_data)
+
+    for sarif_per_file_key in sarif_findings.keys():
+        logger.debug("[%s]: %s - %d finding(s) - %s", SYNTHETIC_TOOL_NAME, sarif_per_file_key, len(sarif_findings[sarif_per_file_key]), LogSummary(sarif_findings[sarif_per_file_key]))
+
+def main():
+
+    with tempfile.TemporaryDirectory() as work_directory:
+
+        log_file_path = os.path.join(work_directory, 'benchmark.log')
+        log_handler = logging.FileHandler(log_file_path)
+        log_handler.setFormatter(logging.Formatter('%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s', datefmt='%H:%M:%S'))
+
+        logger = logging.getLogger(__name__)
+        logger.propagate = False
+        logger.addHandler(log_handler)
+
+        # The lazy grouping logs through the same logger, as it does in a run. The eager mode logs every result itself, so its grouping is quiet
+        sarifObj = SARIFFileHandler(logger=logger, utils=Utils(logger=logger))
+        quiet_logger = logging.getLogger(__name__ + '.quiet')
+        quiet_logger.propagate = False
+        quiet_logger.setLevel('WARNING')
+        quiet_sarifObj = SARIFFileHandler(logger=quiet_logger, utils=Utils(logger=quiet_logger))
+
+        for result_count in REPORT_SIZES:
+
+            sarif_data = SarifFile(
+                'synthetic-' + str(result_count) + '.sarif',
+                generate_sarif_report(result_count=result_count, file_count=max(1, result_count // RESULTS_PER_FILE)),
+                mtime=datetime.datetime.now()
+            )
+
+            for log_level in [ 'INFO', 'DEBUG' ]:
+                logger.setLevel(log_level)
+
+                timings = {}
+                for mode_name, run_mode, mode_sarifObj in [ ('eager', run_eager, quiet_sarifObj), ('lazy', run_lazy, sarifObj) ]:
+
+                    best_time, log_bytes = None, 0
+                    for _ in range(ROUNDS):
+                        log_handler.stream.truncate(0)
+                        log_handler.stream.seek(0)
+
+                        start_time = time.perf_counter()
+                        run_mode(logger=logger, sarifObj=mode_sarifObj, sarif_data=sarif_data)
+                        log_handler.flush()
+                        elapsed_time = time.perf_counter() - start_time
+
+                        best_time = elapsed_time if best_time is None else min(best_time, elapsed_time)
+                        log_bytes = os.path.getsize(log_file_path)
+
+                    timings[mode_name] = best_time
+                    print(
+                        str(result_count).rjust(6) + ' results, ' + log_level.ljust(5) + ' ' + mode_name.ljust(5) + ': ' +
+                        format(best_time * 1000, '.1f').rjust(8) + ' ms, ' + format(log_bytes / 1e6, '.2f').rjust(7) + ' MB logged'
+                    )
+
+                print(str(result_count).rjust(6) + ' results, ' + log_level.ljust(5) + ' speedup: ' + format(timings['eager'] / timings['lazy'], '.1f') + 'x')
+
+        logger.removeHandler(log_handler)
+        log_handler.close()
+
+if __name__ == "__main__":
+    main()
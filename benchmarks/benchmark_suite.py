@@ -0,0 +1,248 @@
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import atlassian.adf
+from atlassian.adf import AtlassianDocumentFormatBuilder
+from sarif_file_handler.sarif_file_handler import SARIFFileHandler
+from utils.utils import Utils
+from benchmarks.synthetic_sarif import generate_sarif_report
+
+# Benchmark suite - times the SARIF pipeline stages on synthetic reports and measures their peak memory:
+# - load_sarif_data: parse a SARIF file
+# - build_sarif_findings_dict: group the results by file
+# - serialize_finding_attributes: render the plain text description of every finding
+# - adf_render: render the Atlassian Document Format description of every file
+#
+# Run from the repository root, e.g.:
+#
+#   python -m benchmarks.benchmark_suite --result-counts 1000,10000 --skews 0,1.2 --code-flow-steps 0,20 --output bench.json
+#   python -m benchmarks.benchmark_suite --output bench-new.json --compare bench.json
+#
+# Every combination of result count, skew and code flow size is a scenario. The results are written as JSON, keyed by scenario name,
+# so the files of two releases can be compared: --compare prints the time and memory ratios against a previous file, and exits with
+# status 1 when a benchmark got slower, or used more memory, than --threshold allows.
+
+BENCHMARK_FORMAT_VERSION = 1
+RESULTS_PER_FILE = 13
+
+# Time a function as the best of `rounds` runs, then measure its peak memory in one more run. Memory is traced in a separate run,
+# as tracing slows down the code it measures. Returns the best time in seconds, the peak memory in bytes and the result of the last run.
+def measure(function, rounds: int) -> tuple[float, int, any]:
+
+    best_time = None
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        result = function()
+        elapsed_time = time.perf_counter() - start_time
+        best_time = elapsed_time if best_time is None else min(best_time, elapsed_time)
+
+    tracemalloc.start()
+    try:
+        result = function()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return best_time, peak_bytes, result
+
+# Get the name of a scenario, the key used to compare two benchmark files
+def get_scenario_name(result_count: int, file_count: int, skew: float, code_flow_steps: int) -> str:
+    return 'results=' + str(result_count) + ',files=' + str(file_count) + ',skew=' + format(skew, 'g') + ',code_flow_steps=' + str(code_flow_steps)
+
+# Run the benchmarks of a scenario, returns the scenario dict
+def run_scenario(logger: logging.Logger, work_directory: str, result_count: int, file_count: int, skew: float, code_flow_steps: int, rounds: int) -> dict:
+
+    utils = Utils(logger=logger)
+    sarifObj = SARIFFileHandler(logger=logger, utils=utils)
+    adf_builder = AtlassianDocumentFormatBuilder(logger=logger)
+
+    sarif_file_path = os.path.join(work_directory, 'synthetic-' + str(result_count) + '.sarif')
+    with open(sarif_file_path, 'w') as sarif_file:
+        json.dump(generate_sarif_report(result_count=result_count, file_count=file_count, skew=skew, code_flow_steps=code_flow_steps), sarif_file)
+    sarif_file_bytes = os.path.getsize(sarif_file_path)
+
+    benchmarks = {}
+
+    def add_benchmark(benchmark_name: str, function) -> any:
+        seconds, peak_bytes, result = measure(function=function, rounds=rounds)
+        benchmarks[benchmark_name] = {
+            'seconds': round(seconds, 6),
+            'peak_bytes': peak_bytes,
+            'ns_per_result': round(seconds / result_count * 1e9)
+        }
+        return result
+
+    sarif_tool_name, sarif_data = add_benchmark('load_sarif_data', lambda: sarifObj.load_sarif_data(sarif_file_path=sarif_file_path))
+
+    sarif_findings = add_benchmark('build_sarif_findings_dict', lambda: sarifObj.build_sarif_findings_dict(sarif_tool_name=sarif_tool_name, sarif_data=sarif_data))
+
+    add_benchmark('serialize_finding_attributes', lambda: [
+        utils.serialize_finding_attributes(finding_file_key=file_key, findings=finding)
+        for file_key, findings in sarif_findings.items() for finding in findings
+    ])
+
+    add_benchmark('adf_render', lambda: [
+        adf_builder.build_atlassian_document_format_from_dict(sarif_tool_name=sarif_tool_name, key=file_key, results=findings)
+        for file_key, findings in sarif_findings.items()
+    ])
+
+    os.remove(sarif_file_path)
+
+    return {
+        'parameters': {
+            'result_count': result_count,
+            'file_count': file_count,
+            'files_with_findings': len(sarif_findings),
+            'largest_file_findings': max((len(findings) for findings in sarif_findings.values()), default=0),
+            'skew': skew,
+            'code_flow_steps': code_flow_steps,
+            'sarif_file_bytes': sarif_file_bytes
+        },
+        'benchmarks': benchmarks
+    }
+
+# Check that the ADF schema can be downloaded. Offline, the documents are not validated, so adf_render
+# measures the rendering only. The benchmark file records it, as the two timings are not comparable.
+def check_adf_validation(logger: logging.Logger) -> bool:
+
+    try:
+        atlassian.adf.get_adf_schema()
+        return True
+
+    except Exception as e:
+        logger.warning("ADF schema unavailable, adf_render is measured without schema validation - " + str(e))
+        atlassian.adf.set_schema_validation(enabled=False)
+        return False
+
+# Compare a benchmark run with a previous one, returns the list of regressions
+def compare(current: dict, previous: dict, threshold: float) -> list[str]:
+
+    regressions = []
+
+    if current['environment']['adf_validation'] != previous['environment'].get('adf_validation'):
+        print('Warning: adf_render was measured with and without ADF schema validation, its timings are not comparable.')
+
+    for scenario_name, scenario in current['scenarios'].items():
+
+        previous_scenario = previous['scenarios'].get(scenario_name)
+        if previous_scenario is None:
+            print(scenario_name + ': not in the previous run')
+            continue
+
+        print(scenario_name)
+        for benchmark_name, benchmark in scenario['benchmarks'].items():
+
+            previous_benchmark = previous_scenario['benchmarks'].get(benchmark_name)
+            if previous_benchmark is None:
+                continue
+
+            time_ratio = benchmark['seconds'] / previous_benchmark['seconds'] if previous_benchmark['seconds'] else 1.0
+            memory_ratio = benchmark['peak_bytes'] / previous_benchmark['peak_bytes'] if previous_benchmark['peak_bytes'] else 1.0
+
+            flags = []
+            if time_ratio > 1 + threshold:
+                flags.append('SLOWER')
+            if memory_ratio > 1 + threshold:
+                flags.append('MORE MEMORY')
+            if flags:
+                regressions.append(scenario_name + ' ' + benchmark_name + ' - ' + ', '.join(flags))
+
+            print(
+                '  ' + benchmark_name.ljust(30) + ' time x' + format(time_ratio, '.2f') + ', peak memory x' + format(memory_ratio, '.2f') + \
+                ('  <- ' + ', '.join(flags) if flags else '')
+            )
+
+    return regressions
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Benchmark the SARIF pipeline stages on synthetic SARIF reports')
+    parser.add_argument('--result-counts', default='1000,10000', help='Comma-separated numbers of results per report')
+    parser.add_argument('--results-per-file', type=int, default=RESULTS_PER_FILE, help='Average number of findings per file, sets the file count')
+    parser.add_argument('--skews', default='0,1.2', help='Comma-separated Zipf exponents of the findings per file. 0 spreads them evenly')
+    parser.add_argument('--code-flow-steps', default='0', help='Comma-separated numbers of code flow locations per result')
+    parser.add_argument('--rounds', type=int, default=3, help='Number of timed runs per benchmark, the best one is kept')
+    parser.add_argument('--output', default='', help='Path of the JSON file to write the results to')
+    parser.add_argument('--compare', default='', help='Path of a previous JSON results file to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Relative slowdown or memory growth reported as a regression')
+    args = parser.parse_args()
+
+    logging.basicConfig()
+    logger = logging.getLogger(__name__)
+    logger.setLevel('INFO')
+
+    adf_validation = check_adf_validation(logger=logger)
+
+    # The pipeline logs every finding at DEBUG level, keep the benchmark output to the results
+    pipeline_logger = logging.getLogger(__name__ + '.pipeline')
+    pipeline_logger.setLevel('WARNING')
+
+    scenarios = {}
+    with tempfile.TemporaryDirectory() as work_directory:
+        for result_count in [int(value) for value in args.result_counts.split(',')]:
+            for skew in [float(value) for value in args.skews.split(',')]:
+                for code_flow_steps in [int(value) for value in args.code_flow_steps.split(',')]:
+
+                    file_count = max(1, result_count // args.results_per_file)
+                    scenario_name = get_scenario_name(result_count=result_count, file_count=file_count, skew=skew, code_flow_steps=code_flow_steps)
+
+                    scenario = scenarios[scenario_name] = run_scenario(
+                        logger=pipeline_logger,
+                        work_directory=work_directory,
+                        result_count=result_count,
+                        file_count=file_count,
+                        skew=skew,
+                        code_flow_steps=code_flow_steps,
+                        rounds=args.rounds
+                    )
+
+                    print(scenario_name + ' (' + str(scenario['parameters']['largest_file_findings']) + ' findings in the largest file)')
+                    for benchmark_name, benchmark in scenario['benchmarks'].items():
+                        print(
+                            '  ' + benchmark_name.ljust(30) + format(benchmark['seconds'] * 1000, '10.2f') + ' ms' + \
+                            format(benchmark['ns_per_result'], '8d') + ' ns/result' + format(benchmark['peak_bytes'] / 2**20, '10.2f') + ' MiB peak'
+                        )
+
+    results = {
+        'version': BENCHMARK_FORMAT_VERSION,
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'processor': platform.machine(),
+            'adf_validation': adf_validation
+        },
+        'rounds': args.rounds,
+        'scenarios': scenarios
+    }
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+        print('Results written - ' + args.output)
+
+    if args.compare:
+        with open(args.compare) as previous_file:
+            previous = json.load(previous_file)
+
+        if previous.get('version') != BENCHMARK_FORMAT_VERSION:
+            print('Cannot compare with ' + args.compare + ', its format version is ' + str(previous.get('version')))
+            sys.exit(2)
+
+        regressions = compare(current=results, previous=previous, threshold=args.threshold)
+        if regressions:
+            print('Regression(s) over ' + format(args.threshold * 100, 'g') + '%:')
+            for regression in regressions:
+                print('  ' + regression)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import gzip
+import json
+import signal
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from fake_jira.fake_jira import FakeJira
+
+# Stub JIRA server - serves the in-memory fake JIRA over HTTP.
+# Point `jira.cloud_url` at it to exercise main.py end-to-end, including concurrent upserts and rate limiting, without a JIRA Cloud site:
+#
+#   python -m benchmarks.stub_jira_server --port 8080 --project-key PROJ --rate-limit-every 25
+#
+# Every Nth write request (create/update) is answered with 429 Too Many Requests and a Retry-After header when --rate-limit-every is set.
+# Every Nth issue of a bulk create request is rejected when --bulk-fail-every is set, to exercise the per-issue fallback.
+# Set `jira.backend` to `fake` instead to serve the same fake JIRA in-process, without a socket.
+
+class StubJiraRequestHandler(BaseHTTPRequestHandler):
+
+    fake_jira: FakeJira = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def __handle_request(self):
+        length = int(self.headers.get('Content-Length', 0))
+        url = 'http://' + self.headers.get('Host', 'localhost') + self.path
+        status, body, headers = self.fake_jira.handle_request(method=self.command, url=url, body=self.rfile.read(length))
+
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        # Compress the larger responses when the client accepts it, like JIRA Cloud does
+        if len(payload) > 1024 and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            payload = gzip.compress(payload)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(payload)))
+        for header, value in headers.items():
+            self.send_header(header, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self.__handle_request()
+
+    def do_POST(self):
+        self.__handle_request()
+
+    def do_PUT(self):
+        self.__handle_request()
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description='In-memory stub of the JIRA REST API for local runs and benchmarks')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--project-key', default='PROJ')
+    parser.add_argument('--rate-limit-every', type=int, default=0)
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--bulk-fail-every', type=int, default=0)
+    args = parser.parse_args()
+
+    StubJiraRequestHandler.fake_jira = FakeJira(project_key=args.project_key, rate_limit_every=args.rate_limit_every, retry_after=args.retry_after, bulk_fail_every=args.bulk_fail_every)
+    server = ThreadingHTTPServer((args.host, args.port), StubJiraRequestHandler)
+
+    # Stop on SIGTERM too, so the request counts are printed when the stub runs in the background
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    print('Stub JIRA server listening on http://' + args.host + ':' + str(args.port), flush=True)
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        print('Requests served - ' + json.dumps(StubJiraRequestHandler.fake_jira.request_counts))
+
+if __name__ == "__main__":
+    main()
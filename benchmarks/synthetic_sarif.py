@@ -0,0 +1,95 @@
+import random
+
+# Synthetic SARIF - helpers to generate SARIF reports of a given size for benchmarking purposes
+
+SYNTHETIC_TOOL_NAME = 'synthetic-scanner'
+
+# Build a SARIF physical location for the given file and line
+def build_physical_location(artifact_uri: str, start_line: int) -> dict:
+    return {
+        'physicalLocation': {
+            'artifactLocation': {
+                'uri': artifact_uri
+            },
+            'region': {
+                'startLine': start_line,
+                'startColumn': 1,
+                'endLine': start_line,
+                'endColumn': 80
+            }
+        }
+    }
+
+# Build a SARIF code flow of `step_count` locations, leading up to the given file and line like a taint-tracking path does
+def build_code_flow(artifact_uri: str, start_line: int, step_count: int) -> dict:
+    return {
+        'threadFlows': [
+            {
+                'locations': [
+                    {
+                        'location': dict(
+                            build_physical_location(artifact_uri=artifact_uri, start_line=max(1, start_line - step_count + step_index)),
+                            message={'text': 'Step ' + str(step_index + 1) + ' of ' + str(step_count)}
+                        )
+                    }
+                    for step_index in range(step_count)
+                ]
+            }
+        ]
+    }
+
+# Build a single SARIF result for the given rule and file, with a code flow of `code_flow_steps` locations when greater than 0
+def build_sarif_result(rule_id: str, artifact_uri: str, start_line: int, code_flow_steps: int = 0) -> dict:
+
+    result = {
+        'ruleId': rule_id,
+        'level': 'warning',
+        'message': {
+            'text': 'Synthetic finding reported by rule ' + rule_id
+        },
+        'locations': [
+            build_physical_location(artifact_uri=artifact_uri, start_line=start_line)
+        ]
+    }
+
+    if code_flow_steps > 0:
+        result['codeFlows'] = [build_code_flow(artifact_uri=artifact_uri, start_line=start_line, step_count=code_flow_steps)]
+
+    return result
+
+# Generate a SARIF report with `result_count` results spread across `file_count` files and `rule_count` rules, returns dict
+# skew: Zipf exponent of the number of findings per file. 0 spreads the findings evenly, 1 and above piles most of them onto a few files
+# code_flow_steps: Number of locations in the code flow of each result. 0 generates results without code flows
+def generate_sarif_report(result_count: int, file_count: int, rule_count: int = 50, seed: int = 0, skew: float = 0.0, code_flow_steps: int = 0) -> dict:
+
+    randomizer = random.Random(seed)
+
+    rules = ['SYN' + str(rule_index).zfill(4) for rule_index in range(rule_count)]
+    files = ['src/module_' + str(file_index // 100) + '/file_' + str(file_index) + '.py' for file_index in range(file_count)]
+    file_weights = [1 / (file_index + 1) ** skew for file_index in range(file_count)] if skew > 0 else None
+
+    results = [
+        build_sarif_result(
+            rule_id=randomizer.choice(rules),
+            artifact_uri=artifact_uri,
+            start_line=randomizer.randint(1, 5000),
+            code_flow_steps=code_flow_steps
+        )
+        for artifact_uri in randomizer.choices(files, weights=file_weights, k=result_count)
+    ]
+
+    return {
+        '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+        'version': '2.1.0',
+        'runs': [
+            {
+                'tool': {
+                    'driver': {
+                        'name': SYNTHETIC_TOOL_NAME,
+                        'rules': [{'id': rule} for rule in rules]
+                    }
+                },
+                'results': results
+            }
+        ]
+    }
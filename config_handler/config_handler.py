@@ -4,26 +4,78 @@ import logging
 import traceback
 from python_json_config import ConfigBuilder, config_node
 from mergedeep import merge
+from log_handler.log_handler import LogSummary
 
 # The ConfigMap - Mapping between runtime environment variable keys and JSON Config keys. Will need to append 'INPUT_' when looking to map within GitHub Actions environment
 ConfigKeyValuePair = {
     'INPUT_TYPE': 'input.type',
     'INPUT_FORMAT': 'input.format',
+    'INPUT_PARSE_WORKERS': 'input.parse_workers',
+    'INPUT_BASELINE': 'input.baseline',
+    'INPUT_SARIF_INCLUDE_GLOBS': 'input.sarif_include_globs',
+    'INPUT_SARIF_EXCLUDE_GLOBS': 'input.sarif_exclude_globs',
+    'INPUT_GROUP_BY': 'input.group_by',
+    'INPUT_GROUP_DIRECTORY_DEPTH': 'input.group_directory_depth',
+    'INPUT_GROUP_PATH_GLOBS': 'input.group_path_globs',
+    'INPUT_FILTER_MIN_LEVEL': 'input.filter_min_level',
+    'INPUT_FILTER_MIN_SECURITY_SEVERITY': 'input.filter_min_security_severity',
+    'INPUT_FILTER_RULES_ALLOW': 'input.filter_rules_allow',
+    'INPUT_FILTER_RULES_DENY': 'input.filter_rules_deny',
+    'INPUT_FILTER_PATHS_INCLUDE': 'input.filter_paths_include',
+    'INPUT_FILTER_PATHS_EXCLUDE': 'input.filter_paths_exclude',
+    'INPUT_FILTER_INCLUDE_SUPPRESSED': 'input.filter_include_suppressed',
+    'INPUT_FILTER_EXCLUDE_BASELINE_STATES': 'input.filter_exclude_baseline_states',
+    'INPUT_MERGE_TOOLS': 'input.merge_tools',
     'JIRA_CLOUD_URL': 'jira.cloud_url',
     'JIRA_PROJECT_KEY': 'jira.project_key',
     'JIRA_AUTH_EMAIL': 'jira.auth_email',
     'JIRA_API_TOKEN': 'jira.api_token',
     'JIRA_DEFAULT_ISSUE_LABELS': 'jira.default_issue_labels',
     'JIRA_USE_ATLASSIAN_DOCUMENT_FORMAT': 'jira.use_atlassian_document_format',
-    'JIRA_CREATE_SUB_TASKS': 'jira.create_sub_tasks'
+    'JIRA_CREATE_SUB_TASKS': 'jira.create_sub_tasks',
+    'JIRA_MAX_WORKERS': 'jira.max_workers',
+    'JIRA_POOL_SIZE': 'jira.pool_size',
+    'JIRA_TIMEOUT': 'jira.timeout',
+    'JIRA_MAX_RETRIES': 'jira.max_retries',
+    'JIRA_STATE_FILE': 'jira.state_file',
+    'JIRA_STATE_TTL_HOURS': 'jira.state_ttl_hours',
+    'JIRA_STATE_VERIFY': 'jira.state_verify',
+    'JIRA_FIXED_ISSUE_TRANSITION': 'jira.fixed_issue_transition',
+    'JIRA_MAX_DESCRIPTION_LENGTH': 'jira.max_description_length',
+    'JIRA_BACKEND': 'jira.backend',
+    'JIRA_DRY_RUN': 'jira.dry_run',
+    'OUTPUT_REPORT_FILE': 'output.report_file',
+    'OUTPUT_PLAN_FILE': 'output.plan_file'
 }
 
+# JSON Config keys that are not plain strings when set through environment variables
+ConfigListKeys = [ 'input.sarif_include_globs', 'input.sarif_exclude_globs', 'input.group_path_globs', 'input.filter_rules_allow', 'input.filter_rules_deny', 'input.filter_paths_include', 'input.filter_paths_exclude', 'input.filter_exclude_baseline_states', 'jira.default_issue_labels' ] # Comma-separated strings
+ConfigBooleanKeys = [ 'input.filter_include_suppressed', 'input.merge_tools', 'jira.use_atlassian_document_format', 'jira.create_sub_tasks', 'jira.state_verify', 'jira.dry_run' ]
+ConfigIntegerKeys = [ 'input.parse_workers', 'input.group_directory_depth', 'jira.max_workers', 'jira.pool_size', 'jira.timeout', 'jira.max_retries', 'jira.state_ttl_hours', 'jira.max_description_length' ]
+ConfigFloatKeys = [ 'input.filter_min_security_severity' ]
+
 # SARIF - class to handle Static Analysis Results Interchange Format (SARIF)
 class ConfigHandler():
 
     # ConfigHandler Constructor
     # input_type: str
     # input_format: str
+    # input_parse_workers: int
+    # input_baseline: str
+    # input_sarif_include_globs: list
+    # input_sarif_exclude_globs: list
+    # input_group_by: str
+    # input_group_directory_depth: int
+    # input_group_path_globs: list
+    # input_filter_min_level: str
+    # input_filter_min_security_severity: float
+    # input_filter_rules_allow: list
+    # input_filter_rules_deny: list
+    # input_filter_paths_include: list
+    # input_filter_paths_exclude: list
+    # input_filter_include_suppressed: bool
+    # input_filter_exclude_baseline_states: list
+    # input_merge_tools: bool
     # jira_cloud_url: str
     # jira_project_key: str
     # jira_auth_email: str
@@ -31,6 +83,19 @@ class ConfigHandler():
     # jira_default_issue_labels: list
     # jira_use_atlassian_document_format: bool
     # jira_create_sub_tasks: bool
+    # jira_max_workers: int
+    # jira_pool_size: int
+    # jira_timeout: int
+    # jira_max_retries: int
+    # jira_state_file: str
+    # jira_state_ttl_hours: int
+    # jira_state_verify: bool
+    # jira_fixed_issue_transition: str
+    # jira_max_description_length: int
+    # jira_backend: str
+    # jira_dry_run: bool
+    # output_report_file: str
+    # output_plan_file: str
     #
     # Returns: ConfigHandler object
     # Raises: None
@@ -41,21 +106,92 @@ class ConfigHandler():
         self.builder = ConfigBuilder()
         self.input_type = 'file'
         self.input_format = 'sarif'
+        self.input_parse_workers = 1
+        self.input_baseline = ''
+        self.input_sarif_include_globs = [ '*.sarif', '*.sarif.json', '*.sarif.gz', '*.zip' ]
+        self.input_sarif_exclude_globs = [ '.git/**' ]
+        self.input_group_by = 'file'
+        self.input_group_directory_depth = 1
+        self.input_group_path_globs = []
+        self.input_filter_min_level = ''
+        self.input_filter_min_security_severity = 0.0
+        self.input_filter_rules_allow = self.input_filter_rules_deny = []
+        self.input_filter_paths_include = self.input_filter_paths_exclude = []
+        self.input_filter_include_suppressed = False
+        self.input_filter_exclude_baseline_states = [ 'absent' ]
+        self.input_merge_tools = False
         self.jira_cloud_url = self.jira_project_key = self.jira_auth_email = self.jira_api_token = ''
         self.jira_default_issue_labels = []
         self.jira_use_atlassian_document_format = self.jira_create_sub_tasks = False
+        self.jira_max_workers = 1
+        self.jira_pool_size = 0
+        self.jira_timeout = 30
+        self.jira_max_retries = 3
+        self.jira_state_file = ''
+        self.jira_state_ttl_hours = 0
+        self.jira_state_verify = False
+        self.jira_fixed_issue_transition = ''
+        self.jira_max_description_length = 32767
+        self.jira_backend = 'jira'
+        self.jira_dry_run = False
+        self.output_report_file = ''
+        self.output_plan_file = 'jira_plan.jsonl'
         self.config = self.build_config()
 
     # Get Boolean
     def get_boolean(self, key: str):
         return True if str(key).lower() == 'true' and key != '' else False
 
+    # Get Integer
+    def get_integer(self, key: str, default: int = 0) -> int:
+        return int(key) if str(key).strip().lstrip('-').isdigit() else default
+
+    # Get Float
+    def get_float(self, key: str, default: float = 0.0) -> float:
+        try:
+            return float(key)
+        except (TypeError, ValueError):
+            return default
+
+    # Convert a config value loaded from an environment variable into the type expected for the JSON Config key
+    def get_config_value(self, config_key: str, value: str):
+
+        if config_key in ConfigListKeys:
+            return value.split(',')
+
+        if config_key in ConfigBooleanKeys:
+            return self.get_boolean(value)
+
+        if config_key in ConfigIntegerKeys:
+            return self.get_integer(value)
+
+        if config_key in ConfigFloatKeys:
+            return self.get_float(value)
+
+        return value
+
     # Build the Config object
     def build_config(self) -> dict:
         return {
             'input': {
                 'type': self.input_type,
                 'format': self.input_format,
+                'parse_workers': self.input_parse_workers if isinstance(self.input_parse_workers, int) else self.get_integer(self.input_parse_workers, default=1),
+                'baseline': self.input_baseline,
+                'sarif_include_globs': self.input_sarif_include_globs,
+                'sarif_exclude_globs': self.input_sarif_exclude_globs,
+                'group_by': self.input_group_by,
+                'group_directory_depth': self.input_group_directory_depth if isinstance(self.input_group_directory_depth, int) else self.get_integer(self.input_group_directory_depth, default=1),
+                'group_path_globs': self.input_group_path_globs,
+                'filter_min_level': self.input_filter_min_level,
+                'filter_min_security_severity': self.input_filter_min_security_severity if isinstance(self.input_filter_min_security_severity, float) else self.get_float(self.input_filter_min_security_severity),
+                'filter_rules_allow': self.input_filter_rules_allow,
+                'filter_rules_deny': self.input_filter_rules_deny,
+                'filter_paths_include': self.input_filter_paths_include,
+                'filter_paths_exclude': self.input_filter_paths_exclude,
+                'filter_include_suppressed': self.input_filter_include_suppressed if isinstance(self.input_filter_include_suppressed, bool) else self.get_boolean(self.input_filter_include_suppressed),
+                'filter_exclude_baseline_states': self.input_filter_exclude_baseline_states,
+                'merge_tools': self.input_merge_tools if isinstance(self.input_merge_tools, bool) else self.get_boolean(self.input_merge_tools)
             },
             'jira': {
                 'cloud_url': self.jira_cloud_url,
@@ -64,7 +200,22 @@ class ConfigHandler():
                 'api_token': self.jira_api_token,
                 'default_issue_labels': self.jira_default_issue_labels,
                 'use_atlassian_document_format': self.jira_use_atlassian_document_format if isinstance(self.jira_use_atlassian_document_format, bool) else self.get_boolean(self.jira_use_atlassian_document_format),
-                'create_sub_tasks': self.jira_create_sub_tasks if isinstance(self.jira_create_sub_tasks, bool) else self.get_boolean(self.jira_create_sub_tasks)
+                'create_sub_tasks': self.jira_create_sub_tasks if isinstance(self.jira_create_sub_tasks, bool) else self.get_boolean(self.jira_create_sub_tasks),
+                'max_workers': self.jira_max_workers if isinstance(self.jira_max_workers, int) else self.get_integer(self.jira_max_workers, default=1),
+                'pool_size': self.jira_pool_size if isinstance(self.jira_pool_size, int) else self.get_integer(self.jira_pool_size),
+                'timeout': self.jira_timeout if isinstance(self.jira_timeout, int) else self.get_integer(self.jira_timeout, default=30),
+                'max_retries': self.jira_max_retries if isinstance(self.jira_max_retries, int) else self.get_integer(self.jira_max_retries, default=3),
+                'state_file': self.jira_state_file,
+                'state_ttl_hours': self.jira_state_ttl_hours if isinstance(self.jira_state_ttl_hours, int) else self.get_integer(self.jira_state_ttl_hours),
+                'state_verify': self.jira_state_verify if isinstance(self.jira_state_verify, bool) else self.get_boolean(self.jira_state_verify),
+                'fixed_issue_transition': self.jira_fixed_issue_transition,
+                'max_description_length': self.jira_max_description_length if isinstance(self.jira_max_description_length, int) else self.get_integer(self.jira_max_description_length, default=32767),
+                'backend': self.jira_backend,
+                'dry_run': self.jira_dry_run if isinstance(self.jira_dry_run, bool) else self.get_boolean(self.jira_dry_run)
+            },
+            'output': {
+                'report_file': self.output_report_file,
+                'plan_file': self.output_plan_file
             }
         }
 
@@ -85,27 +236,115 @@ class ConfigHandler():
                     # required means an error is thrown if a non-existing field is accessed 
                     self.builder.set_field_access_required()
                     # self.builder.add_required_fields(field_names=['jira.cloud_url','jira.project_key','jira.auth_email','jira.api_token'])
-                    self.builder.add_optional_fields(field_names=['input.type','input.format','jira.default_issue_labels','jira.use_atlassian_document_format','jira.create_sub_tasks'])
+                    self.builder.add_optional_fields(field_names=['input.type','input.format','input.parse_workers','input.baseline','input.sarif_include_globs','input.sarif_exclude_globs','input.group_by','input.group_directory_depth','input.group_path_globs','input.filter_min_level','input.filter_min_security_severity','input.filter_rules_allow','input.filter_rules_deny','input.filter_paths_include','input.filter_paths_exclude','input.filter_include_suppressed','input.filter_exclude_baseline_states','input.merge_tools','jira.default_issue_labels','jira.use_atlassian_document_format','jira.create_sub_tasks','jira.max_workers','jira.pool_size','jira.timeout','jira.max_retries','jira.state_file','jira.state_ttl_hours','jira.state_verify','jira.fixed_issue_transition','jira.max_description_length','jira.backend','jira.dry_run','output.report_file','output.plan_file'])
 
                     self.config = self.builder.parse_config('config.json')
 
                     # Set default values for optional fields if they are not set in the config.json file.
                     if self.config.input.type == None:
-                        self.config.input.type = 'file' # Default is file
+                        self.config.update('input.type', 'file') # Default is file
 
                     if self.config.input.format == None:
-                        self.config.input.format = 'sarif' # Default is SARIF format
+                        self.config.update('input.format', 'sarif') # Default is SARIF format
+
+                    if self.config.input.parse_workers == None:
+                        self.config.update('input.parse_workers', 1) # Default is 1, SARIF files are parsed one after another
+
+                    if self.config.input.baseline == None:
+                        self.config.update('input.baseline', '') # Default is no baseline, every file is published
+
+                    if self.config.input.sarif_include_globs == None:
+                        self.config.update('input.sarif_include_globs', [ '*.sarif', '*.sarif.json', '*.sarif.gz', '*.zip' ]) # Default is the SARIF files in the project root directory
+
+                    if self.config.input.sarif_exclude_globs == None:
+                        self.config.update('input.sarif_exclude_globs', [ '.git/**' ])
+
+                    if self.config.input.group_by == None:
+                        self.config.update('input.group_by', 'file') # Default is one issue per file
+
+                    if self.config.input.group_directory_depth == None:
+                        self.config.update('input.group_directory_depth', 1) # Default is one issue per top-level directory when grouping by directory
+
+                    if self.config.input.group_path_globs == None:
+                        self.config.update('input.group_path_globs', []) # Default is no path globs, every file is grouped as `Other files`
+
+                    if self.config.input.filter_min_level == None:
+                        self.config.update('input.filter_min_level', '') # Default is every level
+
+                    if self.config.input.filter_min_security_severity == None:
+                        self.config.update('input.filter_min_security_severity', 0.0) # Default is every security severity
+
+                    if self.config.input.filter_rules_allow == None:
+                        self.config.update('input.filter_rules_allow', []) # Default is every rule
+
+                    if self.config.input.filter_rules_deny == None:
+                        self.config.update('input.filter_rules_deny', [])
+
+                    if self.config.input.filter_paths_include == None:
+                        self.config.update('input.filter_paths_include', []) # Default is every file
+
+                    if self.config.input.filter_paths_exclude == None:
+                        self.config.update('input.filter_paths_exclude', [])
+
+                    if self.config.input.filter_include_suppressed == None:
+                        self.config.update('input.filter_include_suppressed', False) # Default is to discard suppressed results
+
+                    if self.config.input.filter_exclude_baseline_states == None:
+                        self.config.update('input.filter_exclude_baseline_states', [ 'absent' ]) # Default is to discard the results that are gone
+
+                    if self.config.input.merge_tools == None:
+                        self.config.update('input.merge_tools', False) # Default is to publish the findings of each SARIF report separately
 
                     if self.config.jira.default_issue_labels == None:
-                        self.config.jira.default_issue_labels = []
+                        self.config.update('jira.default_issue_labels', [])
 
                     if self.config.jira.use_atlassian_document_format == None:
-                        self.config.jira.use_atlassian_document_format = False # Default is false
+                        self.config.update('jira.use_atlassian_document_format', False) # Default is false
 
                     if self.config.jira.create_sub_tasks == None:
-                        self.config.jira.create_sub_tasks = False # Default is false
+                        self.config.update('jira.create_sub_tasks', False) # Default is false
+
+                    if self.config.jira.max_workers == None:
+                        self.config.update('jira.max_workers', 1) # Default is 1, upserts run serially
+
+                    if self.config.jira.pool_size == None:
+                        self.config.update('jira.pool_size', 0) # Default is 0, one connection per upsert worker
+
+                    if self.config.jira.timeout == None:
+                        self.config.update('jira.timeout', 30) # Default is 30 seconds
+
+                    if self.config.jira.max_retries == None:
+                        self.config.update('jira.max_retries', 3) # Default is 3 retries
+
+                    if self.config.jira.state_file == None:
+                        self.config.update('jira.state_file', '') # Default is no state file
+
+                    if self.config.jira.state_ttl_hours == None:
+                        self.config.update('jira.state_ttl_hours', 0) # Default is 0, state entries never expire
+
+                    if self.config.jira.state_verify == None:
+                        self.config.update('jira.state_verify', False) # Default is false
+
+                    if self.config.jira.fixed_issue_transition == None:
+                        self.config.update('jira.fixed_issue_transition', '') # Default is to leave fixed issues open
+
+                    if self.config.jira.max_description_length == None:
+                        self.config.update('jira.max_description_length', 32767) # Default is the longest description accepted by JIRA
+
+                    if self.config.jira.backend == None:
+                        self.config.update('jira.backend', 'jira') # Default is JIRA, `fake` serves an in-memory JIRA for benchmarks
+
+                    if self.config.jira.dry_run == None:
+                        self.config.update('jira.dry_run', False) # Default is false
+
+                    # The output section is optional as a whole, older config.json files don't have it
+                    if 'output' not in self.config.to_dict() or self.config.output.report_file == None:
+                        self.config.update('output.report_file', '') # Default is no report file
+
+                    if self.config.output.plan_file == None:
+                        self.config.update('output.plan_file', 'jira_plan.jsonl') # Default plan file of a dry run
                     
-            self.logger.debug('Config from the config.json file - ' + str(self.config))
+            self.logger.debug('Config from the config.json file - %s', LogSummary(self.config))
             return self.config.to_dict() if isinstance(self.config, config_node.Config) else self.config
         
         except Exception as e:
@@ -155,38 +394,18 @@ class ConfigHandler():
                         # break
                         if 'GITHUB_ACTIONS' in environ.keys():
                             if environ['GITHUB_ACTIONS']:
-                                if list_item == 'INPUT_jira.default_issue_labels':
-                                    temp_config_dict.update({
-                                        item: environ[list_item.replace('.', '_').upper()].split(',')
-                                    })
-                                else:
-                                    if list_item in ['INPUT_jira.use_atlassian_document_format', 'INPUT_jira.create_sub_tasks']:
-                                        temp_config_dict.update({
-                                            item: self.get_boolean(environ[list_item.replace('.', '_').upper()])
-                                        })
-                                    else:
-                                        temp_config_dict.update({
-                                            item: environ[list_item.replace('.', '_').upper()]
-                                        })
+                                temp_config_dict.update({
+                                    item: self.get_config_value(list_item.replace('INPUT_', ''), environ[list_item.replace('.', '_').upper()])
+                                })
                                 config.update({list_item.split('.')[0].replace('INPUT_',''): temp_config_dict})
                                 break
                         else:
-                            if list_item == 'jira.default_issue_labels':
-                                temp_config_dict.update({
-                                    item: environ[list_item.replace('.', '_').upper()].split(',')
-                                })
-                            else:
-                                if list_item in ['jira.use_atlassian_document_format', 'jira.create_sub_tasks']:
-                                    temp_config_dict.update({
-                                        item: self.get_boolean(environ[list_item.replace('.', '_').upper()])
-                                    })
-                                else:
-                                    temp_config_dict.update({
-                                        item: environ[list_item.replace('.', '_').upper()]
-                                    })
+                            temp_config_dict.update({
+                                item: self.get_config_value(list_item, environ[list_item.replace('.', '_').upper()])
+                            })
                             config.update({list_item.split('.')[0]: temp_config_dict})
                             break
-            self.logger.debug('Config from environment variables - ' + str(config))
+            self.logger.debug('Config from environment variables - %s', LogSummary(config))
             return config
         
         except Exception as e:
@@ -0,0 +1,70 @@
+import ast
+import json
+import hashlib
+import logging
+import re
+
+# DescriptionDigest - class to compute stable digests of JIRA issue descriptions for change detection.
+# Descriptions are canonicalised first, so the description sent to JIRA and the description JIRA returns produce the same digest
+# when only the serialisation differs (ADF/JSON key order and spacing, line endings, trailing whitespace).
+class DescriptionDigest:
+
+    # Name of the JIRA issue property storing the digest of the last description published by this tool
+    ISSUE_PROPERTY_KEY = 'publish-sarif-to-jira'
+
+    # DescriptionDigest Constructor
+    # logger: Logger object
+    #
+    # Returns: DescriptionDigest object
+    # Raises: None
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+
+    # Parse a description holding an ADF document, either as a dict, as JSON or as the str() of a dict. Returns None for wiki markup or plain text.
+    def __parse_document(self, description) -> dict:
+
+        if isinstance(description, dict):
+            return description
+
+        text = description.strip()
+        if not text.startswith('{') or not text.endswith('}'):
+            return None
+
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+
+        try:
+            document = ast.literal_eval(text)
+            return document if isinstance(document, dict) else None
+        except (ValueError, SyntaxError):
+            return None
+
+    # Normalise wiki markup or plain text: unify line endings, drop trailing whitespace on each line and surrounding blank lines
+    def __normalise_text(self, text: str) -> str:
+        return '\n'.join(line.rstrip() for line in re.split(r'\r\n|\r|\n', text)).strip()
+
+    # Canonicalise a description, returns str
+    def canonicalise(self, description) -> str:
+
+        if description is None:
+            return ''
+
+        document = self.__parse_document(description)
+
+        if document is not None:
+            return json.dumps(document, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+        return self.__normalise_text(str(description))
+
+    # Get the SHA-256 digest of the canonical form of a description, returns str
+    def get_digest(self, description) -> str:
+        return hashlib.sha256(self.canonicalise(description).encode('utf-8')).hexdigest()
+
+    # Get the digest stored in the issue property of a JIRA issue fetched with `properties=ISSUE_PROPERTY_KEY`, returns None if the property is not set
+    def get_issue_property_digest(self, issue) -> str:
+
+        issue_property = (issue.raw or {}).get('properties', {}).get(self.ISSUE_PROPERTY_KEY)
+
+        return issue_property.get('digest') if isinstance(issue_property, dict) else None
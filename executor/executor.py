@@ -0,0 +1,98 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from jira.exceptions import JIRAError
+
+# UpsertExecutor - class to dispatch JIRA issue upserts to a bounded pool of worker threads, backing off on JIRA Cloud rate limits
+class UpsertExecutor:
+
+    # UpsertExecutor Constructor
+    # logger: Logger object
+    # max_workers: Number of worker threads. 1 runs the upserts serially in the calling thread
+    # max_rate_limit_retries: Number of times an upsert is retried after a 429 Too Many Requests response
+    #
+    # Returns: UpsertExecutor object
+    # Raises: None
+    def __init__(self, logger: logging.Logger, max_workers: int = 1, max_rate_limit_retries: int = 5):
+        self.logger = logger
+        self.max_workers = max(1, max_workers)
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.__lock = threading.Lock()
+        self.__resume_at = 0.0 # Shared backoff. No worker sends a request before this time.
+        self.upsert_count = self.rate_limit_count = 0
+        self.elapsed_time = 0.0
+
+    # Get the delay in seconds requested by a 429 response, using the Retry-After header when present and exponential backoff with jitter otherwise
+    def __get_rate_limit_delay(self, error: JIRAError, attempt: int) -> float:
+
+        if error.response is not None and 'Retry-After' in error.response.headers:
+            try:
+                return float(error.response.headers['Retry-After'])
+            except ValueError:
+                pass
+
+        return min(60.0, 2 ** attempt) + random.uniform(0, 1)
+
+    # Wait until the shared backoff set by any worker has elapsed
+    def __wait_for_rate_limit(self):
+
+        with self.__lock:
+            delay = self.__resume_at - time.monotonic()
+
+        if delay > 0:
+            time.sleep(delay)
+
+    # Run a single upsert, retrying it when JIRA Cloud responds with 429 Too Many Requests
+    def __run_upsert(self, upsert_function, upsert_kwargs: dict):
+
+        attempt = 0
+        while True:
+
+            self.__wait_for_rate_limit()
+
+            try:
+                return upsert_function(**upsert_kwargs)
+
+            except JIRAError as e:
+                if e.status_code != 429 or attempt >= self.max_rate_limit_retries:
+                    raise
+
+                delay = self.__get_rate_limit_delay(error=e, attempt=attempt)
+
+                # Push the shared backoff so every worker pauses, not just the one that hit the limit
+                with self.__lock:
+                    self.__resume_at = max(self.__resume_at, time.monotonic() + delay)
+                    self.rate_limit_count += 1
+
+                self.logger.warning("JIRA Cloud rate limit reached. Backing off for " + format(delay, '.1f') + " second(s).")
+                attempt += 1
+
+    # Run the upserts, one per set of keyword arguments, and return their results in the same order
+    # issue_count: Number of issues counted towards the throughput, defaults to one per upsert
+    def run_upserts(self, upsert_function, upsert_kwargs_list: list[dict], issue_count: int = None) -> list:
+
+        start_time = time.perf_counter()
+
+        if self.max_workers == 1:
+            results = [self.__run_upsert(upsert_function, upsert_kwargs) for upsert_kwargs in upsert_kwargs_list]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(self.__run_upsert, upsert_function, upsert_kwargs) for upsert_kwargs in upsert_kwargs_list]
+                results = [future.result() for future in futures]
+
+        self.elapsed_time += time.perf_counter() - start_time
+        self.upsert_count += len(upsert_kwargs_list) if issue_count is None else issue_count
+        return results
+
+    # Log the upsert throughput of the run
+    def log_throughput(self):
+
+        throughput = self.upsert_count / self.elapsed_time if self.elapsed_time > 0 else 0.0
+
+        self.logger.info(
+            "Upserted " + str(self.upsert_count) + " issue(s) in " + format(self.elapsed_time, '.2f') + " second(s) with " + \
+            str(self.max_workers) + " worker(s) - " + format(throughput, '.2f') + " issues/second, " + \
+            str(self.rate_limit_count) + " rate limit backoff(s)."
+        )
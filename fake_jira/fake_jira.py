@@ -0,0 +1,249 @@
+import itertools
+import json
+import re
+import threading
+from datetime import timedelta
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlparse
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# FakeJira - an in-memory stand-in for the JIRA REST API v2 endpoints used by this project: server info, projects, issue search,
+# issue create (single and bulk), issue edit, issue properties and transitions. It serves a single project, created on first use.
+# FakeJiraAdapter serves it in-process behind the JIRA client, and benchmarks/stub_jira_server.py serves it over HTTP.
+
+API_PREFIX = '/rest/api/2/'
+
+# Issue types of the project, by ID
+ISSUE_TYPES = {'10001': 'Task', '10002': 'Sub-task', '10003': 'Bug'}
+
+# Workflow transitions served for every issue, by ID
+TRANSITIONS = {'11': 'To Do', '21': 'In Progress', '31': 'Done'}
+
+class FakeJira:
+
+    # FakeJira Constructor
+    # project_key: Key of the only project served
+    # rate_limit_every: Answer every Nth write request with 429 Too Many Requests. 0 disables rate limiting
+    # retry_after: Value of the Retry-After header sent with 429 responses, in seconds
+    # bulk_fail_every: Reject every Nth issue of a bulk create request. 0 disables failures
+    #
+    # Returns: FakeJira object
+    # Raises: None
+    def __init__(self, project_key: str, rate_limit_every: int = 0, retry_after: int = 1, bulk_fail_every: int = 0):
+        self.project_key = project_key
+        self.project_id = '10000'
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.bulk_fail_every = bulk_fail_every
+        self.issues = {}
+        self.issue_properties = {} # issue key -> property key -> value
+        self.request_counts = {}
+        self.lock = threading.Lock()
+        self.__issue_ids = itertools.count(1)
+        self.__write_counter = itertools.count(1)
+
+    # Count a request by method, returns True if the request must be rate limited
+    def count_request(self, method: str) -> bool:
+        with self.lock:
+            self.request_counts[method] = self.request_counts.get(method, 0) + 1
+            if method in ['POST', 'PUT'] and self.rate_limit_every > 0:
+                return next(self.__write_counter) % self.rate_limit_every == 0
+        return False
+
+    # Create an issue from the JIRA create payload fields, returns the issue
+    def create_issue(self, base_url: str, fields: dict) -> dict:
+        with self.lock:
+            issue_id = str(next(self.__issue_ids))
+            issue_key = self.project_key + '-' + issue_id
+            self.issues[issue_key] = {
+                'id': issue_id,
+                'key': issue_key,
+                'self': base_url + API_PREFIX + 'issue/' + issue_id,
+                'fields': {
+                    'summary': fields.get('summary', ''),
+                    'description': fields.get('description'),
+                    'labels': list(fields.get('labels', [])),
+                    'issuetype': fields.get('issuetype', {'name': 'Task'}),
+                    'status': {'name': 'To Do'},
+                    'project': {'id': self.project_id, 'key': self.project_key}
+                }
+            }
+            if 'parent' in fields:
+                self.issues[issue_key]['fields']['parent'] = {'key': fields['parent'].get('key')}
+            return self.issues[issue_key]
+
+    # Get an issue by ID or key
+    def get_issue(self, issue_id_or_key: str) -> dict:
+        with self.lock:
+            for issue in self.issues.values():
+                if issue_id_or_key in [issue['id'], issue['key']]:
+                    return issue
+        return None
+
+    def __error(self, status: int, message: str) -> tuple[int, dict, dict]:
+        return status, {'errorMessages': [message], 'errors': {}}, {}
+
+    def __project(self, base_url: str) -> dict:
+        return {'id': self.project_id, 'key': self.project_key, 'name': self.project_key, 'self': base_url + API_PREFIX + 'project/' + self.project_id}
+
+    def __project_fields(self, issue: dict, fields: list, properties: list = []) -> dict:
+        fields = [field for field in fields if field]
+        if fields and '*all' not in fields:
+            issue = dict(issue, fields={field: value for field, value in issue['fields'].items() if field in fields})
+        if properties:
+            issue_properties = self.issue_properties.get(issue['key'], {})
+            issue = dict(issue, properties={key: issue_properties[key] for key in properties if key in issue_properties})
+        return issue
+
+    def __search(self, query: dict) -> tuple[int, dict, dict]:
+        jql = query.get('jql', [''])[0]
+        fields = ','.join(query.get('fields', [])).split(',') if 'fields' in query else []
+        properties = ','.join(query.get('properties', [])).split(',') if 'properties' in query else []
+        start_at = int(query.get('startAt', ['0'])[0])
+        max_results = int(query.get('maxResults', ['50'])[0])
+
+        # Only the exact summary phrase, status, parent and sub-task filters are understood, every other clause matches all issues of the project
+        summary_match = re.search(r'summary ~ "\\"(.*)\\""', jql)
+        status_match = re.search(r'status = "([^"]*)"', jql)
+        parent_match = re.search(r'parent in \(([^)]*)\)', jql)
+        parent_keys = [parent_key.strip() for parent_key in parent_match.group(1).split(',')] if parent_match else None
+        with self.lock:
+            issues = [
+                issue for issue in self.issues.values()
+                if (summary_match is None or issue['fields']['summary'] == summary_match.group(1)) and \
+                    (status_match is None or issue['fields']['status']['name'] == status_match.group(1)) and \
+                    ('statusCategory != Done' not in jql or issue['fields']['status']['name'] != 'Done') and \
+                    ('issuetype not in subTaskIssueTypes()' not in jql or 'parent' not in issue['fields']) and \
+                    (parent_keys is None or issue['fields'].get('parent', {}).get('key') in parent_keys)
+            ]
+
+        return 200, {
+            'startAt': start_at,
+            'maxResults': max_results,
+            'total': len(issues),
+            'issues': [self.__project_fields(issue, fields, properties) for issue in issues[start_at:start_at + max_results]]
+        }, {}
+
+    def __get(self, base_url: str, path: str, query: dict) -> tuple[int, dict, dict]:
+
+        if path == 'serverInfo':
+            return 200, {'baseUrl': base_url, 'version': '9.12.0', 'versionNumbers': [9, 12, 0], 'deploymentType': 'Server'}, {}
+        if path == 'field':
+            return 200, [], {}
+        if path == 'project':
+            return 200, [self.__project(base_url)], {}
+        if path.startswith('project/'):
+            if path.split('/')[1] not in [self.project_key, self.project_id]:
+                return self.__error(404, 'No project could be found with key ' + path.split('/')[1])
+            return 200, dict(self.__project(base_url), issueTypes=[{'id': issue_type_id, 'name': name, 'subtask': name == 'Sub-task'} for issue_type_id, name in ISSUE_TYPES.items()]), {}
+        if path == 'search':
+            return self.__search(query)
+        if path.startswith('issue/'):
+            issue = self.get_issue(path.split('/')[1])
+            if issue is None:
+                return self.__error(404, 'Issue does not exist')
+            if path.endswith('/transitions'):
+                return 200, {'transitions': [{'id': transition_id, 'name': name, 'to': {'name': name}} for transition_id, name in TRANSITIONS.items()]}, {}
+            return 200, self.__project_fields(issue, query.get('fields', [''])[0].split(','), query.get('properties', [''])[0].split(',')), {}
+
+        return self.__error(404, 'Not implemented by the fake JIRA - ' + path)
+
+    def __post(self, base_url: str, path: str, body: dict) -> tuple[int, dict, dict]:
+
+        if path == 'issue':
+            issue = self.create_issue(base_url, body.get('fields', {}))
+            return 201, {'id': issue['id'], 'key': issue['key'], 'self': issue['self']}, {}
+
+        if path == 'issue/bulk':
+            issues, errors = [], []
+            for index, issue_update in enumerate(body.get('issueUpdates', [])):
+                if self.bulk_fail_every > 0 and (index + 1) % self.bulk_fail_every == 0:
+                    errors.append({'status': 400, 'elementErrors': {'errorMessages': [], 'errors': {'summary': 'Rejected by the fake JIRA'}}, 'failedElementNumber': index})
+                else:
+                    issue = self.create_issue(base_url, issue_update.get('fields', {}))
+                    issues.append({'id': issue['id'], 'key': issue['key'], 'self': issue['self']})
+            return 201 if not errors else 400 if not issues else 201, {'issues': issues, 'errors': errors}, {}
+
+        if path.startswith('issue/') and path.endswith('/transitions'):
+            issue = self.get_issue(path.split('/')[1])
+            transition_id = str(body.get('transition', {}).get('id'))
+            if issue is None or transition_id not in TRANSITIONS:
+                return self.__error(400, 'Invalid issue or transition')
+            with self.lock:
+                issue['fields']['status'] = {'name': TRANSITIONS[transition_id]}
+            return 204, None, {}
+
+        return self.__error(404, 'Not implemented by the fake JIRA - ' + path)
+
+    def __put(self, path: str, body: dict) -> tuple[int, dict, dict]:
+
+        if path.startswith('issue/'):
+            issue = self.get_issue(path.split('/')[1])
+            if issue is None:
+                return self.__error(404, 'Issue does not exist')
+            with self.lock:
+                if '/properties/' in path:
+                    self.issue_properties.setdefault(issue['key'], {})[path.split('/properties/')[1]] = body
+                else:
+                    issue['fields'].update(body.get('fields', {}))
+                    for label_operation in body.get('update', {}).get('labels', []):
+                        if 'add' in label_operation and label_operation['add'] not in issue['fields']['labels']:
+                            issue['fields']['labels'].append(label_operation['add'])
+                    for issue_property in body.get('properties', []):
+                        self.issue_properties.setdefault(issue['key'], {})[issue_property['key']] = issue_property['value']
+            return 204, None, {}
+
+        return self.__error(404, 'Not implemented by the fake JIRA - ' + path)
+
+    # Handle a JIRA REST API request, returns the status code, the JSON body (None for no content) and the extra response headers
+    def handle_request(self, method: str, url: str, body: bytes = b'') -> tuple[int, dict, dict]:
+
+        if self.count_request(method):
+            return 429, {'errorMessages': ['Rate limit exceeded'], 'errors': {}}, {'Retry-After': str(self.retry_after)}
+
+        parsed_url = urlparse(url)
+        base_url = parsed_url.scheme + '://' + parsed_url.netloc
+        path = parsed_url.path[len(API_PREFIX):] if parsed_url.path.startswith(API_PREFIX) else parsed_url.path
+
+        if method == 'GET':
+            return self.__get(base_url, path, parse_qs(parsed_url.query))
+        if method == 'POST':
+            return self.__post(base_url, path, json.loads(body or b'{}'))
+        if method == 'PUT':
+            return self.__put(path, json.loads(body or b'{}'))
+
+        return self.__error(405, 'Method not allowed by the fake JIRA - ' + method)
+
+
+# FakeJiraAdapter - requests transport adapter serving the JIRA REST API from a FakeJira object, so the whole JIRA client stack runs without network access
+class FakeJiraAdapter(BaseAdapter):
+
+    # FakeJiraAdapter Constructor
+    # fake_jira: FakeJira object serving the requests
+    #
+    # Returns: FakeJiraAdapter object
+    # Raises: None
+    def __init__(self, fake_jira: FakeJira):
+        super().__init__()
+        self.fake_jira = fake_jira
+
+    def send(self, request: PreparedRequest, stream=False, timeout=None, verify=True, cert=None, proxies=None) -> Response:
+
+        body = request.body.encode('utf-8') if isinstance(request.body, str) else request.body or b''
+        status, response_body, headers = self.fake_jira.handle_request(method=request.method, url=request.url, body=body)
+
+        response = Response()
+        response.status_code = status
+        response.reason = HTTPStatus(status).phrase
+        response.url = request.url
+        response.request = request
+        response.encoding = 'utf-8'
+        response.elapsed = timedelta(0)
+        response._content = json.dumps(response_body).encode('utf-8') if response_body is not None else b''
+        response.headers = CaseInsensitiveDict(dict(headers, **{'Content-Type': 'application/json', 'Content-Length': str(len(response._content))}))
+        return response
+
+    def close(self):
+        pass
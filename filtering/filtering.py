@@ -0,0 +1,112 @@
+import fnmatch
+
+# SARIF levels, from the least to the most severe
+LEVELS = [ 'none', 'note', 'warning', 'error' ]
+
+# Level of the results and rules without one, as per the SARIF specification
+DEFAULT_LEVEL = 'warning'
+
+# Get the level of a SARIF result: its own, else the default level of its rule, else `warning`
+# rule: SARIF rule of the result, {} if unknown
+def get_result_level(result: dict, rule: dict) -> str:
+    return result.get('level') or (rule.get('defaultConfiguration') or {}).get('level') or DEFAULT_LEVEL
+
+# FindingFilter - class to discard the SARIF results that are not ticketed, evaluated by SARIFFileHandler while the results are read,
+# so discarded results are never grouped, fingerprinted or rendered. The cheapest checks run first.
+class FindingFilter:
+
+    # FindingFilter Constructor
+    # min_level: Least severe level kept: `none`, `note`, `warning` or `error`. The level of a result defaults to the level of its rule, then `warning`. '' keeps every level
+    # min_security_severity: Lowest `security-severity` property kept, of the result or else of its rule, e.g. `7.0`. Results without one are kept. 0 keeps every result
+    # rules_allow: Rule IDs kept, every other rule is discarded. [] keeps every rule
+    # rules_deny: Rule IDs discarded
+    # paths_include: Globs of the file paths kept, every other file is discarded. `*` also matches `/`. [] keeps every file
+    # paths_exclude: Globs of the file paths discarded
+    # include_suppressed: Keep the results suppressed in the source or by the tool, i.e. with `suppressions` none of which is `underReview` or `rejected`
+    # exclude_baseline_states: `baselineState` values discarded, e.g. `absent` for results that are gone, or `unchanged`
+    #
+    # Returns: FindingFilter object
+    # Raises: Exception if min_level is not a SARIF level
+    def __init__(self, min_level: str = '', min_security_severity: float = 0, rules_allow: list[str] = [], rules_deny: list[str] = [], paths_include: list[str] = [], paths_exclude: list[str] = [], include_suppressed: bool = False, exclude_baseline_states: list[str] = []):
+
+        if min_level and min_level not in LEVELS:
+            raise Exception("Unsupported minimum level - " + str(min_level) + ". Expected one of " + ', '.join(LEVELS))
+
+        # Environment variables set lists as comma-separated strings, so empty strings are dropped
+        self.min_level_rank = LEVELS.index(min_level) if min_level else 0
+        self.min_security_severity = min_security_severity
+        self.rules_allow = set(rule_id.strip() for rule_id in rules_allow if rule_id.strip())
+        self.rules_deny = set(rule_id.strip() for rule_id in rules_deny if rule_id.strip())
+        self.paths_include = [ path_glob.strip() for path_glob in paths_include if path_glob.strip() ]
+        self.paths_exclude = [ path_glob.strip() for path_glob in paths_exclude if path_glob.strip() ]
+        self.include_suppressed = include_suppressed
+        self.exclude_baseline_states = set(state.strip() for state in exclude_baseline_states if state.strip())
+        self.__path_decisions = {} # file path -> kept, as a file has many results
+
+    # Check if the filter needs the rules of the SARIF file, i.e. their default level or security severity
+    def needs_rules(self) -> bool:
+        return self.min_level_rank > 0 or self.min_security_severity > 0
+
+    # Check if the result is suppressed. Suppressions under review or rejected don't suppress the result
+    def is_suppressed(self, result: dict) -> bool:
+        suppressions = result.get('suppressions')
+        return bool(suppressions) and all(suppression.get('status', 'accepted') == 'accepted' for suppression in suppressions)
+
+    # Get the security severity of a result, or else of its rule. Returns None if neither has one
+    def get_security_severity(self, result: dict, rule: dict) -> float:
+
+        for properties in [ result.get('properties'), rule.get('properties') ]:
+            if properties and properties.get('security-severity') is not None:
+                try:
+                    return float(properties['security-severity'])
+                except (TypeError, ValueError):
+                    return None
+
+        return None
+
+    # Check if the file of a result is kept by the path globs
+    def __is_path_included(self, artifact_uri: str) -> bool:
+
+        included = self.__path_decisions.get(artifact_uri)
+
+        if included is None:
+            included = (not self.paths_include or any(fnmatch.fnmatchcase(artifact_uri, path_glob) for path_glob in self.paths_include)) and \
+                not any(fnmatch.fnmatchcase(artifact_uri, path_glob) for path_glob in self.paths_exclude)
+            self.__path_decisions[artifact_uri] = included
+
+        return included
+
+    # Check if a SARIF result is kept
+    # result: SARIF result
+    # artifact_uri: Artifact URI of the first location of the result
+    # rules: Dict of rule ID -> SARIF rule of the SARIF file, needed if needs_rules() is True
+    def is_result_included(self, result: dict, artifact_uri: str, rules: dict = {}) -> bool:
+
+        if not self.include_suppressed and self.is_suppressed(result=result):
+            return False
+
+        if result.get('baselineState') in self.exclude_baseline_states:
+            return False
+
+        rule_id = result.get('ruleId')
+
+        if (self.rules_allow and rule_id not in self.rules_allow) or rule_id in self.rules_deny:
+            return False
+
+        if (self.paths_include or self.paths_exclude) and not self.__is_path_included(artifact_uri=artifact_uri):
+            return False
+
+        if self.needs_rules():
+            rule = rules.get(rule_id) or {}
+
+            if self.min_level_rank > 0:
+                level = get_result_level(result=result, rule=rule)
+                if level in LEVELS and LEVELS.index(level) < self.min_level_rank:
+                    return False
+
+            if self.min_security_severity > 0:
+                security_severity = self.get_security_severity(result=result, rule=rule)
+                if security_severity is not None and security_severity < self.min_security_severity:
+                    return False
+
+        return True
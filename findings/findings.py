@@ -0,0 +1,57 @@
+# Finding - class holding the attributes of a SARIF result published to JIRA: its ruleId, message, region, and optionally its file and fingerprint.
+# Findings are the bulk of the memory of a run, one per SARIF result, so they are `__slots__` records rather than dicts, and the strings they
+# repeat (rule IDs, messages, file names, CWE tuples) are shared through a StringTable. Unset attributes are None.
+class Finding:
+
+    __slots__ = ('ruleId', 'message', 'startLine', 'startColumn', 'endLine', 'endColumn', 'file', 'fingerprint', 'cwes')
+
+    # Region attributes, in the order they are published
+    REGION_FIELDS = ('startLine', 'startColumn', 'endLine', 'endColumn')
+
+    # Finding Constructor
+    # ruleId: Rule ID of the SARIF result
+    # message: Message text of the SARIF result
+    # startLine, startColumn, endLine, endColumn: Region of the first location of the SARIF result, None if the SARIF result doesn't report it
+    # file: Artifact URI of the first location, set when the findings are not grouped by file
+    # fingerprint: Fingerprint of the SARIF result, set when a sub-task is synced per finding
+    # cwes: Tuple of the CWE IDs of the SARIF result, e.g. ('CWE-79', ), set when the findings of several tools are merged
+    #
+    # Returns: Finding object
+    # Raises: None
+    def __init__(self, ruleId: str, message: str, startLine: int = None, startColumn: int = None, endLine: int = None, endColumn: int = None, file: str = None, fingerprint: str = None, cwes: tuple = None):
+        self.ruleId = ruleId
+        self.message = message
+        self.startLine = startLine
+        self.startColumn = startColumn
+        self.endLine = endLine
+        self.endColumn = endColumn
+        self.file = file
+        self.fingerprint = fingerprint
+        self.cwes = cwes
+
+    # Get the attributes that are set, in order, e.g. to log or serialize the finding
+    def to_dict(self) -> dict:
+        return { attribute: getattr(self, attribute) for attribute in self.__slots__ if getattr(self, attribute) is not None }
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+# StringTable - class to share one copy of each distinct string, e.g. the rule IDs, messages and file names repeated by the results of a SARIF file.
+# Unlike sys.intern(), the strings are released with the table, and the table is kept per SARIF file so parse worker processes don't share state.
+class StringTable:
+
+    __slots__ = ('__strings', )
+
+    # StringTable Constructor
+    #
+    # Returns: StringTable object
+    # Raises: None
+    def __init__(self):
+        self.__strings = {}
+
+    # Get the shared copy of a string, adding it to the table if it's new
+    def get(self, value: str) -> str:
+        return self.__strings.setdefault(value, value)
+
+    def __len__(self) -> int:
+        return len(self.__strings)
@@ -0,0 +1,141 @@
+import fnmatch
+import posixpath
+from filtering.filtering import get_result_level
+
+# Finding groupers - classes to choose the JIRA issue of a SARIF result. build_sarif_findings_dict() buckets the results by group key in a single pass,
+# and each group becomes an issue summarised by its key. Coarser groups trade issue granularity for fewer JIRA writes.
+# A grouper is selected from `input.group_by`, see GROUPERS and get_finding_grouper().
+# The groups of the level, directory and path glob groupers are the same for every tool, so unless the SARIF reports are merged their group keys
+# are prefixed with the tool name, like ToolRuleGrouper. Otherwise the report of each tool would overwrite the issues of the other tools on every run.
+
+# FileGrouper - one issue per file, the artifact URI of the first location of the result. This is the default grouping.
+class FileGrouper:
+
+    # Findings carry the name of their file when the group key is not the file name
+    tags_file = False
+
+    # The group key depends on the rule of the result, so the rules of the SARIF file are read
+    needs_rules = False
+
+    # Get the group key of a SARIF result
+    # rule: SARIF rule of the result, {} unless needs_rules is set
+    def get_group_key(self, sarif_tool_name: str, result: dict, artifact_uri: str, rule: dict = {}) -> str:
+        return artifact_uri
+
+# RuleGrouper - one issue per rule ID
+class RuleGrouper(FileGrouper):
+
+    tags_file = True
+
+    def get_group_key(self, sarif_tool_name: str, result: dict, artifact_uri: str, rule: dict = {}) -> str:
+        return str(result.get('ruleId'))
+
+# ToolRuleGrouper - one issue per tool and rule ID, for rule IDs that several tools share
+class ToolRuleGrouper(FileGrouper):
+
+    tags_file = True
+
+    def get_group_key(self, sarif_tool_name: str, result: dict, artifact_uri: str, rule: dict = {}) -> str:
+        return str(sarif_tool_name) + ': ' + str(result.get('ruleId'))
+
+# LevelGrouper - one issue per severity level of the result: error, warning, note or none. SARIF results without a level have the default level of their rule, else warning.
+class LevelGrouper(FileGrouper):
+
+    tags_file = True
+    needs_rules = True
+
+    # LevelGrouper Constructor
+    # tool_prefix: Prefix the group keys with the tool name, set when the SARIF reports are not merged
+    #
+    # Returns: LevelGrouper object
+    # Raises: None
+    def __init__(self, tool_prefix: bool = False):
+        self.tool_prefix = tool_prefix
+
+    def get_group_key(self, sarif_tool_name: str, result: dict, artifact_uri: str, rule: dict = {}) -> str:
+        return (str(sarif_tool_name) + ': ' if self.tool_prefix else '') + 'Level: ' + str(get_result_level(result=result, rule=rule))
+
+# DirectoryGrouper - one issue per directory, the first `depth` directories of the file path
+class DirectoryGrouper(FileGrouper):
+
+    tags_file = True
+
+    # DirectoryGrouper Constructor
+    # depth: Number of leading directories of the file path forming the group key. Files at a shallower depth are grouped by their own directory
+    # tool_prefix: Prefix the group keys with the tool name, set when the SARIF reports are not merged
+    #
+    # Returns: DirectoryGrouper object
+    # Raises: None
+    def __init__(self, depth: int = 1, tool_prefix: bool = False):
+        self.depth = max(1, depth)
+        self.tool_prefix = tool_prefix
+        self.__group_keys = {} # (tool name, directory) -> group key, as many results share a directory
+
+    def get_group_key(self, sarif_tool_name: str, result: dict, artifact_uri: str, rule: dict = {}) -> str:
+
+        directory = posixpath.dirname(artifact_uri)
+        group_key = self.__group_keys.get((sarif_tool_name, directory))
+
+        if group_key is None:
+            group_key = '/'.join(directory.split('/')[:self.depth]) + '/' if directory else './'
+            group_key = self.__group_keys[(sarif_tool_name, directory)] = (str(sarif_tool_name) + ': ' if self.tool_prefix else '') + group_key
+
+        return group_key
+
+# PathGlobGrouper - one issue per path glob, like CODEOWNERS: the last glob matching the file path wins. Unmatched files are grouped together.
+class PathGlobGrouper(FileGrouper):
+
+    tags_file = True
+
+    # Group key of the files matched by no glob
+    UNMATCHED_GROUP_KEY = 'Other files'
+
+    # PathGlobGrouper Constructor
+    # path_globs: List of globs matched against the file path, e.g. `src/api/*`. `*` also matches `/`
+    # tool_prefix: Prefix the group keys with the tool name, set when the SARIF reports are not merged
+    #
+    # Returns: PathGlobGrouper object
+    # Raises: None
+    def __init__(self, path_globs: list[str] = [], tool_prefix: bool = False):
+        self.path_globs = [ path_glob.strip() for path_glob in path_globs if path_glob.strip() ]
+        self.tool_prefix = tool_prefix
+        self.__group_keys = {} # (tool name, file path) -> group key, as a file has many results
+
+    def get_group_key(self, sarif_tool_name: str, result: dict, artifact_uri: str, rule: dict = {}) -> str:
+
+        group_key = self.__group_keys.get((sarif_tool_name, artifact_uri))
+
+        if group_key is None:
+            group_key = next((path_glob for path_glob in reversed(self.path_globs) if fnmatch.fnmatchcase(artifact_uri, path_glob)), self.UNMATCHED_GROUP_KEY)
+            group_key = self.__group_keys[(sarif_tool_name, artifact_uri)] = (str(sarif_tool_name) + ': ' if self.tool_prefix else '') + group_key
+
+        return group_key
+
+# Grouping strategies selectable from `input.group_by`
+GROUPERS = {
+    'file': FileGrouper,
+    'rule': RuleGrouper,
+    'tool_rule': ToolRuleGrouper,
+    'level': LevelGrouper,
+    'directory': DirectoryGrouper,
+    'path_globs': PathGlobGrouper
+}
+
+# Get the finding grouper of a grouping strategy
+# tool_prefix: Prefix the group keys of the level, directory and path glob groupers with the tool name, set when the SARIF reports are not merged
+# Raises: Exception if the grouping strategy is unknown
+def get_finding_grouper(group_by: str = 'file', directory_depth: int = 1, path_globs: list[str] = [], tool_prefix: bool = False) -> FileGrouper:
+
+    if group_by not in GROUPERS:
+        raise Exception("Unsupported grouping - " + str(group_by) + ". Expected one of " + ', '.join(GROUPERS.keys()))
+
+    if group_by == 'directory':
+        return DirectoryGrouper(depth=directory_depth, tool_prefix=tool_prefix)
+
+    if group_by == 'path_globs':
+        return PathGlobGrouper(path_globs=path_globs, tool_prefix=tool_prefix)
+
+    if group_by == 'level':
+        return LevelGrouper(tool_prefix=tool_prefix)
+
+    return GROUPERS[group_by]()
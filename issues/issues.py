@@ -1,88 +1,261 @@
 import re
 import logging
+import threading
 from jira.client import JIRA 
-from atlassian_doc_builder import ADFDoc
+from atlassian.adf import ADFDocument
 from jira.resources import Issue
+from state.state import StateStore
+from digest.digest import DescriptionDigest
+from log_handler.log_handler import LogSummary
+from transport.transport import put_issue, build_issue
 
 # Issues - Python class to manipulate JIRA issues using the JIRA Python SDK
 class Issues:
 
+    # Fields fetched for an existing issue, the ones compared or updated by an upsert
+    ISSUE_FIELDS = 'summary,description,labels'
+
     # Issues Constructor
     # jira_credentials: JIRA credentials object
     # project_key: Project key string
     # email_domain: Email domain string
     # default_issue_labels: Default issue labels list
+    # bulk_create_batch_size: Maximum number of issues created per bulk create request. JIRA Cloud accepts up to 50
+    # state_store: StateStore object. Issues whose description digest matches the stored digest are skipped without calling JIRA
+    # verify_state: Reconcile every issue against JIRA even if the stored digest matches, refreshing the state store
     # logger: Logger object
     #
     # Returns: Issues object
     # Raises: None
-    def __init__(self, logger: logging.Logger, jira_credentials: JIRA, project_key: str, project_id: int, email_domain: str, default_issue_labels: list = []):
+    def __init__(self, logger: logging.Logger, jira_credentials: JIRA, project_key: str, project_id: int, email_domain: str, default_issue_labels: list = [], bulk_create_batch_size: int = 50, state_store: StateStore = None, verify_state: bool = False):
         self.jira = jira_credentials
         self.project_key = project_key
         self.project_id = project_id
         self.email_domain = email_domain
         self.default_issue_labels = default_issue_labels
         self.logger = logger
-    
-    # Check if JIRA issue already exists, returns bool and issue_key if key exists
-    def __does_issue_exist(self, issue_summary: str) -> tuple[bool, str]:
+        self.bulk_create_batch_size = bulk_create_batch_size
+        self.state_store = state_store
+        self.digest = DescriptionDigest(logger=logger)
+        self.verify_state = verify_state
+        self.existing_issues = None # Index of issue summary -> issue, built by prefetch_existing_issues() on the first issue lookup
+        self.__prefetch_lock = threading.Lock()
+        self.__pending_issues = {} # Issues waiting to be bulk created, issue summary -> create fields
+        self.__pending_issues_lock = threading.Lock()
+
+    # Fetch all open issues created by this tool for the project in bulk and index them by summary, so upserts can resolve existing issues locally.
+    # Sub-tasks are left out, they are synced by SubTasks.
+    # Only the fields compared during an upsert are fetched. The JIRA client paginates through the search results.
+    def prefetch_existing_issues(self) -> dict:
 
-        # Search for issues in this project where the given summary matches exactly and the status is not Done to avoid older issues being updated with newer findings. Newer findings require newer tickets in that case.
         issues = self.jira.search_issues(
-            'project = ' + self.project_key + ' AND status = "To Do" AND summary ~ "\\"' + issue_summary + '\\""'
+            'project = ' + self.project_key + ' AND status = "To Do" AND reporter = currentUser() AND issuetype not in subTaskIssueTypes() ORDER BY created ASC',
+            maxResults=False,
+            fields=self.ISSUE_FIELDS,
+            properties=DescriptionDigest.ISSUE_PROPERTY_KEY
         )
 
-        self.logger.debug("Search Issue results - " + str(issues))
+        self.existing_issues = {}
+        for issue in issues:
+            # Keep the oldest issue when several issues share the same summary
+            if issue.fields.summary not in self.existing_issues:
+                self.existing_issues[issue.fields.summary] = issue
+
+        self.logger.info("Prefetched existing issues - " + str(len(self.existing_issues)))
+        return self.existing_issues
+
+    # Prefetch the existing issues on the first lookup, so a run where every issue is unchanged doesn't search JIRA at all
+    def __prefetch_existing_issues_once(self):
+
+        if self.existing_issues is None:
+            with self.__prefetch_lock:
+                if self.existing_issues is None:
+                    self.prefetch_existing_issues()
+
+    # Get the summaries of the open issues of the project, e.g. to find the continuation issues of a file
+    def get_open_issue_summaries(self) -> list[str]:
+
+        self.__prefetch_existing_issues_once()
+        return list(self.existing_issues.keys())
 
-        if len(issues) > 0:
-            self.logger.info("Issue already exists - " + str(issues))
-            return True, issues[0].key
+    # Get the keys of the open issues with the given summaries, e.g. the parents of the sub-tasks of fixed findings. Summaries without an open issue are left out
+    def get_open_issue_keys(self, issue_summaries: list[str]) -> list[str]:
+
+        self.__prefetch_existing_issues_once()
+        return [ self.existing_issues[issue_summary].key for issue_summary in issue_summaries if issue_summary in self.existing_issues ]
+
+    # Check if JIRA issue already exists, returns bool and issue_key if key exists.
+    # Only open issues are resolved, so older issues that are Done are not updated with newer findings. Newer findings require newer tickets in that case.
+    def __does_issue_exist(self, issue_summary: str) -> tuple[bool, str]:
+
+        # Resolve the issue from the prefetched index
+        self.__prefetch_existing_issues_once()
+
+        if issue_summary in self.existing_issues:
+            self.logger.info("Issue already exists - " + str(self.existing_issues[issue_summary].key))
+            return True, self.existing_issues[issue_summary].key
         else:
-            self.logger.info("Issue does not exist - " + str(issues))
+            self.logger.info("Issue does not exist - " + issue_summary)
             return False, ''
     
+    # Build the fields of a new JIRA issue. Mandatory labels are part of the create payload, so no follow-up label update is needed.
+    def __build_issue_fields(self, issue_summary: str, issue_desc: ADFDocument, issue_type: str) -> dict:
+
+        fields = {
+            'project': {'id': self.project_id},
+            'summary': issue_summary,
+            'description': issue_desc.payload if isinstance(issue_desc, ADFDocument) else str(issue_desc),
+            'issuetype': {'name': issue_type}
+        }
+
+        if self.default_issue_labels:
+            fields.update({'labels': list(self.default_issue_labels)})
+
+        return fields
+
     # Create a new JIRA issue
-    def __create_issue(self, issue_summary: str, issue_desc: ADFDoc, issue_type: str) -> Issue:        
+    def __create_issue(self, fields: dict) -> Issue:
 
         # Create an issue
-        new_issue = self.jira.create_issue(
-            fields={
-                'project': self.project_id,
-                'summary': issue_summary,
-                'description': str(issue_desc.validate()) if isinstance(issue_desc, ADFDoc) else str(issue_desc),
-                'issuetype': {'name': issue_type}
-            }
-        )
-        self.logger.info("New Issue created: " + str(new_issue))
-        self.logger.info("New Issue type: " + str(type(new_issue)))
+        new_issue = self.jira.create_issue(fields=fields)
+        self.logger.info("New Issue created: %s", new_issue)
+        self.logger.debug("New Issue type: %s", type(new_issue))
         return new_issue
 
+    # Record the issue key and the description digest of an issue in the state store
+    def __record_issue_state(self, issue_summary: str, issue_key: str, issue_desc: str):
+
+        if self.state_store is not None:
+            self.state_store.put_issue(
+                project_key = self.project_key,
+                issue_summary = issue_summary,
+                issue_key = issue_key,
+                digest = self.digest.get_digest(issue_desc)
+            )
+
+    # Index a new issue so later upserts with the same summary in this run update it instead of creating a duplicate
+    def __index_new_issue(self, new_issue: Issue, fields: dict):
+
+        if self.existing_issues is not None:
+            self.existing_issues[fields['summary']] = new_issue
+
+        self.__record_issue_state(issue_summary=fields['summary'], issue_key=new_issue.key, issue_desc=fields['description'])
+
+    # Queue a new JIRA issue for bulk creation. A queued issue with the same summary is replaced, the latest description wins.
+    def __queue_issue_creation(self, fields: dict):
+
+        with self.__pending_issues_lock:
+            self.__pending_issues[fields['summary']] = fields
+
+        self.logger.debug("Issue queued for creation - " + fields['summary'])
+
+    # Take the issues queued for creation, returns lists of create fields of at most `bulk_create_batch_size` issues
+    def get_pending_issue_batches(self) -> list[list[dict]]:
+
+        with self.__pending_issues_lock:
+            pending_issues = list(self.__pending_issues.values())
+            self.__pending_issues = {}
+
+        return [
+            pending_issues[index:index + self.bulk_create_batch_size]
+            for index in range(0, len(pending_issues), self.bulk_create_batch_size)
+        ]
+
+    # Create a batch of JIRA issues with a single bulk create request. Issues rejected by the bulk request are created one at a time.
+    def create_issues_in_bulk(self, field_list: list[dict]) -> list[Issue]:
+
+        new_issues = []
+
+        # prefetch=False skips a GET per created issue. The create fields are attached to the returned issues so they can be indexed.
+        bulk_results = self.jira.create_issues(field_list=field_list, prefetch=False)
+
+        failed_fields = []
+        for bulk_result in bulk_results:
+
+            if bulk_result['status'] == 'Success':
+                new_issue = build_issue(jira=self.jira, raw=dict(bulk_result['issue'].raw, fields=bulk_result['input_fields']))
+                self.logger.info("New Issue created: %s", new_issue)
+                self.__index_new_issue(new_issue=new_issue, fields=bulk_result['input_fields'])
+                new_issues.append(new_issue)
+            else:
+                self.logger.warning("Bulk create failed for Issue - " + bulk_result['input_fields']['summary'] + " - " + str(bulk_result['error']))
+                failed_fields.append(bulk_result['input_fields'])
+
+        # Fall back to creating the rejected issues individually. Errors are logged rather than raised so a retry of this batch does not duplicate the issues already created.
+        for fields in failed_fields:
+            try:
+                new_issue = self.__create_issue(fields=fields)
+                self.__index_new_issue(new_issue=new_issue, fields=fields)
+                new_issues.append(new_issue)
+            except Exception as e:
+                self.logger.error("Error creating Issue - " + fields['summary'] + " - " + str(e))
+
+        self.logger.info("Bulk created " + str(len(new_issues)) + " of " + str(len(field_list)) + " Issue(s).")
+        return new_issues
+
     # Get an JIRA issue
     def __get_issue(self, issue_id: str) -> Issue:
 
-        issue = self.jira.issue(issue_id)
-        self.logger.debug("Get Issue: " + str(issue.fields.summary) + " - " + str(issue.fields.description))
+        issue = self.jira.issue(issue_id, fields=self.ISSUE_FIELDS, properties=DescriptionDigest.ISSUE_PROPERTY_KEY)
+        self.logger.debug("Get Issue: %s - %s", issue.fields.summary, LogSummary(issue.fields.description))
         return issue
 
-    # Update an JIRA issue
-    def __update_issue(self, issue_id: str, issue_summary: str, issue_desc: ADFDoc) -> Issue:
+    # Update an JIRA issue. issue is the copy of the issue fetched before the update, if any.
+    def __update_issue(self, issue_id: str, issue_summary: str, issue_desc: ADFDocument, issue: Issue = None) -> Issue:
 
         self.logger.debug("Updating Issue ID: " + issue_id)
 
-        # Change the issue's summary and description.
-        self.jira.issue(issue_id).update(
-            fields={
-                'summary': issue_summary,
-                'description': str(issue_desc.validate()) if isinstance(issue_desc, ADFDoc) else str(issue_desc)
-            },
-            notify=True
+        fields = {
+            'summary': issue_summary,
+            'description': issue_desc.payload if isinstance(issue_desc, ADFDocument) else str(issue_desc)
+        }
+
+        # Change the issue's summary and description. The digest of the published description is stored in an issue property by the same request,
+        # so the next run compares digests even if JIRA reformats the description
+        issue_property = {'digest': self.digest.get_digest(issue_desc)}
+        put_issue(
+            jira = self.jira,
+            issue_id = issue_id,
+            data = {
+                'fields': fields,
+                'properties': [{'key': DescriptionDigest.ISSUE_PROPERTY_KEY, 'value': issue_property}]
+            }
         )
 
-        updated_issue = self.jira.issue(issue_id)
-        self.logger.debug("Issue Updated: " + str(updated_issue.fields.summary) + " - " + str(updated_issue.fields.description))
-        return updated_issue
+        # Fetch the server copy only to log it
+        if self.logger.isEnabledFor(logging.DEBUG):
+            updated_issue = self.__get_issue(issue_id = issue_id)
+            self.logger.debug("Issue Updated: %s - %s", updated_issue.fields.summary, LogSummary(updated_issue.fields.description))
+            return updated_issue
+
+        # Otherwise apply the update to the local copy of the issue
+        raw = issue.raw if issue is not None else {'key': issue_id, 'fields': {}}
+        return build_issue(
+            jira=self.jira,
+            raw=dict(
+                raw,
+                fields=dict(raw.get('fields', {}), **fields),
+                properties=dict(raw.get('properties', {}), **{DescriptionDigest.ISSUE_PROPERTY_KEY: issue_property})
+            )
+        )
     
-    def upsert_jira_issue(self, issue_summary: str, issue_desc: ADFDoc, issue_type: str = "Task") -> Issue:
+    # Update the JIRA issue with the given summary if it exists, otherwise queue it for bulk creation. Returns the existing issue, or None when the issue is queued or unchanged since the last run.
+    def upsert_jira_issue(self, issue_summary: str, issue_desc: ADFDocument, issue_type: str = "Task") -> Issue:
+
+        # The ADF document was validated when it was built, its cached payload is reused for the digest and the JIRA request
+        if isinstance(issue_desc, ADFDocument):
+            issue_desc = issue_desc.payload
+
+        issue_digest = self.digest.get_digest(issue_desc)
+
+        # Skip the issue when the description digest matches the state store, unless the state is being verified against JIRA
+        if self.state_store is not None and not self.verify_state:
+
+            issue_state = self.state_store.get_issue(project_key=self.project_key, issue_summary=issue_summary)
+
+            if issue_state is not None and issue_state['digest'] == issue_digest:
+                self.logger.debug("Issue Description is unchanged since the last run. Skipping Issue - " + issue_summary)
+                return None
 
         # Check if issue already exists. If it does, then don't create a new issue. If it doesn't, then create a new issue
         # Returns bool and issue_key if key exists. Returns bool and empty string if key doesn't exist.
@@ -90,54 +263,62 @@ class Issues:
 
         if key_info[0]:
 
-            issue = self.__get_issue(issue_id = key_info[1])
+            # Reuse the prefetched issue, it carries the fields compared below
+            issue = self.existing_issues[issue_summary]
 
-            # Compare hashes of server version (issue.fields.description) and local version (issue_desc)
-            if isinstance(issue_desc, ADFDoc):
-                issue_desc = str(issue_desc.validate())
+            # Compare the digests of the server version and the local version (issue_desc). The digest stored in the issue property is used when present,
+            # otherwise the digest of the canonical server description (issue.fields.description).
+            server_digest = self.digest.get_issue_property_digest(issue=issue) or self.digest.get_digest(issue.fields.description)
 
-            if hash(issue.fields.description) != hash(issue_desc):
+            if server_digest != issue_digest:
                 self.logger.debug("Issue Description has changed. Updating Issue.")
 
-                return self.__update_issue(
+                updated_issue = self.__update_issue(
                     issue_id = key_info[1],
                     issue_summary = issue_summary,
                     issue_desc = issue_desc,
+                    issue = issue
                 )
+
+                self.existing_issues[issue_summary] = updated_issue
+                issue = updated_issue
             else:
                 self.logger.debug("Issue Description has not changed. Issue does not need an update.")
+
+            self.__record_issue_state(issue_summary=issue_summary, issue_key=key_info[1], issue_desc=issue_desc)
             return issue
         else:
-            # Create an Issue with the data object
-            new_issue = self.__create_issue(
-                issue_summary = issue_summary,
-                issue_desc = issue_desc,
-                issue_type = issue_type
+            # Queue the Issue for bulk creation with the data object. The queue is flushed by create_issues_in_bulk().
+            self.__queue_issue_creation(
+                fields = self.__build_issue_fields(
+                    issue_summary = issue_summary,
+                    issue_desc = issue_desc,
+                    issue_type = issue_type
+                )
             )
 
-            if self.default_issue_labels:
-                self.logger.debug("Tagging mandatory labels onto Issue.")
-                self.__tag_mandatory_labels_onto_issue(issue_id = new_issue)
-            else:
-                self.logger.debug("No mandatory labels to tag onto Issue.")
+            return None
 
-            return new_issue
+    # Transition the open JIRA issue with the given summary, e.g. to `Done` once all of its findings are fixed. Returns True if the issue was transitioned.
+    def transition_jira_issue(self, issue_summary: str, transition_name: str) -> bool:
 
-    # Tag mandatory labels onto a JIRA issue
-    def __tag_mandatory_labels_onto_issue(self, issue_id: str) -> Issue:
+        key_info = self.__does_issue_exist(issue_summary = issue_summary)
 
-        # Get an issue.
-        issue = self.jira.issue(issue_id)
+        if not key_info[0]:
+            self.logger.debug("No open Issue to transition - " + issue_summary)
+            return False
 
-        # Modify the List of existing labels. The new label is unicode with no spaces
-        for label in self.default_issue_labels:
-            issue.fields.labels.append(label)
+        self.jira.transition_issue(key_info[1], transition_name)
+        self.logger.info("Issue transitioned to " + transition_name + " - " + key_info[1])
 
-        # Change the issue without sending updates
-        issue.update(notify=False, fields={"labels": issue.fields.labels})
+        # The issue is no longer open, so a later finding in the same file gets a new issue
+        self.existing_issues.pop(issue_summary, None)
+
+        if self.state_store is not None:
+            self.state_store.remove_issue(project_key=self.project_key, issue_summary=issue_summary)
+
+        return True
 
-        return issue 
-    
     # Get all comments on an issue
     def __get_comments_on_issue(self, issue_id: str) -> Issue:
 
@@ -151,7 +332,7 @@ class Issues:
             if re.search(self.email_domain, comment.author.emailAddress)
         ]
 
-        self.logger.info("Issue Comments - " + str(org_comments))
+        self.logger.info("Issue Comments - %s", LogSummary(org_comments))
 
         return issue
 
@@ -0,0 +1,87 @@
+import json
+import logging
+
+# Log formats selectable from the `LOG_FORMAT` environment variable. `json` writes one JSON object per line, for log shippers
+LOG_FORMATS = [ 'text', 'json' ]
+
+# Longest rendering of a value summarised by LogSummary, in characters, unless `LOG_MAX_LENGTH` is set
+DEFAULT_MAX_LENGTH = 2000
+
+# Longest rendering of a value summarised by LogSummary, set by configure_logging()
+max_length = DEFAULT_MAX_LENGTH
+
+# LogSummary - class to log a value, e.g. a SARIF result, a findings list or a config dict, without rendering it unless the log record is emitted.
+# Pass it as an argument of the log message, `logger.debug("Findings - %s", LogSummary(findings))`, so nothing is stringified below the log level,
+# and the rendering is capped at `max_length` characters so one record can't flood the log file.
+class LogSummary:
+
+    __slots__ = ('value', 'max_length')
+
+    # LogSummary Constructor
+    # value: Value to log
+    # max_length: Longest rendering of the value, in characters. None uses `LOG_MAX_LENGTH`, 0 doesn't cap it
+    #
+    # Returns: LogSummary object
+    # Raises: None
+    def __init__(self, value: any, max_length: int = None):
+        self.value = value
+        self.max_length = max_length
+
+    def __str__(self) -> str:
+
+        text = str(self.value)
+        limit = max_length if self.max_length is None else self.max_length
+
+        if limit and len(text) > limit:
+            return text[:limit] + '… (' + str(len(text)) + ' characters)'
+
+        return text
+
+# JSONLogFormatter - class to format log records as JSON objects, one per line
+class JSONLogFormatter(logging.Formatter):
+
+    def format(self, record: logging.LogRecord) -> str:
+
+        log_entry = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+
+        if record.exc_info:
+            log_entry['exception'] = self.formatException(record.exc_info)
+
+        return json.dumps(log_entry, ensure_ascii=False, default=str)
+
+# Configure the root log handler, to the log file if log_filename is set, else to stderr
+# log_format: `text`, or `json` for one JSON object per line. An unknown log format falls back to `text` with a warning
+# log_max_length: Longest rendering of a value summarised by LogSummary, in characters. 0 doesn't cap it
+# Raises: None
+def configure_logging(log_filename: str = '', log_format: str = 'text', log_max_length: int = DEFAULT_MAX_LENGTH):
+
+    global max_length
+
+    # Logging is configured before the config is loaded and errors are handled, so a bad value must not stop the run
+    unsupported_log_format = log_format if log_format not in LOG_FORMATS else None
+    if unsupported_log_format is not None:
+        log_format = 'text'
+
+    max_length = log_max_length
+
+    if log_filename:
+        logging.basicConfig(
+            filename=log_filename,
+            filemode='a',
+            format='%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s',
+            datefmt='%H:%M:%S'
+        )
+    else:
+        logging.basicConfig()
+
+    if log_format == 'json':
+        for handler in logging.getLogger().handlers:
+            handler.setFormatter(JSONLogFormatter(datefmt='%Y-%m-%dT%H:%M:%S%z'))
+
+    if unsupported_log_format is not None:
+        logging.getLogger(__name__).warning("Unsupported log format - " + str(unsupported_log_format) + ". Expected one of " + ', '.join(LOG_FORMATS) + ", logging as text.")
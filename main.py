@@ -1,142 +1,469 @@
 # from __future__ import annotations
 import logging
+import time
 import traceback
-from os import environ
-from jira import JIRA
+from os import environ, path
 from projects.projects import Projects
 from issues.issues import Issues
 from sarif_file_handler.sarif_file_handler import SARIFFileHandler
+from sarif_file_handler.sarif_discovery import SARIFDiscovery
 from config_handler.config_handler import ConfigHandler
-from atlassian_doc_builder import load_adf, ADFDoc
-from atlassian.adf import AtlassianDocumentFormatBuilder
+from atlassian.adf import AtlassianDocumentFormatBuilder, ADFDocument, set_schema_validation
 from utils.utils import Utils
+from executor.executor import UpsertExecutor
+from transport.transport import JiraTransport
+from fake_jira.fake_jira import FakeJira
+from pagination.pagination import DescriptionPaginator
+from subtasks.subtasks import SubTasks
+from state.state import StateStore
+from baseline.baseline import SARIFBaseline
+from report.report import RunReport
+from grouping.grouping import get_finding_grouper
+from filtering.filtering import FindingFilter
+from merging.merging import FindingMerger
+from log_handler.log_handler import configure_logging, LogSummary, DEFAULT_MAX_LENGTH
+
+# Setting up the logging to the file `LOG_FILENAME` if set, as text or as JSON lines per `LOG_FORMAT`, with values capped at `LOG_MAX_LENGTH` characters
+configure_logging(
+    log_filename=environ.get('LOG_FILENAME', ''),
+    log_format=environ.get('LOG_FORMAT', 'text'),
+    log_max_length=int(environ['LOG_MAX_LENGTH']) if environ.get('LOG_MAX_LENGTH', '').isdigit() else DEFAULT_MAX_LENGTH
+)
+logger = logging.getLogger(__name__)
+
+# Setting up the logging level from the environment variable `LOG_LEVEL`.
+logger.setLevel(environ['LOG_LEVEL'] if 'LOG_LEVEL' in environ.keys() else 'INFO')
 
-# Setting up the logging level from the environment variable `LOGLEVEL`.
-if 'LOG_FILENAME' in environ.keys():
-    logging.basicConfig(
-        filename=environ['LOG_FILENAME'],
-        filemode='a',
-        format='%(asctime)s,%(msecs)d %(name)s %(levelname)s %(message)s',
-        datefmt='%H:%M:%S'
-    )
-    logger = logging.getLogger(__name__)
-else:
-    logging.basicConfig()
-    logger = logging.getLogger(__name__)
+# Build a JIRA issue per group of findings of a SARIF report, by default per file, and upsert them. Issues to create are queued by the upserts and created in bulk afterwards.
+# The findings of a file that don't fit in one description go to continuation issues, see DescriptionPaginator.
+# When sub_tasks is set, each finding also gets a sub-task under the issue of its file, see SubTasks.
+def publish_sarif_findings(config: dict, utils: Utils, issues: Issues, executor: UpsertExecutor, run_report: RunReport, paginator: DescriptionPaginator, sarif_tool_name: str, sarif_findings: dict, sub_tasks: SubTasks = None):
 
-logger.setLevel(environ['LOG_LEVEL'] if 'LOG_LEVEL' in environ.keys() else 'INFO')
+    issue_upserts = []
+    page_counts = {} # file name -> number of pages of its description
+
+    # Time the rendering of the issue descriptions
+    render_start_time = time.perf_counter()
+
+    for sarif_per_file_key in sarif_findings.keys():
+
+        logger.debug("[%s]: %s - %d finding(s) - %s", sarif_tool_name, sarif_per_file_key, len(sarif_findings[sarif_per_file_key]), LogSummary(sarif_findings[sarif_per_file_key]))
+
+        if config["jira"]["use_atlassian_document_format"]:
+            # Build Atlassian Document Format descriptions
+            adf_builder = AtlassianDocumentFormatBuilder(logger=logger)
+
+            issue_descs = adf_builder.build_atlassian_document_format_pages_from_dict(sarif_tool_name=sarif_tool_name, key=sarif_per_file_key, results=sarif_findings[sarif_per_file_key], paginator=paginator)
+
+            # The run carries on with the other files, and fails once they are published, see main()
+            if issue_descs is None:
+                logger.error("[" + sarif_tool_name + "]: Skipping the findings of " + sarif_per_file_key + ", their description could not be built.")
+                run_report.increment_counter(counter_name='files_skipped')
+                continue
+        else:
+            issue_descs = utils.serialize_findings_pages(finding_file_key=sarif_per_file_key, findings=sarif_findings[sarif_per_file_key], paginator=paginator)
+
+        page_counts[sarif_per_file_key] = len(issue_descs)
+
+        for page_number, issue_desc in enumerate(issue_descs, start=1):
+
+            issue_summary = paginator.get_page_summary(issue_summary=sarif_per_file_key, page_number=page_number)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("JIRA Issue Summary: %s", issue_summary)
+                logger.debug("JIRA Issue Description: %s", LogSummary(issue_desc.payload if isinstance(issue_desc, ADFDocument) else issue_desc))
+
+            issue_upserts.append({
+                'issue_summary': issue_summary,
+                'issue_desc': issue_desc,
+                'issue_type': "Task"
+            })
+
+    run_report.add_stage_time(stage_name='render', seconds=time.perf_counter() - render_start_time, count=len(issue_upserts))
+
+    # Update or Insert a JIRA issue per file. If the issue exists, then update it. If the issue doesn't exist, then create a new issue.
+    with run_report.time_stage('jira_upsert'):
+        upserted_issues = executor.run_upserts(upsert_function=issues.upsert_jira_issue, upsert_kwargs_list=issue_upserts)
+
+    # Create the new issues queued by the upserts, up to 50 issues per bulk create request. They were already counted as upserts.
+    with run_report.time_stage('jira_bulk_create'):
+        new_issues = executor.run_upserts(
+            upsert_function=issues.create_issues_in_bulk,
+            upsert_kwargs_list=[{'field_list': field_list} for field_list in issues.get_pending_issue_batches()],
+            issue_count=0
+        )
+
+    run_report.increment_counter(counter_name='issues_created', value=sum(len(new_issue_batch) for new_issue_batch in new_issues))
+
+    # Transition the continuation issues left over from a longer description, when `jira.fixed_issue_transition` is set
+    if config["jira"]["fixed_issue_transition"] and page_counts:
+        stale_issue_summaries = []
+        for issue_summary in issues.get_open_issue_summaries():
+            file_key, page_number = paginator.split_page_summary(page_summary=issue_summary)
+            if file_key in page_counts and page_number > page_counts[file_key]:
+                stale_issue_summaries.append(issue_summary)
+
+        with run_report.time_stage('jira_transition'):
+            executor.run_upserts(
+                upsert_function=issues.transition_jira_issue,
+                upsert_kwargs_list=[{'issue_summary': issue_summary, 'transition_name': config["jira"]["fixed_issue_transition"]} for issue_summary in stale_issue_summaries]
+            )
+
+    # Sync a sub-task per finding under the issue of each file, i.e. its first page. Issues skipped as unchanged since the last run keep their sub-tasks.
+    # Unless the reports are merged, only the sub-tasks of this report's tool are synced, the issue of a file is shared with the other tools
+    if sub_tasks is not None:
+        parent_findings, new_parent_keys = {}, set()
+
+        for issue_upsert, upserted_issue in zip(issue_upserts, upserted_issues):
+            if upserted_issue is not None and issue_upsert['issue_summary'] in sarif_findings:
+                parent_findings[upserted_issue.key] = (issue_upsert['issue_summary'], sarif_findings[issue_upsert['issue_summary']])
+
+        for new_issue in [new_issue for new_issue_batch in new_issues for new_issue in new_issue_batch]:
+            if new_issue.fields.summary in sarif_findings:
+                parent_findings[new_issue.key] = (new_issue.fields.summary, sarif_findings[new_issue.fields.summary])
+                new_parent_keys.add(new_issue.key)
+
+        with run_report.time_stage('jira_sub_tasks'):
+            sub_tasks_created, sub_tasks_closed = sub_tasks.sync_sub_tasks(executor=executor, parent_findings=parent_findings, new_parent_keys=new_parent_keys, tool_name=sarif_tool_name)
+
+        run_report.increment_counter(counter_name='sub_tasks_created', value=sub_tasks_created)
+        run_report.increment_counter(counter_name='sub_tasks_closed', value=sub_tasks_closed)
 
 def main():
 
     try:
-        logger.debug("Environment variables - " + str(environ))
+        logger.debug("Environment variable names - %s", LogSummary(sorted(environ.keys())))
         configHandlerObj = ConfigHandler(logger=logger)
         utilsObj = Utils(logger=logger)
 
+        # Create a RunReport Object to record the time spent in each stage and the JIRA calls
+        runReportObj = RunReport(logger=logger)
+        config_start_time = time.perf_counter()
+
         # Build a config file using config.json if it exists
         config_file = configHandlerObj.load_config_file()
-        logger.debug("Config File Object - " + str(config_file))
+        logger.debug("Config File Object - %s", LogSummary(config_file))
 
         # Override config.json if exists, with Environment variables for GitHub Actions and CI purposes
         config_env = configHandlerObj.load_config_env()
-        logger.debug("Config Env Object - " + str(config_env))
+        logger.debug("Config Env Object - %s", LogSummary(config_env))
 
         # Merge both config objects
         configHandlerObj.config = configHandlerObj.get_combined_config(config_file=config_file, config_env=config_env)
-        logger.debug("Final Config Object - " + str(configHandlerObj.config))
+        logger.debug("Final Config Object - %s", LogSummary(configHandlerObj.config))
+
+        runReportObj.add_stage_time(stage_name='config', seconds=time.perf_counter() - config_start_time)
+
+        # Serve the project from an in-memory fake JIRA when `jira.backend` is `fake`, e.g. to benchmark the whole pipeline without network access
+        fakeJiraObj = None
+        if configHandlerObj.config["jira"]["backend"] == 'fake':
+            fakeJiraObj = FakeJira(project_key=configHandlerObj.config["jira"]["project_key"])
+
+            # The ADF schema is downloaded, so the descriptions are not validated against it without a JIRA to publish them to
+            set_schema_validation(enabled=False)
+        elif configHandlerObj.config["jira"]["backend"] != 'jira':
+            raise Exception("Unknown JIRA backend `" + str(configHandlerObj.config["jira"]["backend"]) + "`, expected `jira` or `fake`.")
+
+        # Record the JIRA writes to the plan file instead of sending them when `jira.dry_run` is set
+        dry_run = configHandlerObj.config["jira"]["dry_run"]
+        plan_file_path = path.join(utilsObj.get_workspace_directory(), configHandlerObj.config["output"]["plan_file"]) if dry_run else ''
+
+        # Create a JiraTransport Object. The connection pool holds one connection per upsert worker unless `jira.pool_size` is set
+        transportObj = JiraTransport(
+            logger=logger,
+            pool_size=configHandlerObj.config["jira"]["pool_size"] or configHandlerObj.config["jira"]["max_workers"],
+            timeout=configHandlerObj.config["jira"]["timeout"],
+            max_retries=configHandlerObj.config["jira"]["max_retries"],
+            run_report=runReportObj,
+            fake_jira=fakeJiraObj,
+            plan_file_path=plan_file_path
+        )
 
         # Create a JIRA Object
-        jira = JIRA(
-            server=configHandlerObj.config["jira"]["cloud_url"],
-            basic_auth=(configHandlerObj.config["jira"]["auth_email"],
-            configHandlerObj.config["jira"]["api_token"])
-        )
+        with runReportObj.time_stage('jira_connect'):
+            jira = transportObj.create_client(
+                server=configHandlerObj.config["jira"]["cloud_url"],
+                basic_auth=(configHandlerObj.config["jira"]["auth_email"],
+                configHandlerObj.config["jira"]["api_token"])
+            )
+
+        # Create a StateStore Object if a state file is configured, to skip the project lookup and the issues that did not change since the last run
+        stateStoreObj = None
+        if configHandlerObj.config["jira"]["state_file"]:
+            stateStoreObj = StateStore(
+                logger=logger,
+                file_path=path.join(utilsObj.get_workspace_directory(), configHandlerObj.config["jira"]["state_file"]),
+                ttl_hours=configHandlerObj.config["jira"]["state_ttl_hours"]
+            )
 
         # Create an Projects Object
-        projectsObj = Projects(jira_credentials=jira, logger=logger)
+        projectsObj = Projects(jira_credentials=jira, logger=logger, state_store=stateStoreObj)
 
         # Returns bool and project ID
-        project_info = projectsObj.does_project_exist(configHandlerObj.config["jira"]["project_key"])
+        with runReportObj.time_stage('project_lookup'):
+            project_info = projectsObj.does_project_exist(configHandlerObj.config["jira"]["project_key"])
 
         if project_info[0]:
 
-            sarifObj = SARIFFileHandler(logger=logger, utils=utilsObj)
-            sarif_files_list = sarifObj.check_for_sarif_files_in_project_root_directory()
-
-            # Iterate through the SARIF results file in the project root directory that ends with .sarif or contains the term ".sarif" in the filename
-            for sarif_file_path in sarif_files_list:
-
-                sarif_tool_name, sarif_data = sarifObj.load_sarif_data(sarif_file_path=sarif_file_path)
+            sarifObj = SARIFFileHandler(
+                logger=logger,
+                utils=utilsObj,
+                input_format=configHandlerObj.config["input"]["format"],
+                collect_fingerprints=bool(configHandlerObj.config["input"]["baseline"]),
+                finding_fingerprints=configHandlerObj.config["jira"]["create_sub_tasks"],
+                run_report=runReportObj,
+                finding_cwes=configHandlerObj.config["input"]["merge_tools"],
+                grouper=get_finding_grouper(
+                    group_by=configHandlerObj.config["input"]["group_by"],
+                    directory_depth=configHandlerObj.config["input"]["group_directory_depth"],
+                    path_globs=configHandlerObj.config["input"]["group_path_globs"],
+                    tool_prefix=not configHandlerObj.config["input"]["merge_tools"]
+                ),
+                finding_filter=FindingFilter(
+                    min_level=configHandlerObj.config["input"]["filter_min_level"],
+                    min_security_severity=configHandlerObj.config["input"]["filter_min_security_severity"],
+                    rules_allow=configHandlerObj.config["input"]["filter_rules_allow"],
+                    rules_deny=configHandlerObj.config["input"]["filter_rules_deny"],
+                    paths_include=configHandlerObj.config["input"]["filter_paths_include"],
+                    paths_exclude=configHandlerObj.config["input"]["filter_paths_exclude"],
+                    include_suppressed=configHandlerObj.config["input"]["filter_include_suppressed"],
+                    exclude_baseline_states=configHandlerObj.config["input"]["filter_exclude_baseline_states"]
+                ),
+                discovery=SARIFDiscovery(
+                    logger=logger,
+                    include_globs=configHandlerObj.config["input"]["sarif_include_globs"],
+                    exclude_globs=configHandlerObj.config["input"]["sarif_exclude_globs"]
+                )
+            )
+
+            with runReportObj.time_stage('discovery'):
+                sarif_files_list = sarifObj.get_sarif_files_list(input_type=configHandlerObj.config["input"]["type"])
+
+            runReportObj.set_counter(counter_name='sarif_files', value=len(sarif_files_list))
+
+            # Create an Issues Object
+            issueObj = Issues(
+                logger=logger,
+                jira_credentials=jira,
+                project_key=configHandlerObj.config["jira"]["project_key"],
+                project_id=project_info[1],
+                email_domain="@" + str(configHandlerObj.config["jira"]["auth_email"].split('@')[1]),
+                default_issue_labels=configHandlerObj.config["jira"]["default_issue_labels"],
+                state_store=stateStoreObj,
+                verify_state=configHandlerObj.config["jira"]["state_verify"]
+            )
+
+            # Create a SARIFBaseline Object if a baseline is configured, to publish only the files whose findings changed since the baseline.
+            # The baseline is either SARIF file(s) in the workspace, or `state` for the fingerprints recorded by the previous run in the state file.
+            baselineObj = None
+            current_fingerprints = {} # tool name -> file name -> set of fingerprints of this run
+            deferred_findings = [] # (tool name, findings) of the files to publish only if some of their findings were fixed
+            if configHandlerObj.config["input"]["baseline"]:
+                baselineObj = SARIFBaseline(logger=logger)
+
+                if configHandlerObj.config["input"]["baseline"] == 'state':
+                    if stateStoreObj is None:
+                        raise Exception("The `state` baseline requires a state file, set `jira.state_file`.")
+                    baselineObj.load_from_state(state_store=stateStoreObj)
+                else:
+                    # The baseline SARIF files are parsed by the same SARIFFileHandler, so their parse time is also part of the SARIF parse stages
+                    with runReportObj.time_stage('baseline_load'):
+                        baselineObj.load_from_sarif_files(
+                            sarif_handler=sarifObj,
+                            baseline_path=path.join(utilsObj.get_workspace_directory(), configHandlerObj.config["input"]["baseline"])
+                        )
 
-                sarif_result_count = sarif_data.get_result_count()
+            # Create a DescriptionPaginator Object, to split the descriptions longer than `jira.max_description_length` into continuation issues
+            paginatorObj = DescriptionPaginator(logger=logger, max_description_length=configHandlerObj.config["jira"]["max_description_length"])
+
+            # Create a SubTasks Object when `jira.create_sub_tasks` is set, to sync a sub-task per finding under the issue of its file
+            subTasksObj = None
+            if configHandlerObj.config["jira"]["create_sub_tasks"]:
+                sub_task_issue_type_id = projectsObj.get_project_sub_task_issue_type(project_id=project_info[1])
+                if sub_task_issue_type_id is None:
+                    raise Exception("`jira.create_sub_tasks` is set, but the JIRA project has no sub-task issue type.")
+
+                subTasksObj = SubTasks(
+                    logger=logger,
+                    jira_credentials=jira,
+                    utils=utilsObj,
+                    project_id=project_info[1],
+                    issue_type_id=sub_task_issue_type_id,
+                    default_issue_labels=configHandlerObj.config["jira"]["default_issue_labels"],
+                    use_atlassian_document_format=configHandlerObj.config["jira"]["use_atlassian_document_format"],
+                    transition_name=configHandlerObj.config["jira"]["fixed_issue_transition"],
+                    label_tools=not configHandlerObj.config["input"]["merge_tools"]
+                )
+
+            # Create an UpsertExecutor Object. Upserts run concurrently when `jira.max_workers` is greater than 1
+            executorObj = UpsertExecutor(logger=logger, max_workers=configHandlerObj.config["jira"]["max_workers"])
+
+            # Create a FindingMerger Object when `input.merge_tools` is set, to publish the findings of all SARIF reports once they are all loaded,
+            # one upsert per file with the findings of every tool, and without the findings several tools report on the same line
+            mergerObj = None
+            merged_file_keys = set() # with a baseline, files of the merged findings that changed for some tool
+            if configHandlerObj.config["input"]["merge_tools"]:
+                mergerObj = FindingMerger(logger=logger, sarif_files_list=sarif_files_list, normalize_file_keys=configHandlerObj.config["input"]["group_by"] == 'file')
+
+            # Iterate through the SARIF results file in the project root directory that ends with .sarif or contains the term ".sarif" in the filename.
+            # When `input.parse_workers` is greater than 1, the files are parsed in parallel and published as soon as each one is ready.
+            for sarif_file_path, sarif_tool_name, sarif_result_count, sarif_findings, sarif_fingerprints in sarifObj.load_sarif_findings(
+                sarif_files_list=sarif_files_list,
+                max_workers=configHandlerObj.config["input"]["parse_workers"]
+            ):
 
                 logger.info("[" + sarif_tool_name + "]: Total no. of issues found in SARIF report - " + str(sarif_result_count))
+                runReportObj.increment_counter(counter_name='sarif_results', value=sarif_result_count)
 
                 if sarif_result_count == 0:
                     logger.error("[" + sarif_tool_name + "]: No results found.")
 
                 else:
-                    sarif_findings = sarifObj.build_sarif_findings_dict(
-                        sarif_tool_name=sarif_tool_name,
-                        sarif_data=sarif_data
-                    )
-
                     # with open(sarif_tool_name + '_findings.json', 'w') as sarif_findings_file:
                     #     sarif_findings_file.write(json.dumps(sarif_findings))
 
-                    # Create an Issues Object
-                    issueObj = Issues(
-                        logger=logger,
-                        jira_credentials=jira,
-                        project_key=configHandlerObj.config["jira"]["project_key"],
-                        project_id=project_info[1],
-                        email_domain="@" + str(configHandlerObj.config["jira"]["auth_email"].split('@')[1]),
-                        default_issue_labels=configHandlerObj.config["jira"]["default_issue_labels"],
+                    # Merge every file, the merged issue of a file lists the findings of all tools even if only one tool's changed
+                    if mergerObj is not None:
+                        mergerObj.add_findings(sarif_file_path=sarif_file_path, sarif_tool_name=sarif_tool_name, sarif_findings=sarif_findings)
+
+                    # Keep only the files whose set of findings changed since the baseline
+                    if baselineObj is not None:
+                        baselineObj.add_current_fingerprints(current_fingerprints=current_fingerprints, sarif_tool_name=sarif_tool_name, sarif_fingerprints=sarif_fingerprints)
+                        changed_files, subset_files = baselineObj.get_changed_files(sarif_tool_name=sarif_tool_name, sarif_fingerprints=sarif_fingerprints)
+
+                        if subset_files:
+                            deferred_findings.append((sarif_tool_name, { file_key: sarif_findings[file_key] for file_key in subset_files }))
+                        sarif_findings = { file_key: sarif_findings[file_key] for file_key in changed_files }
+
+                    if mergerObj is not None:
+                        merged_file_keys.update(mergerObj.get_merged_group_key(group_key=file_key) for file_key in sarif_findings.keys())
+                        continue
+
+                    publish_sarif_findings(
+                        config=configHandlerObj.config,
+                        utils=utilsObj,
+                        issues=issueObj,
+                        executor=executorObj,
+                        run_report=runReportObj,
+                        paginator=paginatorObj,
+                        sub_tasks=subTasksObj,
+                        sarif_tool_name=sarif_tool_name,
+                        sarif_findings=sarif_findings
                     )
 
-                    for sarif_per_file_key in sarif_findings.keys():
+            # Publish the files with some of their findings fixed since the baseline, now that the findings of all SARIF files are known
+            for sarif_tool_name, sarif_findings in deferred_findings:
+                fixed_files = baselineObj.get_fixed_files_of_tool(current_fingerprints=current_fingerprints, sarif_tool_name=sarif_tool_name, file_names=list(sarif_findings.keys()))
+
+                if mergerObj is not None:
+                    merged_file_keys.update(mergerObj.get_merged_group_key(group_key=file_key) for file_key in fixed_files)
+                    continue
+
+                publish_sarif_findings(
+                    config=configHandlerObj.config,
+                    utils=utilsObj,
+                    issues=issueObj,
+                    executor=executorObj,
+                    run_report=runReportObj,
+                    paginator=paginatorObj,
+                    sub_tasks=subTasksObj,
+                    sarif_tool_name=sarif_tool_name,
+                    sarif_findings={ file_key: sarif_findings[file_key] for file_key in fixed_files }
+                )
+
+            # Files with all findings fixed since the baseline, across all tools
+            fixed_files = baselineObj.get_fixed_files(current_fingerprints=current_fingerprints) if baselineObj is not None else []
+
+            # Publish the merged findings of all SARIF reports, with a baseline only the files that changed for some tool
+            if mergerObj is not None:
+                merged_findings = mergerObj.get_merged_findings()
+                runReportObj.set_counter(counter_name='duplicate_findings', value=mergerObj.duplicate_count)
+                merged_file_keys_found = set(merged_findings.keys())
+
+                # The issues of the merged findings are summarised by the merged group keys. A file fixed as spelled by one tool may still have findings as spelled
+                # by another: its issue lost findings, so it's published rather than transitioned
+                merged_fixed_files = []
+                for file_key in fixed_files:
+                    merged_file_key = mergerObj.get_merged_group_key(group_key=file_key)
+                    if merged_file_key in merged_file_keys_found:
+                        merged_file_keys.add(merged_file_key)
+                    elif merged_file_key not in merged_fixed_files:
+                        merged_fixed_files.append(merged_file_key)
+                fixed_files = merged_fixed_files
+
+                if baselineObj is not None:
+                    merged_findings = { file_key: file_findings for file_key, file_findings in merged_findings.items() if file_key in merged_file_keys }
+
+                logger.info("[" + mergerObj.get_merged_tool_name() + "]: Merged findings - " + str(len(merged_findings)) + " file(s) to publish, " + str(mergerObj.duplicate_count) + " duplicate finding(s) dropped")
+
+                publish_sarif_findings(
+                    config=configHandlerObj.config,
+                    utils=utilsObj,
+                    issues=issueObj,
+                    executor=executorObj,
+                    run_report=runReportObj,
+                    paginator=paginatorObj,
+                    sub_tasks=subTasksObj,
+                    sarif_tool_name=mergerObj.get_merged_tool_name(),
+                    sarif_findings=merged_findings
+                )
+
+            if baselineObj is not None:
+                # Transition the issues of the files with all findings fixed, their continuation issues and their sub-tasks, e.g. to "Done", when `jira.fixed_issue_transition` is set
+                if configHandlerObj.config["jira"]["fixed_issue_transition"]:
+                    fixed_issue_summaries = list(fixed_files)
+                    for issue_summary in (issueObj.get_open_issue_summaries() if fixed_files else []):
+                        file_key, page_number = paginatorObj.split_page_summary(page_summary=issue_summary)
+                        if page_number > 1 and file_key in fixed_files:
+                            fixed_issue_summaries.append(issue_summary)
+
+                    # Close the sub-tasks of the fixed findings first, some workflows don't close a parent issue with open sub-tasks
+                    if subTasksObj is not None and fixed_files:
+                        with runReportObj.time_stage('jira_sub_tasks'):
+                            sub_tasks_closed = subTasksObj.close_sub_tasks_of_parents(executor=executorObj, parent_keys=issueObj.get_open_issue_keys(issue_summaries=list(fixed_files)))
+
+                        runReportObj.increment_counter(counter_name='sub_tasks_closed', value=sub_tasks_closed)
+
+                    with runReportObj.time_stage('jira_transition'):
+                        executorObj.run_upserts(
+                            upsert_function=issueObj.transition_jira_issue,
+                            upsert_kwargs_list=[{'issue_summary': issue_summary, 'transition_name': configHandlerObj.config["jira"]["fixed_issue_transition"]} for issue_summary in fixed_issue_summaries]
+                        )
 
-                        logger.info("[" + sarif_tool_name + "]: " + str(sarif_findings[sarif_per_file_key]))
-                        
-                        # Building a list of findings 
+                # The findings of the skipped files were not published, so they must not be part of the next baseline
+                if configHandlerObj.config["input"]["baseline"] == 'state' and not dry_run and not runReportObj.counters.get('files_skipped'):
+                    stateStoreObj.put_fingerprints(fingerprints=current_fingerprints)
 
-                        issue_summary = issue_desc = ''
+            executorObj.log_throughput()
+            transportObj.log_connection_stats()
+            transportObj.close()
 
-                        if configHandlerObj.config["jira"]["use_atlassian_document_format"]:
-                            # Build an Atlassian Document Format
-                            adf_builder = AtlassianDocumentFormatBuilder(logger=logger)
+            # A dry run didn't change JIRA, so the state file must not record its issues
+            if stateStoreObj is not None and not dry_run:
+                with runReportObj.time_stage('state_save'):
+                    stateStoreObj.save()
 
-                            issue_summary, issue_desc = adf_builder.build_atlassian_document_format_from_dict(sarif_tool_name=sarif_tool_name, key=sarif_per_file_key, results=sarif_findings[sarif_per_file_key])
-                        else:
-                            issue_summary = sarif_per_file_key
+            # Report where the run spent its time, in the log, as a JSON file when `output.report_file` is set, and in GitHub Actions
+            connections_opened, requests_sent = transportObj.get_connection_stats()
+            runReportObj.set_counter(counter_name='issues_upserted', value=executorObj.upsert_count)
+            runReportObj.set_counter(counter_name='rate_limit_backoffs', value=executorObj.rate_limit_count)
+            runReportObj.set_counter(counter_name='connections_opened', value=connections_opened)
+            runReportObj.set_counter(counter_name='connection_reuses', value=max(0, requests_sent - connections_opened))
 
-                            for issue in sarif_findings[sarif_per_file_key]:
+            run_report = runReportObj.to_dict()
+            runReportObj.log_summary(report=run_report)
 
-                                logger.debug(str(issue))
+            report_file_path = ''
+            if configHandlerObj.config["output"]["report_file"]:
+                report_file_path = path.join(utilsObj.get_workspace_directory(), configHandlerObj.config["output"]["report_file"])
+                runReportObj.write_json(file_path=report_file_path, report=run_report)
 
-                                if issue_desc != '':
-                                    issue_desc = utilsObj.serialize_finding_attributes(
-                                        finding_file_key = sarif_per_file_key,
-                                        findings = issue
-                                    ) + "\n___\n" 
-                                else:
-                                    issue_desc += utilsObj.serialize_finding_attributes(
-                                        finding_file_key = sarif_per_file_key,
-                                        findings = issue
-                                    ) + "\n___\n" 
-                                
-                                # issue_desc += "[" + sarif_tool_name + "] " + issue["ruleId"] + ": " + issue["message"] + " - " + sarif_per_file_key + "\nStart Line #: " + str(issue["startLine"]) + ", character " + str(issue["startColumn"]) + "\nEnd Line #: " + str(issue["endLine"]) + ", character " + str(issue["endColumn"]) + "\n___\n"                
+            runReportObj.write_github_step_summary(report=run_report)
+            runReportObj.write_github_outputs(report=run_report, report_file_path=report_file_path)
 
-                        logger.debug("JIRA Issue Summary: " + str(issue_summary))
-                        logger.debug("JIRA Issue Description: %s", str(issue_desc.validate()) if isinstance(issue_desc, ADFDoc) else issue_desc)
+            if runReportObj.counters.get('files_skipped'):
+                raise Exception(str(runReportObj.counters['files_skipped']) + " file(s) skipped, their description could not be built.")
 
-                        # Update or Insert a JIRA issue. If the issue exists, then update it. If the issue doesn't exist, then create a new issue.
-                        issueObj.upsert_jira_issue(
-                            issue_summary = issue_summary,
-                            issue_desc = issue_desc,
-                            issue_type = "Task"
-                        )
-                
             logger.info("Success.")
 
         else:
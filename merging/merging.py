@@ -0,0 +1,138 @@
+import logging
+import re
+from findings.findings import Finding
+
+# CWE references as tools spell them: `CWE-79`, `cwe-079`, `external/cwe/cwe-079` (CodeQL), `CWE-89: Improper Neutralization...` (Semgrep)
+CWE_PATTERN = re.compile(r'\bcwe[-_:/ ]*0*(\d+)', re.IGNORECASE)
+
+# Get the CWE IDs of a SARIF result, e.g. ('CWE-79', ), from its `taxa`, and the `tags` and `cwe` properties of the result or else of its rule.
+# Returns a sorted tuple, empty if none are reported.
+def get_result_cwes(result: dict, rule: dict) -> tuple[str, ...]:
+
+    cwes = set()
+
+    for taxon in result.get('taxa') or []:
+        if str((taxon.get('toolComponent') or {}).get('name', '')).upper() == 'CWE' and taxon.get('id') is not None:
+            cwes.update('CWE-' + cwe_id for cwe_id in CWE_PATTERN.findall('CWE-' + str(taxon['id'])))
+
+    for properties in [ result.get('properties'), rule.get('properties') ]:
+
+        for property_name in [ 'tags', 'cwe' ]:
+            values = (properties or {}).get(property_name)
+            for value in (values if isinstance(values, list) else [ values ] if values else []):
+                cwes.update('CWE-' + cwe_id for cwe_id in CWE_PATTERN.findall(str(value)))
+
+        if cwes:
+            break
+
+    return tuple(sorted(cwes, key=lambda cwe: int(cwe[4:])))
+
+# Normalise a file path, as tools spell the same path differently, e.g. `./src/app.py` and `src/app.py`
+def normalize_file_path(file_path: str) -> str:
+
+    if file_path.startswith('file://'):
+        file_path = file_path[len('file://'):]
+
+    while file_path.startswith('./'):
+        file_path = file_path[2:]
+
+    return file_path
+
+# FindingMerger - class to merge the findings of several SARIF reports, e.g. of CodeQL, Semgrep and a linter run on the same code, into one findings dict,
+# so each group, i.e. each JIRA issue, is upserted once per run with the findings of every tool rather than once per tool, each overwriting the other.
+# Findings reported by an earlier report at the same file and start line, for the same rule or one of the same CWEs, are dropped as duplicates.
+# Findings without a start line, e.g. about a whole file, are never duplicates. When the findings are grouped by file, the group keys are normalised file paths,
+# so the findings of a file are merged into one issue however each tool spells its path.
+# Reports are merged in the order of the SARIF files list rather than the order they are parsed in, so the findings kept don't depend on the parse workers.
+# The index holds one entry per (file, line, rule or CWE) of the findings kept, so merging costs a few dict lookups per finding.
+class FindingMerger:
+
+    # FindingMerger Constructor
+    # logger: Logger object
+    # sarif_files_list: SARIF files in the order their reports are merged
+    # normalize_file_keys: Normalise the group keys, set when the findings are grouped by file, i.e. when the group keys are file paths
+    #
+    # Returns: FindingMerger object
+    # Raises: None
+    def __init__(self, logger: logging.Logger, sarif_files_list: list[str] = [], normalize_file_keys: bool = False):
+        self.logger = logger
+        self.sarif_files_list = sarif_files_list
+        self.normalize_file_keys = normalize_file_keys
+        self.tool_names = [] # distinct tool names of the reports merged
+        self.duplicate_count = 0
+        self.__reports = [] # (SARIF file path, tool name, findings dict) of the reports added
+        self.__index = {} # (file, start line, rule or CWE key) -> number of the report which reported it first
+
+    # Get the merged group key of a group key of a report, i.e. the summary of its issue
+    def get_merged_group_key(self, group_key: str) -> str:
+        return normalize_file_path(file_path=group_key) if self.normalize_file_keys else group_key
+
+    # Get the index keys of a finding: its normalised rule ID, and its CWEs if the handler tagged them, each at its file and start line. None without a start line
+    def __get_index_keys(self, group_key: str, finding: Finding) -> list[tuple]:
+
+        if finding.startLine is None:
+            return []
+
+        file_path = normalize_file_path(file_path=finding.file or group_key)
+        index_keys = [ (file_path, finding.startLine, 'rule:' + finding.ruleId.strip().lower()) ]
+
+        for cwe in finding.cwes or ():
+            index_keys.append((file_path, finding.startLine, cwe))
+
+        return index_keys
+
+    # Add the findings dict of a SARIF report, a group key -> list of Finding objects dict, merged by get_merged_findings()
+    def add_findings(self, sarif_file_path: str, sarif_tool_name: str, sarif_findings: dict):
+        self.__reports.append((sarif_file_path, sarif_tool_name, sarif_findings))
+
+    # Merge the findings of the reports added, returns a group key -> list of Finding objects dict, the groups in the order they first appear
+    def get_merged_findings(self) -> dict:
+
+        file_order = { sarif_file_path: file_number for file_number, sarif_file_path in enumerate(self.sarif_files_list) }
+        self.__reports.sort(key=lambda report: file_order.get(report[0], len(file_order)))
+
+        merged_findings = {}
+        for report_number, (_, sarif_tool_name, sarif_findings) in enumerate(self.__reports):
+            self.duplicate_count += self.__merge_report(merged_findings=merged_findings, report_number=report_number, sarif_tool_name=sarif_tool_name, sarif_findings=sarif_findings)
+
+        self.__reports = []
+        return merged_findings
+
+    # Merge the findings of a report into merged_findings, returns the number of duplicate findings dropped
+    def __merge_report(self, merged_findings: dict, report_number: int, sarif_tool_name: str, sarif_findings: dict) -> int:
+
+        duplicate_count = 0
+
+        if sarif_tool_name not in self.tool_names:
+            self.tool_names.append(sarif_tool_name)
+
+        for group_key, findings in sarif_findings.items():
+
+            merged_group_key = self.get_merged_group_key(group_key=group_key)
+            merged_group_findings = merged_findings.get(merged_group_key)
+
+            for finding in findings:
+
+                index_keys = self.__get_index_keys(group_key=group_key, finding=finding)
+
+                # Findings of the same report are never duplicates of each other, e.g. two columns of a line
+                if any(self.__index.get(index_key, report_number) != report_number for index_key in index_keys):
+                    duplicate_count += 1
+                    continue
+
+                for index_key in index_keys:
+                    self.__index.setdefault(index_key, report_number)
+
+                if merged_group_findings is None:
+                    merged_group_findings = merged_findings[merged_group_key] = []
+
+                merged_group_findings.append(finding)
+
+        if duplicate_count > 0:
+            self.logger.info("[" + str(sarif_tool_name) + "]: Duplicate finding(s) already reported by another SARIF report - " + str(duplicate_count))
+
+        return duplicate_count
+
+    # Get the name of the merged reports, the tool names joined, for the logs
+    def get_merged_tool_name(self) -> str:
+        return ', '.join(str(tool_name) for tool_name in self.tool_names)
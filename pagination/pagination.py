@@ -0,0 +1,75 @@
+import logging
+import re
+
+# DescriptionPaginator - class to split the findings of a file into pages whose description fits in a JIRA issue.
+# JIRA rejects descriptions over 32,767 characters, so the first page goes to the issue of the file and every next page to a continuation issue,
+# summarised `<file> (part <n>)`. Each page is upserted on its own, so only the pages whose findings changed are rewritten.
+class DescriptionPaginator:
+
+    # Longest description accepted by JIRA, in characters
+    MAX_DESCRIPTION_LENGTH = 32767
+
+    # Suffix of the summary of a continuation issue, and the pattern matching the summary of a continuation issue
+    PAGE_SUMMARY_SUFFIX = ' (part {})'
+    PAGE_SUMMARY_PATTERN = re.compile(r'(.*) \(part (\d+)\)', re.DOTALL)
+
+    # DescriptionPaginator Constructor
+    # logger: Logger object
+    # max_description_length: Longest description of a page, in characters. Capped to MAX_DESCRIPTION_LENGTH
+    #
+    # Returns: DescriptionPaginator object
+    # Raises: None
+    def __init__(self, logger: logging.Logger, max_description_length: int = MAX_DESCRIPTION_LENGTH):
+        self.logger = logger
+        self.max_description_length = min(max_description_length, self.MAX_DESCRIPTION_LENGTH) if max_description_length > 0 else self.MAX_DESCRIPTION_LENGTH
+
+    # Get the issue summary of a page, the file name for the first page
+    def get_page_summary(self, issue_summary: str, page_number: int) -> str:
+        return issue_summary if page_number <= 1 else issue_summary + self.PAGE_SUMMARY_SUFFIX.format(page_number)
+
+    # Split an issue summary into the summary of the first page and the page number, returns the summary and 1 for the summary of a first page
+    def split_page_summary(self, page_summary: str) -> tuple[str, int]:
+
+        page_match = self.PAGE_SUMMARY_PATTERN.fullmatch(page_summary)
+        return (page_match.group(1), int(page_match.group(2))) if page_match else (page_summary, 1)
+
+    # Split blocks into pages. A page is the envelope, the continuation block on every page but the first, then as many blocks as fit.
+    # blocks: List of rendered findings, in order
+    # get_length: Function returning the length a block adds to a page
+    # envelope_length: Length of an empty page
+    # continuation_block: Block opening every page but the first, None for no block
+    # truncate_block: Function returning a block shortened to at most the given length, for a single finding too long for a page. None keeps it as is
+    #
+    # Returns: List of pages, each a list of blocks
+    def paginate(self, blocks: list, get_length, envelope_length: int = 0, continuation_block = None, truncate_block = None) -> list[list]:
+
+        pages = [[]]
+        page_length = envelope_length
+        page_block_count = 0
+        continuation_length = get_length(continuation_block) if continuation_block is not None else 0
+
+        for block in blocks:
+
+            block_length = get_length(block)
+
+            # Start a new page when the block doesn't fit on the current one
+            if page_block_count > 0 and page_length + block_length > self.max_description_length:
+                pages.append([continuation_block] if continuation_block is not None else [])
+                page_length = envelope_length + continuation_length
+                page_block_count = 0
+
+            # Shorten a single block that doesn't fit on an empty page
+            if page_length + block_length > self.max_description_length:
+                if truncate_block is not None:
+                    block = truncate_block(block, self.max_description_length - page_length)
+                    block_length = get_length(block)
+                self.logger.warning("Finding too long for a JIRA issue description, " + ("shortened" if truncate_block is not None else "kept as is") + " - " + str(block_length) + " character(s)")
+
+            pages[-1].append(block)
+            page_length += block_length
+            page_block_count += 1
+
+        if len(pages) > 1:
+            self.logger.debug("Description split into " + str(len(pages)) + " pages")
+
+        return pages
@@ -1,5 +1,8 @@
 import logging
 from jira.client import JIRA
+from jira.exceptions import JIRAError
+from state.state import StateStore
+from log_handler.log_handler import LogSummary
 
 # Projects - class to manage JIRA Cloud projects
 class Projects:
@@ -7,12 +10,15 @@ class Projects:
     # Projects Constructor
     # jira_credentials: JIRA credentials object 
     # logger: Logger object
+    # state_store: StateStore object caching the project ID and issue type IDs between runs. None caches them for this run only
     #
     # Returns: Projects object
     # Raises: None
-    def __init__(self, jira_credentials: JIRA, logger: logging.Logger):
+    def __init__(self, jira_credentials: JIRA, logger: logging.Logger, state_store: StateStore = None):
         self.jira = jira_credentials
         self.logger = logger
+        self.state_store = state_store
+        self.__projects = {} # project key -> {'key': project key, 'id': project ID, 'issue_types' and 'sub_task_issue_types': issue type name -> issue type ID}
 
     # TODO: Create a new JIRA Cloud project
     def create_project(self):
@@ -23,19 +29,62 @@ class Projects:
         projects = self.jira.projects()
         return projects
 
-    # Check if project exists in JIRA Cloud
+    # Get the cached metadata of a project by key or ID, from this run or from the state store. Returns None if it's not cached
+    def __get_cached_project(self, project_id_or_key: str) -> dict:
+
+        for project_key, project in self.__projects.items():
+            if project_id_or_key in [project_key, project['id']]:
+                return project
+
+        if self.state_store is not None:
+            project_state = self.state_store.get_project(project_key=project_id_or_key)
+            if project_state is not None:
+                self.__projects[project_id_or_key] = {
+                    'key': project_id_or_key,
+                    'id': project_state['id'],
+                    'issue_types': project_state['issue_types'],
+                    'sub_task_issue_types': project_state.get('sub_task_issue_types') # None in state files written before sub-tasks were supported
+                }
+                return self.__projects[project_id_or_key]
+
+        return None
+
+    # Cache the metadata of a project for this run, and in the state store
+    def __cache_project(self, project_key: str, project_id: str, issue_types: dict, sub_task_issue_types: dict):
+
+        self.__projects[project_key] = {'key': project_key, 'id': project_id, 'issue_types': issue_types, 'sub_task_issue_types': sub_task_issue_types}
+
+        if self.state_store is not None:
+            self.state_store.put_project(project_key=project_key, project_id=project_id, issue_types=issue_types, sub_task_issue_types=sub_task_issue_types)
+
+    # Check if project exists in JIRA Cloud. The project is looked up by key, and its ID and issue types are cached, so warm runs make no call at all.
     def does_project_exist(self, project_key: str) -> tuple[bool, str]:
 
-        projects = self.get_projects()
+        project = self.__get_cached_project(project_id_or_key=project_key)
+
+        if project is not None:
+            self.logger.debug("Project found in the cache - " + project_key + " (" + project['id'] + ")")
+            return True, project['id']
+
+        try:
+            project = self.jira.project(project_key)
 
-        self.logger.debug("List of ALL Projects - " + str(projects))    
+        except JIRAError as e:
+            if e.status_code == 404:
+                return False, None
+            raise
 
-        for project in projects:
-            # key, name, id
-            if project.key == project_key:
-                return True, project.id
+        self.logger.debug("Project - %s", LogSummary(project.raw))
 
-        return False
+        # The project resource lists the issue types of the project, so they are cached without another call
+        self.__cache_project(
+            project_key=project_key,
+            project_id=project.id,
+            issue_types={ issue_type['name']: issue_type['id'] for issue_type in project.raw.get('issueTypes', []) },
+            sub_task_issue_types={ issue_type['name']: issue_type['id'] for issue_type in project.raw.get('issueTypes', []) if issue_type.get('subtask') }
+        )
+
+        return True, project.id
     
     def get_project_issue_types(self, project_id: str):
 
@@ -43,19 +92,41 @@ class Projects:
             projectIdOrKey = project_id
         )
 
-        self.logger.debug("List of ALL Issue Types for Project ID " + project_id + " - " + str(issue_types_list))
+        self.logger.debug("List of ALL Issue Types for Project ID %s - %s", project_id, LogSummary(issue_types_list))
 
         return issue_types_list
 
     def get_project_issue_type_by_name(self, project_id: str, issue_type_name: str):
 
+        project = self.__get_cached_project(project_id_or_key=project_id)
+
+        if project is not None and issue_type_name in project['issue_types']:
+            return project['issue_types'][issue_type_name]
+
         issue_types_list = self.get_project_issue_types(
             project_id = project_id
         )
 
-        for issue_type in issue_types_list:
+        issue_types = { issue_type.raw["name"]: issue_type.raw["id"] for issue_type in issue_types_list }
+        sub_task_issue_types = { issue_type.raw["name"]: issue_type.raw["id"] for issue_type in issue_types_list if issue_type.raw.get("subtask") }
+
+        if project is not None:
+            self.__cache_project(project_key=project['key'], project_id=project['id'], issue_types=issue_types, sub_task_issue_types=sub_task_issue_types)
+
+        return issue_types.get(issue_type_name)
+
+    # Get the ID of the sub-task issue type of a project, e.g. `Sub-task` or `Subtask` depending on the JIRA site. Returns None if the project has none
+    def get_project_sub_task_issue_type(self, project_id: str) -> str:
+
+        project = self.__get_cached_project(project_id_or_key=project_id)
+
+        if project is None or project.get('sub_task_issue_types') is None:
+            issue_types_list = self.get_project_issue_types(project_id = project_id)
+            sub_task_issue_types = { issue_type.raw["name"]: issue_type.raw["id"] for issue_type in issue_types_list if issue_type.raw.get("subtask") }
 
-            if issue_type.raw["name"] == issue_type_name:
-                return issue_type.raw["id"]
+            if project is not None:
+                self.__cache_project(project_key=project['key'], project_id=project['id'], issue_types=project['issue_types'], sub_task_issue_types=sub_task_issue_types)
+        else:
+            sub_task_issue_types = project['sub_task_issue_types']
 
-        
\ No newline at end of file
+        return next(iter(sub_task_issue_types.values()), None)
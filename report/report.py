@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# RunReport - class to record where a run spends its time: the wall time of each stage (config load, file discovery, SARIF parse, grouping,
+# description rendering, JIRA upserts) and the JIRA calls per operation type. The report is logged, and can be written as JSON,
+# to the GitHub Actions step summary and to the GitHub Actions step outputs.
+class RunReport:
+
+    REPORT_VERSION = 1
+
+    # RunReport Constructor
+    # logger: Logger object
+    #
+    # Returns: RunReport object
+    # Raises: None
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self.start_time = time.perf_counter()
+        self.stages = {} # stage name -> {'seconds', 'count'}
+        self.jira_calls = {} # operation -> {'count', 'seconds', 'retries', 'errors', 'bytes_sent', 'bytes_received'}
+        self.counters = {} # counter name -> value
+        self.__lock = threading.Lock()
+
+    # Add the wall time of a stage. A stage can be timed several times, e.g. once per SARIF file
+    def add_stage_time(self, stage_name: str, seconds: float, count: int = 1):
+
+        with self.__lock:
+            stage = self.stages.setdefault(stage_name, {'seconds': 0.0, 'count': 0})
+            stage['seconds'] += seconds
+            stage['count'] += count
+
+    # Time the block of a `with` statement as a stage
+    @contextmanager
+    def time_stage(self, stage_name: str):
+
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(stage_name=stage_name, seconds=time.perf_counter() - start_time)
+
+    # Merge the stages timed by another RunReport, e.g. the one of a SARIF parser worker process
+    def merge_stages(self, stages: dict):
+
+        for stage_name, stage in stages.items():
+            self.add_stage_time(stage_name=stage_name, seconds=stage['seconds'], count=stage['count'])
+
+    # Record a JIRA call of an operation type (search, create, update...)
+    def record_jira_call(self, operation: str, seconds: float, retries: int = 0, error: bool = False, bytes_sent: int = 0, bytes_received: int = 0):
+
+        with self.__lock:
+            jira_call = self.jira_calls.setdefault(operation, {'count': 0, 'seconds': 0.0, 'retries': 0, 'errors': 0, 'bytes_sent': 0, 'bytes_received': 0})
+            jira_call['count'] += 1
+            jira_call['seconds'] += seconds
+            jira_call['retries'] += retries
+            jira_call['errors'] += 1 if error else 0
+            jira_call['bytes_sent'] += bytes_sent
+            jira_call['bytes_received'] += bytes_received
+
+    # Set a counter, e.g. the number of SARIF results or upserted issues
+    def set_counter(self, counter_name: str, value):
+
+        with self.__lock:
+            self.counters[counter_name] = value
+
+    # Add to a counter
+    def increment_counter(self, counter_name: str, value: int = 1):
+
+        with self.__lock:
+            self.counters[counter_name] = self.counters.get(counter_name, 0) + value
+
+    # Get the report as a dict
+    def to_dict(self) -> dict:
+
+        with self.__lock:
+            jira_totals = {
+                key: sum(jira_call[key] for jira_call in self.jira_calls.values())
+                for key in ['count', 'seconds', 'retries', 'errors', 'bytes_sent', 'bytes_received']
+            }
+
+            return {
+                'version': self.REPORT_VERSION,
+                'duration_seconds': round(time.perf_counter() - self.start_time, 3),
+                'stages': { stage_name: dict(stage, seconds=round(stage['seconds'], 3)) for stage_name, stage in self.stages.items() },
+                'jira_calls': { operation: dict(jira_call, seconds=round(jira_call['seconds'], 3)) for operation, jira_call in sorted(self.jira_calls.items()) },
+                'jira_totals': dict(jira_totals, seconds=round(jira_totals['seconds'], 3)),
+                'counters': dict(self.counters)
+            }
+
+    # Log a one line summary per stage and per JIRA operation
+    def log_summary(self, report: dict = None):
+
+        report = report or self.to_dict()
+
+        for stage_name, stage in report['stages'].items():
+            self.logger.info("Stage " + stage_name + " - " + format(stage['seconds'], '.3f') + " second(s), " + str(stage['count']) + " time(s)")
+
+        for operation, jira_call in report['jira_calls'].items():
+            self.logger.info(
+                "JIRA " + operation + " - " + str(jira_call['count']) + " call(s) in " + format(jira_call['seconds'], '.3f') + " second(s), " + \
+                str(jira_call['retries']) + " retries, " + str(jira_call['errors']) + " error(s), " + \
+                str(jira_call['bytes_sent']) + " byte(s) sent, " + str(jira_call['bytes_received']) + " byte(s) received"
+            )
+
+        self.logger.info("Run completed in " + format(report['duration_seconds'], '.3f') + " second(s) with " + str(report['jira_totals']['count']) + " JIRA call(s).")
+
+    # Write the report as a JSON file
+    def write_json(self, file_path: str, report: dict = None):
+
+        with open(file_path, 'w') as report_file:
+            json.dump(report or self.to_dict(), report_file, indent=2)
+
+        self.logger.info("Run report written - " + file_path)
+
+    # Append the report as Markdown tables to the GitHub Actions step summary, when running inside GitHub Actions
+    def write_github_step_summary(self, report: dict = None):
+
+        if not os.environ.get('GITHUB_STEP_SUMMARY'):
+            return
+
+        report = report or self.to_dict()
+
+        lines = [
+            '### Publish SARIF to JIRA',
+            '',
+            'Completed in ' + format(report['duration_seconds'], '.1f') + ' second(s) with ' + str(report['jira_totals']['count']) + ' JIRA call(s).',
+            '',
+            '| Stage | Seconds | Count |',
+            '|-------|---------|-------|'
+        ]
+        lines += [ '| ' + stage_name + ' | ' + format(stage['seconds'], '.3f') + ' | ' + str(stage['count']) + ' |' for stage_name, stage in report['stages'].items() ]
+
+        lines += [
+            '',
+            '| JIRA operation | Calls | Seconds | Retries | Errors | Bytes sent | Bytes received |',
+            '|----------------|-------|---------|---------|--------|------------|----------------|'
+        ]
+        lines += [
+            '| ' + operation + ' | ' + str(jira_call['count']) + ' | ' + format(jira_call['seconds'], '.3f') + ' | ' + str(jira_call['retries']) + ' | ' + \
+            str(jira_call['errors']) + ' | ' + str(jira_call['bytes_sent']) + ' | ' + str(jira_call['bytes_received']) + ' |'
+            for operation, jira_call in report['jira_calls'].items()
+        ]
+
+        if report['counters']:
+            lines += [ '', '| Counter | Value |', '|---------|-------|' ]
+            lines += [ '| ' + counter_name + ' | ' + str(value) + ' |' for counter_name, value in report['counters'].items() ]
+
+        with open(os.environ['GITHUB_STEP_SUMMARY'], 'a') as step_summary_file:
+            step_summary_file.write('\n'.join(lines) + '\n')
+
+    # Write the headline numbers of the report to the GitHub Actions step outputs, when running inside GitHub Actions
+    def write_github_outputs(self, report: dict = None, report_file_path: str = ''):
+
+        if not os.environ.get('GITHUB_OUTPUT'):
+            return
+
+        report = report or self.to_dict()
+
+        outputs = {
+            'duration_seconds': report['duration_seconds'],
+            'jira_calls': report['jira_totals']['count'],
+            'jira_retries': report['jira_totals']['retries'],
+            'jira_errors': report['jira_totals']['errors'],
+            'issues_upserted': report['counters'].get('issues_upserted', 0),
+            'report_file': report_file_path
+        }
+
+        with open(os.environ['GITHUB_OUTPUT'], 'a') as outputs_file:
+            for output_name, value in outputs.items():
+                outputs_file.write(output_name + '=' + str(value) + '\n')
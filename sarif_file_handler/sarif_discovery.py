@@ -0,0 +1,98 @@
+import logging
+import os
+import re
+from sarif_file_handler.sarif_source import is_zip_file_name, get_zip_sarif_sources, get_file_size
+
+# Compile a path glob into a regular expression matching paths relative to the discovery root, with `/` separators.
+# `*` and `?` don't match `/`, `**/` matches any number of directories, and `**` anything.
+def compile_path_glob(path_glob: str) -> re.Pattern:
+
+    regex, index = '', 0
+
+    while index < len(path_glob):
+
+        if path_glob.startswith('**/', index):
+            regex, index = regex + '(?:.*/)?', index + 3
+        elif path_glob.startswith('**', index):
+            regex, index = regex + '.*', index + 2
+        elif path_glob[index] == '*':
+            regex, index = regex + '[^/]*', index + 1
+        elif path_glob[index] == '?':
+            regex, index = regex + '[^/]', index + 1
+        else:
+            regex, index = regex + re.escape(path_glob[index]), index + 1
+
+    return re.compile(regex)
+
+# SARIFDiscovery - class to find the SARIF files under a directory, matched by include and exclude globs on their path relative to the directory.
+# The directory tree is walked with os.scandir(), whose entries know their type without a stat call, and only as deep as the include globs can match:
+# globs without `**` never look into the directories deeper than their own. Excluded directories, e.g. `node_modules/**`, are not walked at all.
+class SARIFDiscovery:
+
+    # Include globs of the SARIF files in the top directory, as discovered before the globs were configurable
+    DEFAULT_INCLUDE_GLOBS = [ '*.sarif', '*.sarif.json', '*.sarif.gz', '*.zip' ]
+
+    DEFAULT_EXCLUDE_GLOBS = [ '.git/**' ]
+
+    # SARIFDiscovery Constructor
+    # logger: Logger object
+    # include_globs: Globs of the SARIF files, e.g. `results/**/*.sarif`. The SARIF members of the zip bundles matched are discovered too
+    # exclude_globs: Globs of the files and directories skipped, e.g. `**/node_modules/**`
+    #
+    # Returns: SARIFDiscovery object
+    # Raises: None
+    def __init__(self, logger: logging.Logger, include_globs: list[str] = DEFAULT_INCLUDE_GLOBS, exclude_globs: list[str] = DEFAULT_EXCLUDE_GLOBS):
+        self.logger = logger
+
+        # Environment variables set lists as comma-separated strings, so empty strings are dropped
+        self.include_globs = [ path_glob.strip() for path_glob in include_globs if path_glob.strip() ]
+        self.exclude_globs = [ path_glob.strip() for path_glob in exclude_globs if path_glob.strip() ]
+        self.__include_patterns = [ compile_path_glob(path_glob) for path_glob in self.include_globs ]
+        self.__exclude_patterns = [ compile_path_glob(path_glob) for path_glob in self.exclude_globs ]
+
+        # Number of directory levels below the root the include globs can match, None if unbounded
+        self.max_depth = None if any('**' in path_glob for path_glob in self.include_globs) else max([ path_glob.count('/') for path_glob in self.include_globs ], default=0)
+
+    # Check if a relative path matches one of the patterns
+    def __matches(self, patterns: list[re.Pattern], relative_path: str) -> bool:
+        return any(pattern.fullmatch(relative_path) for pattern in patterns)
+
+    # Find the SARIF files under a directory, returns a list of SARIF source paths, in path order, and a dict of SARIF source path -> size in bytes.
+    # Zip bundles are listed as their SARIF members. Zip members and gzip files are sized uncompressed, as their parse time depends on it.
+    def discover(self, root_directory: str) -> tuple[list[str], dict]:
+
+        sarif_sources, sarif_source_sizes = [], {}
+        directories = [ (root_directory, '', 0) ] # directory path, path relative to the root directory, depth
+
+        while directories:
+
+            directory_path, relative_directory, depth = directories.pop()
+
+            with os.scandir(directory_path) as directory_entries:
+                entries = sorted(directory_entries, key=lambda entry: entry.name)
+
+            sub_directories = []
+            for entry in entries:
+
+                relative_path = relative_directory + entry.name
+
+                if entry.is_dir(follow_symlinks=False):
+                    if (self.max_depth is None or depth < self.max_depth) and not self.__matches(self.__exclude_patterns, relative_path + '/'):
+                        sub_directories.append((entry.path, relative_path + '/', depth + 1))
+
+                elif self.__matches(self.__include_patterns, relative_path) and not self.__matches(self.__exclude_patterns, relative_path):
+
+                    if is_zip_file_name(entry.name):
+                        for sarif_source, sarif_source_size in get_zip_sarif_sources(zip_file_path=entry.path, logger=self.logger):
+                            sarif_sources.append(sarif_source)
+                            sarif_source_sizes[sarif_source] = sarif_source_size
+                    else:
+                        sarif_sources.append(entry.path)
+                        sarif_source_sizes[entry.path] = get_file_size(file_path=entry.path) if entry.name.endswith('.gz') else entry.stat().st_size
+
+            # Walk the sub-directories next, in path order
+            directories += reversed(sub_directories)
+
+        self.logger.debug("SARIF discovery - " + str(len(sarif_sources)) + " SARIF file(s) under " + root_directory)
+
+        return sarif_sources, sarif_source_sizes
@@ -1,45 +1,89 @@
+import hashlib
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from sarif import loader
 import os
 
 from utils.utils import Utils
+from sarif_file_handler.sarif_stream import SARIFStreamFile
+from sarif_file_handler.sarif_source import STDIN_PATH, get_sarif_source_size, load_sarif_source
+from sarif_file_handler.sarif_discovery import SARIFDiscovery
+from report.report import RunReport
+from grouping.grouping import FileGrouper
+from filtering.filtering import FindingFilter
+from log_handler.log_handler import LogSummary
+from findings.findings import Finding, StringTable
+from merging.merging import get_result_cwes
 
 # SARIF - class to handle Static Analysis Results Interchange Format (SARIF)
 class SARIFFileHandler:
 
     # SARIFFileHandler Constructor
     # logger: Logger object
+    # utils: Utils object
+    # input_format: `sarif` loads the whole SARIF file, `sarif-stream` streams the results of the SARIF file with bounded memory
+    # collect_fingerprints: Also collect the fingerprints of the findings of each file, used to diff against a baseline
+    # finding_fingerprints: Also set the fingerprint of each finding, under its `fingerprint` attribute, used to sync a sub-task per finding
+    # run_report: RunReport object recording the time spent parsing and grouping the SARIF files. None doesn't record it
+    # grouper: Finding grouper choosing the JIRA issue of each SARIF result, see grouping.get_finding_grouper(). None groups the results by file
+    # finding_filter: FindingFilter object discarding the SARIF results that are not ticketed before they are grouped. None keeps every result
+    # discovery: SARIFDiscovery object finding the SARIF files in the project root directory. None finds them with the default globs
+    # finding_cwes: Also set the CWE IDs of each finding, of the result or else of its rule, under its `cwes` attribute, used to merge the findings of several tools
     #
     # Returns: SARIFFileHandler object
     # Raises: None
-    def __init__(self, logger: logging.Logger, utils: Utils):
+    def __init__(self, logger: logging.Logger, utils: Utils, input_format: str = 'sarif', collect_fingerprints: bool = False, run_report: RunReport = None, finding_fingerprints: bool = False, grouper: FileGrouper = None, finding_filter: FindingFilter = None, discovery: SARIFDiscovery = None, finding_cwes: bool = False):
         self.logger = logger
         self.utils = utils
+        self.input_format = input_format
+        self.collect_fingerprints = collect_fingerprints
+        self.finding_fingerprints = finding_fingerprints
+        self.run_report = run_report
+        self.grouper = grouper or FileGrouper()
+        self.finding_filter = finding_filter
+        self.discovery = discovery or SARIFDiscovery(logger=logger)
+        self.finding_cwes = finding_cwes
+        self.__sarif_file_sizes = {} # SARIF file path -> size in bytes, recorded by the discovery
         self.__region_optional_fields = [ "startLine", "startColumn", "endLine", "endColumn" ] # TODO: `snippet` is not supported at this time.
 
+    # Get the SARIF files to publish, by input type: `file` for the SARIF files in the project root directory, `stdin` for a SARIF file piped to stdin
+    def get_sarif_files_list(self, input_type: str = 'file') -> list[str]:
+
+        if input_type == 'file':
+            return self.check_for_sarif_files_in_project_root_directory()
+
+        if input_type == 'stdin':
+            return [ STDIN_PATH ]
+
+        raise Exception("Unsupported input type - " + str(input_type))
+
     # Check for SARIF files in project root directory, using SARIF file naming convention. Refer to SARIF specification for more details: https://docs.oasis-open.org/sarif/sarif/v2.0/csprd02/sarif-v2.0-csprd02.html#_Toc9244200
+    # The files are matched by the include and exclude globs of the discovery, in sub-directories too, see SARIFDiscovery.
+    # Gzip compressed SARIF files, e.g. `scan.sarif.gz`, are listed too, and zip bundles are listed as their SARIF members, see sarif_source.
     def check_for_sarif_files_in_project_root_directory(self) -> list[str]:
 
-        sarif_files_list = []
-
         local_directory = os.getcwd()
         if 'GITHUB_ACTIONS' in os.environ.keys():
 
             self.logger.debug("Running inside GitHub Actions")
             local_directory = os.environ.get("GITHUB_WORKSPACE")
 
-        for file in os.listdir(local_directory):
+        sarif_files_list, sarif_file_sizes = self.discovery.discover(root_directory=local_directory)
+        self.__sarif_file_sizes.update(sarif_file_sizes)
 
-            if file.__contains__('.sarif'):
+        self.logger.debug("SARIF Files List - %s", LogSummary(sarif_files_list))
+        return sarif_files_list
 
-                sarif_files_list.append(os.path.join(local_directory, file))
+    def load_sarif_data(self, sarif_file_path: dict) -> tuple[str, loader.SarifFile | SARIFStreamFile]:
 
-        self.logger.debug("SARIF Files List - " + str(sarif_files_list))
-        return sarif_files_list
+        if self.input_format == 'sarif':
+            sarif_data = load_sarif_source(sarif_source_path = sarif_file_path)
 
-    def load_sarif_data(self, sarif_file_path: dict) -> tuple[str, loader.SarifFile]:
+        elif self.input_format == 'sarif-stream':
+            sarif_data = SARIFStreamFile(logger=self.logger, file_path=sarif_file_path, region_fields=self.__region_optional_fields, read_rules=self.needs_rules())
 
-        sarif_data = loader.load_sarif_file(file_path = sarif_file_path)
+        else:
+            raise Exception("Unsupported input format - " + str(self.input_format))
 
         self.logger.debug("SARIF file - " + str(sarif_file_path) + " - " + str(type(sarif_data)))
 
@@ -47,74 +91,194 @@ class SARIFFileHandler:
 
         return sarif_tool, sarif_data
     
-    def build_sarif_findings_dict(self, sarif_tool_name: str, sarif_data: loader.SarifFile) -> dict:
+    # Check if the findings are built with the rules of the SARIF file: the default level, security severity or CWEs of the rule of each result
+    def needs_rules(self) -> bool:
+        return self.finding_cwes or self.grouper.needs_rules or (self.finding_filter is not None and self.finding_filter.needs_rules())
+
+    # Get the rules of the runs of a SARIF file, returns a dict of rule ID -> SARIF rule
+    def get_sarif_rules(self, sarif_data: loader.SarifFile | SARIFStreamFile) -> dict:
+
+        if isinstance(sarif_data, SARIFStreamFile):
+            return sarif_data.get_rules()
+
+        return {
+            rule.get('id'): rule
+            for run in sarif_data.runs
+            for rule in run.run_data.get('tool', {}).get('driver', {}).get('rules', [])
+        }
+
+    # Get the artifact URI of the first location of a SARIF result, returns None if the result has no file location
+    def __get_result_artifact_uri(self, result: dict) -> str:
+
+        if self.utils.check_if_finding_attribute_exists(source=result, key_str='locations') and len(result['locations']) > 0:
+
+            if self.utils.check_if_finding_attribute_exists(source=result['locations'][0], key_str='physicalLocation'):
+
+                if self.utils.check_if_finding_attribute_exists(source=result['locations'][0]['physicalLocation'], key_str='artifactLocation'):
+
+                    if self.utils.check_if_finding_attribute_exists(source=result['locations'][0]['physicalLocation']['artifactLocation'], key_str='uri'):
+
+                        return result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"]
+
+        return None
+
+    # Build the finding (ruleId, message and the optional region fields) of a SARIF result. The rule ID and message are shared through the string table
+    def __build_finding(self, result: dict, strings: StringTable) -> Finding:
+
+        finding = Finding(ruleId=strings.get(result["ruleId"]), message=strings.get(result["message"]["text"]))
+
+        if self.utils.check_if_finding_attribute_exists(source=result['locations'][0]['physicalLocation'], key_str='region'):
+
+            region = result["locations"][0]["physicalLocation"]["region"]
+
+            for optional_field in self.__region_optional_fields:
+                if self.utils.check_if_finding_attribute_exists(source=region, key_str=optional_field):
+                    setattr(finding, optional_field, region[optional_field])
+
+        return finding
+
+    # Get the fingerprint of a SARIF result. Uses the `fingerprints` or `partialFingerprints` reported by the tool, falling back to the ruleId, artifact URI and region.
+    def get_result_fingerprint(self, result: dict, artifact_uri: str) -> str:
+
+        for fingerprints_key in [ 'fingerprints', 'partialFingerprints' ]:
+            if self.utils.check_if_finding_attribute_exists(source=result, key_str=fingerprints_key) and result[fingerprints_key]:
+                fingerprint_source = fingerprints_key + ':' + ';'.join(key + '=' + str(value) for key, value in sorted(result[fingerprints_key].items()))
+                break
+        else:
+            region = result['locations'][0]['physicalLocation'].get('region', {})
+            fingerprint_source = 'location:' + str(result.get('ruleId')) + ';' + artifact_uri + ';' + ';'.join(str(region.get(field)) for field in self.__region_optional_fields)
+
+        return hashlib.sha256(fingerprint_source.encode('utf-8')).hexdigest()[:32]
+
+    # Group the SARIF results by the group key of the grouper, the artifact URI of their first location by default, returns a dict of group key -> list of Finding objects.
+    # Results are bucketed in a single pass, and the group keys keep the order in which they first appear in the report.
+    # Unless the results are grouped by file, each finding carries the artifact URI of its result under its `file` attribute.
+    # The rule IDs, messages and file names repeated across the results of the SARIF file are stored once, see StringTable.
+    # Results discarded by the finding filter are skipped before anything is built for them.
+    # When finding_cwes is set, each finding also carries the CWE IDs of its result, or else of its rule, under its `cwes` attribute.
+    # sarif_fingerprints: Optional dict filled in the same pass with group key -> set of finding fingerprints
+    def build_sarif_findings_dict(self, sarif_tool_name: str, sarif_data: loader.SarifFile | SARIFStreamFile, sarif_fingerprints: dict = None) -> dict:
 
         sarif_findings = {}
-        results = sarif_data.get_results()
+        sarif_rules = self.get_sarif_rules(sarif_data=sarif_data) if self.needs_rules() else {}
+        filtered_count = 0
+        strings = StringTable()
+
+        # Checked once, logging every result is only worth its cost when debugging
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+
+        for result in sarif_data.get_results():
+
+            if debug_enabled:
+                self.logger.debug("[%s]: %s", sarif_tool_name, LogSummary(result))
+
+            artifact_uri = self.__get_result_artifact_uri(result=result)
+
+            if artifact_uri is None:
+                continue
+
+            if self.finding_filter is not None and not self.finding_filter.is_result_included(result=result, artifact_uri=artifact_uri, rules=sarif_rules):
+                filtered_count += 1
+                continue
+
+            group_key = self.grouper.get_group_key(sarif_tool_name=sarif_tool_name, result=result, artifact_uri=artifact_uri, rule=sarif_rules.get(result.get('ruleId')) or {})
+            group_findings = sarif_findings.get(group_key)
+
+            if group_findings is None:
+                if debug_enabled:
+                    self.logger.debug("Finding is unique")
+                group_findings = sarif_findings[group_key] = []
+
+            finding = self.__build_finding(result=result, strings=strings)
+            group_findings.append(finding)
+
+            if self.grouper.tags_file:
+                finding.file = strings.get(artifact_uri)
 
-        unique_file_findings = []
+            if self.finding_cwes:
+                finding.cwes = strings.get(get_result_cwes(result=result, rule=sarif_rules.get(result.get('ruleId')) or {})) or None
 
-        # Build empty filename dictionaries so we can document the findings inside them later
-        for result in results:
+            if sarif_fingerprints is not None or self.finding_fingerprints:
+                fingerprint = self.get_result_fingerprint(result=result, artifact_uri=artifact_uri)
 
-            self.logger.debug("[" + sarif_tool_name + "]: " + str(result))
+                if self.finding_fingerprints:
+                    finding.fingerprint = fingerprint
 
-            if self.utils.check_if_finding_attribute_exists(source=result, key_str='locations'):
+                if sarif_fingerprints is not None:
+                    sarif_fingerprints.setdefault(group_key, set()).add(fingerprint)
 
-                if self.utils.check_if_finding_attribute_exists(source=result['locations'][0], key_str='physicalLocation'):
+        if filtered_count > 0:
+            self.logger.info("[" + sarif_tool_name + "]: Filtered out " + str(filtered_count) + " result(s).")
 
-                    if self.utils.check_if_finding_attribute_exists(source=result['locations'][0]['physicalLocation'], key_str='artifactLocation'):
+        self.logger.debug("[" + sarif_tool_name + "]: Total group(s) of findings - " + str(len(sarif_findings)))
 
-                        if self.utils.check_if_finding_attribute_exists(source=result['locations'][0]['physicalLocation']['artifactLocation'], key_str='uri'):
+        return sarif_findings
 
-                            if result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"] not in unique_file_findings:
+    # Load a SARIF file and group its findings, returns the tool name, the result count, the findings dict and the fingerprints dict (None unless fingerprints are collected)
+    # A streamed SARIF file is parsed while its findings are grouped, so the time spent reading its results counts towards the grouping stage.
+    def load_and_group_sarif_file(self, sarif_file_path: str) -> tuple[str, int, dict, dict]:
 
-                                self.logger.debug("Finding is unique")                                
-                                unique_file_findings.append(result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"])
+        run_report = self.run_report or RunReport(logger=self.logger)
 
-        self.logger.debug("[" + sarif_tool_name + "]: Total file(s) with findings - " + str(len(unique_file_findings)))
+        with run_report.time_stage('sarif_parse'):
+            sarif_tool_name, sarif_data = self.load_sarif_data(sarif_file_path=sarif_file_path)
 
-        # This is a unique list of file names with findings
-        self.logger.debug("Unique findings list - " + str(unique_file_findings))
+        sarif_fingerprints = {} if self.collect_fingerprints else None
 
-        for unique_file_finding in unique_file_findings:
+        # Group the findings before counting them, a streamed SARIF file knows its result count once the results have been read
+        with run_report.time_stage('sarif_grouping'):
+            sarif_findings = self.build_sarif_findings_dict(
+                sarif_tool_name=sarif_tool_name,
+                sarif_data=sarif_data,
+                sarif_fingerprints=sarif_fingerprints
+            )
 
-            finding_counter = 0
+        return sarif_tool_name, sarif_data.get_result_count(), sarif_findings, sarif_fingerprints
 
-            sarif_findings.update({unique_file_finding: []})
+    # Load and group the findings of the SARIF files, yields the file path, tool name, result count, findings dict and fingerprints dict of each file.
+    # With more than one worker the files are parsed in a process pool and yielded as soon as each one is ready, so publishing the first
+    # files overlaps with parsing the others. The largest files are submitted first, so a large file parsed last doesn't extend the run while the
+    # other workers are idle. Otherwise the files are parsed one after another in the listed order.
+    def load_sarif_findings(self, sarif_files_list: list[str], max_workers: int = 1):
 
-            for result in results:
+        if max_workers <= 1 or len(sarif_files_list) <= 1:
 
-                if self.utils.check_if_finding_attribute_exists(source=result, key_str='locations'):
+            for sarif_file_path in sarif_files_list:
+                yield (sarif_file_path, ) + self.load_and_group_sarif_file(sarif_file_path=sarif_file_path)
 
-                    if self.utils.check_if_finding_attribute_exists(source=result['locations'][0], key_str='physicalLocation'):
+        else:
+            # The pool starts the files in the order they are submitted. Files not found by the discovery, e.g. baseline files, are sized here
+            scheduled_files_list = sorted(
+                sarif_files_list,
+                key=lambda sarif_file_path: self.__sarif_file_sizes[sarif_file_path] if sarif_file_path in self.__sarif_file_sizes else get_sarif_source_size(sarif_source_path=sarif_file_path),
+                reverse=True
+            )
 
-                        if self.utils.check_if_finding_attribute_exists(source=result['locations'][0]['physicalLocation'], key_str='artifactLocation'):
-                
-                            if result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"] == unique_file_finding:
+            self.logger.debug("SARIF files scheduled - %s", LogSummary(scheduled_files_list))
 
-                                finding_attrs = {}
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(sarif_files_list))) as executor:
 
-                                finding_attrs.update({
-                                    "ruleId": result["ruleId"],
-                                    "message": result["message"]["text"]                        
-                                })
+                futures = {
+                    executor.submit(load_and_group_sarif_file, sarif_file_path, self.input_format, self.collect_fingerprints, self.finding_fingerprints, self.grouper, self.finding_filter, self.finding_cwes): sarif_file_path
+                    for sarif_file_path in scheduled_files_list
+                }
 
-                                if self.utils.check_if_finding_attribute_exists(source=result['locations'][0]['physicalLocation'], key_str='region'):
+                for future in as_completed(futures):
+                    self.logger.debug("SARIF file parsed - " + futures[future])
+                    sarif_tool_name, sarif_result_count, sarif_findings, sarif_fingerprints, worker_stages = future.result()
 
-                                    for optional_field in self.__region_optional_fields:
-                                        if self.utils.check_if_finding_attribute_exists(
-                                            source = result["locations"][0]["physicalLocation"]["region"],
-                                            key_str = optional_field
-                                        ):
-                                            finding_attrs.update({
-                                                optional_field: result["locations"][0]["physicalLocation"]["region"][optional_field]
-                                            })
+                    # The stages are timed in the worker processes. Their times add up, so they can exceed the wall time of the run
+                    if self.run_report is not None:
+                        self.run_report.merge_stages(stages=worker_stages)
 
-                                sarif_findings[unique_file_finding].append(finding_attrs)
+                    yield futures[future], sarif_tool_name, sarif_result_count, sarif_findings, sarif_fingerprints
 
-                    finding_counter += 1
+# Load a SARIF file and group its findings in a worker process, returns the tool name, the result count, the findings dict, the fingerprints dict
+# and the stages timed by the worker
+def load_and_group_sarif_file(sarif_file_path: str, input_format: str, collect_fingerprints: bool = False, finding_fingerprints: bool = False, grouper: FileGrouper = None, finding_filter: FindingFilter = None, finding_cwes: bool = False) -> tuple[str, int, dict, dict, dict]:
 
-            self.logger.debug("Finding counter for file - " + str(unique_file_finding) + " - " + str(finding_counter))
+    logger = logging.getLogger(__name__)
+    run_report = RunReport(logger=logger)
+    sarifObj = SARIFFileHandler(logger=logger, utils=Utils(logger=logger), input_format=input_format, collect_fingerprints=collect_fingerprints, run_report=run_report, finding_fingerprints=finding_fingerprints, grouper=grouper, finding_filter=finding_filter, finding_cwes=finding_cwes)
 
-        return sarif_findings
\ No newline at end of file
+    return sarifObj.load_and_group_sarif_file(sarif_file_path=sarif_file_path) + (run_report.stages, )
@@ -0,0 +1,164 @@
+import contextlib
+import datetime
+import gzip
+import io
+import json
+import logging
+import os
+import sys
+import zipfile
+from sarif.sarif_file import SarifFile
+
+# SARIF sources - functions to read SARIF files from plain files, gzip files, zip bundles and stdin.
+# A source is named by a path string, so it can be passed to the parse worker processes:
+# - `reports/scan.sarif` or `reports/scan.sarif.gz`: a file, decompressed on the fly if it's gzip compressed
+# - `reports/bundle.zip!/scan.sarif`: a member of a zip bundle, also decompressed on the fly if it's itself gzip compressed
+# - `-`: stdin, e.g. `gunzip -c scan.sarif.gz | python main.py`, or a gzip compressed pipe
+# Sources are decompressed while they are parsed, nothing is written to disk.
+
+# Path of the stdin source
+STDIN_PATH = '-'
+
+# Separator of the zip bundle path and the member path of a zip member source
+ZIP_MEMBER_SEPARATOR = '!/'
+
+# Suffixes of the SARIF members of a zip bundle. Unlike the SARIF files of the workspace, a member is not a SARIF file just for having `.sarif` in its name
+SARIF_MEMBER_SUFFIXES = ( '.sarif', '.sarif.json', '.sarif.gz' )
+
+GZIP_MAGIC = b'\x1f\x8b'
+UTF8_BOM = b'\xef\xbb\xbf'
+
+# Bytes read from stdin. stdin can only be read once, and a streamed SARIF file is read more than once, so its bytes are kept as piped, e.g. compressed
+_stdin_bytes = None
+
+# Check if a file name is a SARIF file name, e.g. `scan.sarif`, `scan.sarif.json` or `scan.sarif.gz`
+def is_sarif_file_name(file_name: str) -> bool:
+    return file_name.__contains__('.sarif')
+
+# Check if a file name is a zip bundle file name
+def is_zip_file_name(file_name: str) -> bool:
+    return file_name.lower().endswith('.zip')
+
+# Check if a zip member name is a SARIF file name, by its suffix
+def is_sarif_member_name(member_name: str) -> bool:
+    return member_name.lower().endswith(SARIF_MEMBER_SUFFIXES)
+
+# Get the sources of the SARIF members of a zip bundle, returns a list of (source path, uncompressed size in bytes).
+# A file that is not a valid zip file, e.g. an unrelated or truncated `.zip` in the workspace, has none and is logged as skipped
+def get_zip_sarif_sources(zip_file_path: str, logger: logging.Logger) -> list[tuple[str, int]]:
+
+    try:
+        with zipfile.ZipFile(zip_file_path) as zip_file:
+            return [
+                (zip_file_path + ZIP_MEMBER_SEPARATOR + member.filename, member.file_size)
+                for member in zip_file.infolist()
+                if not member.is_dir() and is_sarif_member_name(os.path.basename(member.filename))
+            ]
+
+    except zipfile.BadZipFile as exception:
+        logger.warning("Skipping " + zip_file_path + ", it is not a valid zip file - " + str(exception))
+        return []
+
+# Get the sources of a file: the file itself if it's a SARIF file, the SARIF members of a zip bundle, or none
+def get_file_sarif_sources(file_path: str, logger: logging.Logger) -> list[str]:
+
+    if is_zip_file_name(os.path.basename(file_path)):
+        return [ sarif_source for sarif_source, _ in get_zip_sarif_sources(zip_file_path=file_path, logger=logger) ]
+
+    return [ file_path ] if is_sarif_file_name(os.path.basename(file_path)) else []
+
+# Split a zip member source into the zip bundle path and the member path, returns None if the source is not a zip member
+def split_zip_member_path(sarif_source_path: str) -> tuple[str, str]:
+
+    zip_file_path, separator, member_path = sarif_source_path.partition(ZIP_MEMBER_SEPARATOR)
+
+    if separator and is_zip_file_name(zip_file_path):
+        return zip_file_path, member_path
+
+    return None
+
+# Get the bytes piped to stdin, read once
+def get_stdin_bytes() -> bytes:
+
+    global _stdin_bytes
+
+    if _stdin_bytes is None:
+        _stdin_bytes = sys.stdin.buffer.read()
+
+    return _stdin_bytes
+
+# Open a SARIF source as a binary stream of its JSON document: decompressed if it's gzip compressed, and past the UTF-8 byte order mark if present
+@contextlib.contextmanager
+def open_sarif_source(sarif_source_path: str):
+
+    with contextlib.ExitStack() as stack:
+
+        zip_member_path = split_zip_member_path(sarif_source_path=sarif_source_path)
+
+        if sarif_source_path == STDIN_PATH:
+            sarif_source = io.BufferedReader(io.BytesIO(get_stdin_bytes()))
+
+        elif zip_member_path is not None:
+            zip_file = stack.enter_context(zipfile.ZipFile(zip_member_path[0]))
+            sarif_source = zip_file.open(zip_member_path[1])
+
+        else:
+            sarif_source = open(sarif_source_path, 'rb')
+
+        stack.enter_context(sarif_source)
+
+        # Compressed sources are recognised by their content rather than their name
+        if sarif_source.peek(2)[:2] == GZIP_MAGIC:
+            sarif_source = stack.enter_context(gzip.GzipFile(fileobj=sarif_source, mode='rb'))
+
+        if sarif_source.peek(3)[:3] == UTF8_BOM:
+            sarif_source.read(3)
+
+        yield sarif_source
+
+# Get the size of a file in bytes, uncompressed if it's gzip compressed. The uncompressed size is read from the gzip trailer, modulo 4 GiB
+def get_file_size(file_path: str) -> int:
+
+    with open(file_path, 'rb') as file:
+
+        if file.read(2) != GZIP_MAGIC:
+            return os.fstat(file.fileno()).st_size
+
+        file.seek(-4, os.SEEK_END)
+        return int.from_bytes(file.read(4), 'little')
+
+# Get the size of a SARIF source in bytes: of the file or of a zip member, uncompressed. stdin is 0
+def get_sarif_source_size(sarif_source_path: str) -> int:
+
+    if sarif_source_path == STDIN_PATH:
+        return 0
+
+    zip_member_path = split_zip_member_path(sarif_source_path=sarif_source_path)
+
+    if zip_member_path is not None:
+        with zipfile.ZipFile(zip_member_path[0]) as zip_file:
+            return zip_file.getinfo(zip_member_path[1]).file_size
+
+    return get_file_size(file_path=sarif_source_path)
+
+# Get the modification time of a SARIF source: of the file, or of the zip bundle of a member. stdin is new
+def get_sarif_source_mtime(sarif_source_path: str) -> datetime.datetime:
+
+    if sarif_source_path == STDIN_PATH:
+        return datetime.datetime.now()
+
+    zip_member_path = split_zip_member_path(sarif_source_path=sarif_source_path)
+
+    return datetime.datetime.fromtimestamp(os.stat(zip_member_path[0] if zip_member_path is not None else sarif_source_path).st_mtime)
+
+# Load a SARIF source as a SarifFile object, like sarif.loader.load_sarif_file() does for a plain file
+def load_sarif_source(sarif_source_path: str) -> SarifFile:
+
+    try:
+        with open_sarif_source(sarif_source_path=sarif_source_path) as sarif_source:
+            data = json.load(sarif_source)
+
+        return SarifFile(sarif_source_path, data, mtime=get_sarif_source_mtime(sarif_source_path=sarif_source_path))
+
+    except Exception as exception:
+        raise IOError("Cannot load " + sarif_source_path) from exception
@@ -0,0 +1,145 @@
+import logging
+import ijson
+from ijson.common import ObjectBuilder
+from sarif_file_handler.sarif_source import open_sarif_source
+
+# SARIF Stream - class to read the results of a Static Analysis Results Interchange Format (SARIF) file incrementally.
+# Results are parsed one at a time and projected onto the fields used to build and filter the findings dict (ruleId, message text, fingerprints, first physical location URI and region,
+# level, suppression statuses, baselineState, security-severity, and the CWE references of its taxa and tags),
+# so memory stays bounded by the largest single result instead of the whole document, including its `codeFlows`, `threadFlows` and `snippet` blobs.
+class SARIFStreamFile:
+
+    __RESULTS_PREFIX = 'runs.item.results'
+    __TOOL_NAME_PREFIX = 'runs.item.tool.driver.name'
+    __RULES_PREFIX = 'runs.item.tool.driver.rules'
+
+    # Properties of the results and rules kept: their severity, and the tags and CWE references of the rule
+    __PROPERTIES = [ 'security-severity', 'tags', 'cwe' ]
+
+    # SARIFStreamFile Constructor
+    # logger: Logger object
+    # file_path: Path of the SARIF file, or of a compressed, zip member or stdin SARIF source, see sarif_source
+    # region_fields: Region fields kept for each result
+    # read_rules: Also read the rules while reading the tool names, so they don't cost another pass, see get_rules()
+    #
+    # Returns: SARIFStreamFile object
+    # Raises: None
+    def __init__(self, logger: logging.Logger, file_path: str, region_fields: list[str], read_rules: bool = False):
+        self.logger = logger
+        self.file_path = file_path
+        self.read_rules = read_rules
+        self.__region_fields = region_fields
+        self.__tool_names = None
+        self.__rules = None
+        self.__result_count = None
+
+    # Read the tool names, and the rules if read_rules is set, of the runs. Parsing stops at the first results array once a tool name is known,
+    # as `tool` precedes `results` in most reports, so a large or compressed report is not parsed, or decompressed, a second time before its results.
+    # The rules of a run following the results of another run are not read.
+    def __read_tool(self, read_rules: bool):
+
+        self.__tool_names, rules = [], {}
+        rule_builder = None
+
+        with open_sarif_source(sarif_source_path=self.file_path) as sarif_file:
+
+            for prefix, event, value in ijson.parse(sarif_file, use_float=True):
+
+                if rule_builder is not None:
+                    rule_builder.event(event, value)
+
+                    if prefix == self.__RULES_PREFIX + '.item' and event == 'end_map':
+                        rule = rule_builder.value
+                        rules[rule.get('id')] = {
+                            'id': rule.get('id'),
+                            'defaultConfiguration': { 'level': (rule.get('defaultConfiguration') or {}).get('level') },
+                            'properties': { name: value for name, value in (rule.get('properties') or {}).items() if name in self.__PROPERTIES }
+                        }
+                        rule_builder = None
+
+                elif prefix == self.__TOOL_NAME_PREFIX and value not in self.__tool_names:
+                    self.__tool_names.append(value)
+
+                elif read_rules and prefix == self.__RULES_PREFIX + '.item' and event == 'start_map':
+                    rule_builder = ObjectBuilder()
+                    rule_builder.event(event, value)
+
+                elif prefix == self.__RESULTS_PREFIX and event == 'start_array' and len(self.__tool_names) > 0:
+                    break
+
+        if read_rules:
+            self.__rules = rules
+
+    # Get the distinct tool names of the runs
+    def get_distinct_tool_names(self) -> list[str]:
+
+        if self.__tool_names is None:
+            self.__read_tool(read_rules=self.read_rules)
+
+        return self.__tool_names
+
+    # Project a SARIF result onto the fields used to build the findings dict, returns a minimal SARIF result dict
+    def __project_result(self, result: dict) -> dict:
+
+        projected_result = {}
+
+        for field in [ 'ruleId', 'message', 'fingerprints', 'partialFingerprints', 'level', 'baselineState' ]:
+            if field in result:
+                projected_result[field] = result[field] if field != 'message' else { 'text': result['message'].get('text') }
+
+        if result.get('suppressions'):
+            projected_result['suppressions'] = [ { 'status': suppression['status'] } if 'status' in suppression else {} for suppression in result['suppressions'] ]
+
+        projected_properties = { name: value for name, value in (result.get('properties') or {}).items() if name in self.__PROPERTIES }
+        if projected_properties:
+            projected_result['properties'] = projected_properties
+
+        if result.get('taxa'):
+            projected_result['taxa'] = [ { 'id': taxon.get('id'), 'toolComponent': { 'name': (taxon.get('toolComponent') or {}).get('name') } } for taxon in result['taxa'] ]
+
+        if len(result.get('locations') or []) > 0 and 'physicalLocation' in result['locations'][0]:
+
+            physical_location = result['locations'][0]['physicalLocation']
+            projected_location = {}
+
+            if 'uri' in physical_location.get('artifactLocation', {}):
+                projected_location['artifactLocation'] = { 'uri': physical_location['artifactLocation']['uri'] }
+
+            if 'region' in physical_location:
+                projected_location['region'] = { field: value for field, value in physical_location['region'].items() if field in self.__region_fields }
+
+            projected_result['locations'] = [ { 'physicalLocation': projected_location } ]
+
+        return projected_result
+
+    # Get the rules of the runs, returns a dict of rule ID -> minimal SARIF rule dict with its default level, security-severity, tags and CWE references.
+    # They are read with the tool names, see __read_tool()
+    def get_rules(self) -> dict:
+
+        if self.__rules is None:
+            self.__read_tool(read_rules=True)
+
+        return self.__rules
+
+    # Get the results of all runs, yields one minimal SARIF result dict at a time
+    def get_results(self):
+
+        result_count = 0
+
+        with open_sarif_source(sarif_source_path=self.file_path) as sarif_file:
+
+            for result in ijson.items(sarif_file, self.__RESULTS_PREFIX + '.item', use_float=True):
+                result_count += 1
+                yield self.__project_result(result=result)
+
+        self.__result_count = result_count
+        self.logger.debug("SARIF file - " + str(self.file_path) + " - Results streamed - " + str(result_count))
+
+    # Get the number of results. Known without another pass once the results have been iterated.
+    def get_result_count(self) -> int:
+
+        if self.__result_count is None:
+            for _ in self.get_results():
+                pass
+
+        return self.__result_count
@@ -0,0 +1,139 @@
+import json
+import logging
+import os
+import threading
+import time
+
+# StateStore - class to persist what was published to JIRA between runs, so findings that did not change can skip all JIRA traffic.
+# The state is a JSON file that can be cached between CI runs. Issues are keyed by project key and issue summary.
+class StateStore:
+
+    STATE_VERSION = 1
+
+    # StateStore Constructor
+    # logger: Logger object
+    # file_path: Path of the JSON state file
+    # ttl_hours: Number of hours an issue entry is trusted for. 0 never expires the entries
+    #
+    # Returns: StateStore object
+    # Raises: None
+    def __init__(self, logger: logging.Logger, file_path: str, ttl_hours: int = 0):
+        self.logger = logger
+        self.file_path = file_path
+        self.ttl_hours = ttl_hours
+        self.__lock = threading.Lock()
+        self.__state = self.load()
+
+    # Load the state file, returns an empty state if the file does not exist or can't be read
+    def load(self) -> dict:
+
+        empty_state = { 'version': self.STATE_VERSION, 'issues': {} }
+
+        if not os.path.isfile(self.file_path):
+            self.logger.debug("State file not found, starting with an empty state - " + self.file_path)
+            return empty_state
+
+        try:
+            with open(self.file_path, 'r') as state_file:
+                state = json.load(state_file)
+
+            if state.get('version') != self.STATE_VERSION:
+                self.logger.warning("State file version mismatch, starting with an empty state - " + self.file_path)
+                return empty_state
+
+            self.logger.debug("State file loaded - " + self.file_path)
+            return state
+
+        except Exception as e:
+            self.logger.warning("Error loading state file, starting with an empty state - " + self.file_path + " - " + str(e))
+            return empty_state
+
+    # Write the state file. The file is replaced atomically so an interrupted run can't leave a truncated state behind.
+    def save(self):
+
+        with self.__lock:
+            temp_file_path = self.file_path + '.tmp'
+            with open(temp_file_path, 'w') as state_file:
+                json.dump(self.__state, state_file)
+            os.replace(temp_file_path, self.file_path)
+
+        self.logger.debug("State file saved - " + self.file_path)
+
+    # Get the state of an issue, returns None if the issue is unknown or its entry is older than the TTL
+    def get_issue(self, project_key: str, issue_summary: str) -> dict:
+
+        with self.__lock:
+            issue_state = self.__state['issues'].get(project_key, {}).get(issue_summary)
+
+        if issue_state is None:
+            return None
+
+        if self.ttl_hours > 0 and time.time() - issue_state['updated_at'] > self.ttl_hours * 3600:
+            self.logger.debug("State entry expired - " + issue_summary)
+            return None
+
+        return issue_state
+
+    # Record the JIRA issue key and the content digest of an issue
+    def put_issue(self, project_key: str, issue_summary: str, issue_key: str, digest: str):
+
+        with self.__lock:
+            self.__state['issues'].setdefault(project_key, {}).update({
+                issue_summary: {
+                    'key': issue_key,
+                    'digest': digest,
+                    'updated_at': time.time()
+                }
+            })
+
+    # Get the cached metadata of a project, returns None if the project is unknown or its entry is older than the TTL
+    def get_project(self, project_key: str) -> dict:
+
+        with self.__lock:
+            project_state = self.__state.get('projects', {}).get(project_key)
+
+        if project_state is None:
+            return None
+
+        if self.ttl_hours > 0 and time.time() - project_state['updated_at'] > self.ttl_hours * 3600:
+            self.logger.debug("State entry expired - project " + project_key)
+            return None
+
+        return project_state
+
+    # Record the ID and the issue type IDs of a project. issue_types and sub_task_issue_types are dicts of issue type name -> issue type ID
+    def put_project(self, project_key: str, project_id: str, issue_types: dict, sub_task_issue_types: dict = {}):
+
+        with self.__lock:
+            self.__state.setdefault('projects', {}).update({
+                project_key: {
+                    'id': project_id,
+                    'issue_types': issue_types,
+                    'sub_task_issue_types': sub_task_issue_types,
+                    'updated_at': time.time()
+                }
+            })
+
+    # Get the finding fingerprints recorded by the previous run, returns a dict of tool name -> file name -> set of fingerprints
+    def get_fingerprints(self) -> dict:
+
+        with self.__lock:
+            return {
+                sarif_tool_name: { file_name: set(file_fingerprints) for file_name, file_fingerprints in tool_fingerprints.items() }
+                for sarif_tool_name, tool_fingerprints in self.__state.get('fingerprints', {}).items()
+            }
+
+    # Record the finding fingerprints of this run, replacing the previous ones. fingerprints is a dict of tool name -> file name -> set of fingerprints
+    def put_fingerprints(self, fingerprints: dict):
+
+        with self.__lock:
+            self.__state['fingerprints'] = {
+                sarif_tool_name: { file_name: sorted(file_fingerprints) for file_name, file_fingerprints in tool_fingerprints.items() }
+                for sarif_tool_name, tool_fingerprints in fingerprints.items()
+            }
+
+    # Forget an issue, so the next run reconciles it against JIRA
+    def remove_issue(self, project_key: str, issue_summary: str):
+
+        with self.__lock:
+            self.__state['issues'].get(project_key, {}).pop(issue_summary, None)
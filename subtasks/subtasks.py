@@ -0,0 +1,198 @@
+import re
+import logging
+from jira.client import JIRA
+from atlassian.adf import AtlassianDocumentFormatBuilder
+from executor.executor import UpsertExecutor
+from utils.utils import Utils
+from findings.findings import Finding
+
+# SubTasks - class to sync one JIRA sub-task per finding under the issue of its file, when `jira.create_sub_tasks` is set.
+# A sub-task is identified by a label holding the fingerprint of its finding. The open sub-tasks of up to `search_batch_size` parent issues are
+# fetched by a single search, and the fingerprints are diffed as sets: new findings get sub-tasks created in bulk, and the sub-tasks
+# of findings that are gone are transitioned, e.g. to "Done", when a transition is set.
+# When each SARIF report is synced on its own, the issue of a file is shared by the tools reporting on it, so each sub-task is also labelled
+# with its tool and a report only diffs the sub-tasks of its own tool. Otherwise each tool would close the sub-tasks of the others on every run.
+class SubTasks:
+
+    # Prefix of the label holding the fingerprint of the finding of a sub-task
+    FINGERPRINT_LABEL_PREFIX = 'sarif-fingerprint-'
+
+    # Prefix of the label holding the tool name of the finding of a sub-task, when label_tools is set
+    TOOL_LABEL_PREFIX = 'sarif-tool-'
+
+    # Longest summary accepted by JIRA, in characters
+    MAX_SUMMARY_LENGTH = 255
+
+    # SubTasks Constructor
+    # logger: Logger object
+    # jira_credentials: JIRA credentials object
+    # utils: Utils object
+    # project_id: Project ID string
+    # issue_type_id: ID of the sub-task issue type of the project
+    # default_issue_labels: Default issue labels list, added to every sub-task
+    # use_atlassian_document_format: Render the sub-task descriptions in the Atlassian Document Format
+    # transition_name: Name of the transition applied to the sub-tasks of findings that are gone, e.g. `Done`. '' leaves them open
+    # search_batch_size: Maximum number of parent issues whose sub-tasks are fetched by one search
+    # bulk_create_batch_size: Maximum number of sub-tasks created per bulk create request. JIRA Cloud accepts up to 50
+    # label_tools: Label each sub-task with its tool and sync the sub-tasks of each tool on their own, set when the SARIF reports are not merged
+    #
+    # Returns: SubTasks object
+    # Raises: None
+    def __init__(self, logger: logging.Logger, jira_credentials: JIRA, utils: Utils, project_id: str, issue_type_id: str, default_issue_labels: list = [], use_atlassian_document_format: bool = False, transition_name: str = '', search_batch_size: int = 50, bulk_create_batch_size: int = 50, label_tools: bool = False):
+        self.logger = logger
+        self.jira = jira_credentials
+        self.utils = utils
+        self.project_id = project_id
+        self.issue_type_id = issue_type_id
+        self.default_issue_labels = default_issue_labels
+        self.use_atlassian_document_format = use_atlassian_document_format
+        self.transition_name = transition_name
+        self.search_batch_size = search_batch_size
+        self.bulk_create_batch_size = bulk_create_batch_size
+        self.label_tools = label_tools
+        self.adf_builder = AtlassianDocumentFormatBuilder(logger=logger)
+
+    # Get the summary of the sub-task of a finding. JIRA summaries are a single line of at most 255 characters
+    def get_sub_task_summary(self, file_key: str, finding: Finding) -> str:
+
+        summary = ' '.join((finding.ruleId + ": " + finding.message + " - " + (finding.file or file_key) + ":" + str(finding.startLine if finding.startLine is not None else "")).split())
+        return summary if len(summary) <= self.MAX_SUMMARY_LENGTH else summary[:self.MAX_SUMMARY_LENGTH - 1] + '…'
+
+    # Get the label of the sub-tasks of a tool, '' unless label_tools is set. JIRA labels can't contain spaces, e.g. `ESLint 8` is labelled `sarif-tool-eslint-8`
+    def get_tool_label(self, tool_name: str) -> str:
+
+        if not self.label_tools or not tool_name:
+            return ''
+
+        return self.TOOL_LABEL_PREFIX + (re.sub(r'[^a-z0-9._-]+', '-', str(tool_name).lower()).strip('-') or 'unknown')
+
+    # Build the fields of the sub-task of a finding
+    def __build_sub_task_fields(self, parent_key: str, file_key: str, finding: Finding, tool_label: str = '') -> dict:
+
+        if self.use_atlassian_document_format:
+            adf_doc = self.adf_builder.build_atlassian_document_format_from_finding(key=file_key, result=finding)
+            description = adf_doc.payload if adf_doc is not None else ''
+        else:
+            description = self.utils.serialize_finding_attributes(finding_file_key=file_key, findings=finding)
+
+        return {
+            'project': {'id': self.project_id},
+            'parent': {'key': parent_key},
+            'summary': self.get_sub_task_summary(file_key=file_key, finding=finding),
+            'description': description,
+            'issuetype': {'id': self.issue_type_id},
+            'labels': list(self.default_issue_labels) + [self.FINGERPRINT_LABEL_PREFIX + finding.fingerprint] + ([tool_label] if tool_label else [])
+        }
+
+    # Get the open sub-tasks of parent issues with a single search, returns a dict of parent issue key -> fingerprint -> sub-task key.
+    # tool_label: Only get the sub-tasks with this label, '' gets the sub-tasks of every tool
+    def get_open_sub_tasks(self, parent_keys: list[str], tool_label: str = '') -> dict:
+
+        sub_tasks = { parent_key: {} for parent_key in parent_keys }
+
+        issues = self.jira.search_issues(
+            'parent in (' + ', '.join(parent_keys) + ') AND statusCategory != Done',
+            maxResults=False,
+            fields='labels,parent'
+        )
+
+        for issue in issues:
+            if tool_label and tool_label not in issue.fields.labels:
+                continue
+
+            parent_sub_tasks = sub_tasks.setdefault(issue.fields.parent.key, {})
+            for label in issue.fields.labels:
+                if label.startswith(self.FINGERPRINT_LABEL_PREFIX):
+                    parent_sub_tasks[label[len(self.FINGERPRINT_LABEL_PREFIX):]] = issue.key
+
+        return sub_tasks
+
+    # Create a batch of sub-tasks with a single bulk create request, returns the keys of the sub-tasks created.
+    # Sub-tasks rejected by the bulk request are created one at a time, and errors are logged rather than raised so a retry doesn't duplicate them.
+    def create_sub_tasks_in_bulk(self, field_list: list[dict]) -> list[str]:
+
+        sub_task_keys = []
+        failed_fields = []
+
+        for bulk_result in self.jira.create_issues(field_list=field_list, prefetch=False):
+            if bulk_result['status'] == 'Success':
+                sub_task_keys.append(bulk_result['issue'].key)
+            else:
+                self.logger.warning("Bulk create failed for Sub-task - " + bulk_result['input_fields']['summary'] + " - " + str(bulk_result['error']))
+                failed_fields.append(bulk_result['input_fields'])
+
+        for fields in failed_fields:
+            try:
+                sub_task_keys.append(self.jira.create_issue(fields=fields).key)
+            except Exception as e:
+                self.logger.error("Error creating Sub-task - " + fields['summary'] + " - " + str(e))
+
+        self.logger.info("Bulk created " + str(len(sub_task_keys)) + " of " + str(len(field_list)) + " Sub-task(s).")
+        return sub_task_keys
+
+    # Transition the sub-task of a finding that is gone, returns True if the sub-task was transitioned
+    def close_sub_task(self, issue_key: str) -> bool:
+
+        self.jira.transition_issue(issue_key, self.transition_name)
+        self.logger.info("Sub-task transitioned to " + self.transition_name + " - " + issue_key)
+        return True
+
+    # Sync the sub-tasks of parent issues with their findings, returns the number of sub-tasks created and closed.
+    # parent_findings: Dict of parent issue key -> (file name, list of Finding objects). Every finding needs its `fingerprint` attribute
+    # new_parent_keys: Keys of the parent issues created by this run. They have no sub-tasks yet, so they are not searched
+    # tool_name: Name of the tool of the findings. When label_tools is set, only the sub-tasks of this tool are synced
+    def sync_sub_tasks(self, executor: UpsertExecutor, parent_findings: dict, new_parent_keys: set = set(), tool_name: str = '') -> tuple[int, int]:
+
+        tool_label = self.get_tool_label(tool_name=tool_name)
+
+        # Fetch the open sub-tasks of the existing parent issues, one search per batch of parent issues
+        existing_parent_keys = [ parent_key for parent_key in parent_findings.keys() if parent_key not in new_parent_keys ]
+        open_sub_tasks = {}
+        for batch_sub_tasks in executor.run_upserts(
+            upsert_function=self.get_open_sub_tasks,
+            upsert_kwargs_list=[
+                {'parent_keys': existing_parent_keys[index:index + self.search_batch_size], 'tool_label': tool_label}
+                for index in range(0, len(existing_parent_keys), self.search_batch_size)
+            ],
+            issue_count=0
+        ):
+            open_sub_tasks.update(batch_sub_tasks)
+
+        # Diff the fingerprints of the findings with the fingerprints of the open sub-tasks
+        create_fields, close_keys = [], []
+        for parent_key, (file_key, findings) in parent_findings.items():
+
+            parent_sub_tasks = open_sub_tasks.get(parent_key, {})
+            findings_by_fingerprint = { finding.fingerprint: finding for finding in findings }
+
+            for fingerprint in findings_by_fingerprint.keys() - parent_sub_tasks.keys():
+                create_fields.append(self.__build_sub_task_fields(parent_key=parent_key, file_key=file_key, finding=findings_by_fingerprint[fingerprint], tool_label=tool_label))
+
+            close_keys += [ parent_sub_tasks[fingerprint] for fingerprint in parent_sub_tasks.keys() - findings_by_fingerprint.keys() ]
+
+        self.logger.info(
+            "Sub-tasks of " + str(len(parent_findings)) + " Issue(s) - " + str(len(create_fields)) + " to create, " + str(len(close_keys)) + " of fixed findings" + \
+            ("" if self.transition_name else " left open, set `jira.fixed_issue_transition` to close them")
+        )
+
+        executor.run_upserts(
+            upsert_function=self.create_sub_tasks_in_bulk,
+            upsert_kwargs_list=[
+                {'field_list': create_fields[index:index + self.bulk_create_batch_size]}
+                for index in range(0, len(create_fields), self.bulk_create_batch_size)
+            ],
+            issue_count=len(create_fields)
+        )
+
+        if not self.transition_name:
+            return len(create_fields), 0
+
+        executor.run_upserts(upsert_function=self.close_sub_task, upsert_kwargs_list=[{'issue_key': issue_key} for issue_key in close_keys])
+
+        return len(create_fields), len(close_keys)
+
+    # Close the open sub-tasks of parent issues whose findings are all fixed, of every tool, returns the number of sub-tasks closed
+    def close_sub_tasks_of_parents(self, executor: UpsertExecutor, parent_keys: list[str]) -> int:
+
+        _, sub_tasks_closed = self.sync_sub_tasks(executor=executor, parent_findings={ parent_key: ('', []) for parent_key in parent_keys })
+        return sub_tasks_closed
@@ -0,0 +1,90 @@
+import itertools
+import json
+import logging
+import threading
+from datetime import timedelta
+from http import HTTPStatus
+from urllib.parse import urlparse
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# DryRunAdapter - requests transport adapter that sends the read calls (GET) to JIRA, and records every write call (issue create, update,
+# labels, properties, transitions) to a JSON Lines plan file instead of sending it. Writes are answered with a synthetic response,
+# e.g. a `DRYRUN-<n>` key for created issues, so the whole run completes without changing JIRA.
+class DryRunAdapter(BaseAdapter):
+
+    DRY_RUN_KEY_PREFIX = 'DRYRUN-'
+
+    # DryRunAdapter Constructor
+    # logger: Logger object
+    # adapter: Adapter sending the read calls, i.e. the connection pool to JIRA or the fake JIRA
+    # plan_file_path: Path of the JSON Lines plan file, one line per write call. The file is overwritten
+    # get_operation: Function returning the operation type of a call from its method and URL, see JiraTransport.get_jira_operation()
+    #
+    # Returns: DryRunAdapter object
+    # Raises: None
+    def __init__(self, logger: logging.Logger, adapter: BaseAdapter, plan_file_path: str, get_operation):
+        super().__init__()
+        self.logger = logger
+        self.adapter = adapter
+        self.plan_file_path = plan_file_path
+        self.get_operation = get_operation
+        self.planned_count = 0
+        self.__lock = threading.Lock()
+        self.__issue_ids = itertools.count(1)
+        self.__plan_file = open(plan_file_path, 'w')
+
+    # Get the synthetic response body of a write call, the same as JIRA returns for it
+    def __get_response_body(self, operation: str, base_url: str, body: dict) -> tuple[int, dict]:
+
+        if operation == 'create':
+            return 201, self.__new_issue(base_url)
+        if operation == 'bulk_create':
+            return 201, {'issues': [self.__new_issue(base_url) for _ in body.get('issueUpdates', [])], 'errors': []}
+
+        return 204, None
+
+    def __new_issue(self, base_url: str) -> dict:
+        issue_id = str(next(self.__issue_ids))
+        return {'id': issue_id, 'key': self.DRY_RUN_KEY_PREFIX + issue_id, 'self': base_url + '/rest/api/2/issue/' + issue_id}
+
+    def send(self, request: PreparedRequest, stream=False, timeout=None, verify=True, cert=None, proxies=None) -> Response:
+
+        if request.method in ['GET', 'HEAD', 'OPTIONS']:
+            return self.adapter.send(request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+
+        request_body = request.body.decode('utf-8') if isinstance(request.body, bytes) else request.body
+        body = json.loads(request_body) if request_body else {}
+        url = urlparse(request.url)
+        operation = self.get_operation(method=request.method, url=request.url)
+
+        with self.__lock:
+            status, response_body = self.__get_response_body(operation=operation, base_url=url.scheme + '://' + url.netloc, body=body)
+            self.__plan_file.write(json.dumps({
+                'operation': operation,
+                'method': request.method,
+                'path': url.path + ('?' + url.query if url.query else ''),
+                'body': body
+            }) + '\n')
+            self.planned_count += 1
+
+        response = Response()
+        response.status_code = status
+        response.reason = HTTPStatus(status).phrase
+        response.url = request.url
+        response.request = request
+        response.encoding = 'utf-8'
+        response.elapsed = timedelta(0)
+        response._content = json.dumps(response_body).encode('utf-8') if response_body is not None else b''
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json', 'Content-Length': str(len(response._content))})
+        return response
+
+    def close(self):
+
+        with self.__lock:
+            if not self.__plan_file.closed:
+                self.__plan_file.close()
+                self.logger.info("Dry run - " + str(self.planned_count) + " JIRA write call(s) recorded to the plan file " + self.plan_file_path)
+
+        self.adapter.close()
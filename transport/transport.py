@@ -0,0 +1,202 @@
+import json
+import logging
+import re
+import threading
+from urllib.parse import urlparse
+from jira import JIRA
+from jira.resources import Issue
+from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from fake_jira.fake_jira import FakeJira, FakeJiraAdapter
+from report.report import RunReport
+from transport.dry_run import DryRunAdapter
+
+# Send an edit request for a JIRA issue with a single PUT of `data`, e.g. its fields and issue properties.
+# Issue.update() would GET the issue before the PUT and reload it after, and can't send the issue properties. This relies on the private session
+# and URL builder of the JIRA client, as in jira 3.10.5 (see requirements.txt), so it is the only place that calls them.
+def put_issue(jira: JIRA, issue_id: str, data: dict, notify: bool = True):
+
+    jira._session.put(
+        jira._get_url('issue/' + str(issue_id)) + ('' if notify else '?notifyUsers=false'),
+        data=json.dumps(data)
+    )
+
+# Build a local Issue object from its raw JSON, e.g. of an issue just created or edited, without fetching it. Relies on the private options
+# and session of the JIRA client, as in jira 3.10.5 (see requirements.txt)
+def build_issue(jira: JIRA, raw: dict) -> Issue:
+    return Issue(jira._options, jira._session, raw=raw)
+
+# JiraTransport - class to build a JIRA client over a tuned HTTP session: a connection pool sized for the upsert workers, compressed responses,
+# a timeout on every call and a single retry policy with jittered exponential backoff. It also counts the connections opened and reused.
+# The calls can be served in-process by a fake JIRA instead, and the write calls can be recorded to a plan file instead of being sent (dry run).
+class JiraTransport:
+
+    # Responses retried by the transport. JIRA rejects these requests before processing them, so retrying a POST can't create an issue twice.
+    RETRY_STATUS_CODES = [429, 503]
+
+    # JiraTransport Constructor
+    # logger: Logger object
+    # pool_size: Number of connections kept open to JIRA. Should match the number of concurrent upsert workers
+    # timeout: Connect and read timeout of every call, in seconds. 0 disables the timeout
+    # max_retries: Number of times a call is retried after a connection error, 429 Too Many Requests or 503 Service Unavailable
+    # retry_backoff: Base delay of the exponential backoff between retries, in seconds. Retry-After is honoured when present
+    # max_retry_delay: Longest delay between two retries, in seconds
+    # run_report: RunReport object recording every JIRA call by operation type. None doesn't record the calls
+    # fake_jira: FakeJira object serving the calls in-process instead of JIRA, e.g. for benchmarks. None sends the calls to JIRA
+    # plan_file_path: Path of the JSON Lines plan file recording the write calls instead of sending them. '' sends the write calls
+    #
+    # Returns: JiraTransport object
+    # Raises: None
+    def __init__(self, logger: logging.Logger, pool_size: int = 10, timeout: int = 30, max_retries: int = 3, retry_backoff: float = 1.0, max_retry_delay: int = 60, run_report: RunReport = None, fake_jira: FakeJira = None, plan_file_path: str = ''):
+        self.logger = logger
+        self.run_report = run_report
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout if timeout > 0 else None
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.max_retry_delay = max_retry_delay
+        self.fake_jira = fake_jira
+        self.plan_file_path = plan_file_path
+        self.adapter = self.session_adapter = None
+        self.__lock = threading.Lock()
+        self.response_count = self.compressed_response_count = 0
+        self.__closed_connection_stats = None # connection stats taken when the connections are closed, as closing empties the pools
+
+    # Build the retry policy of the connection pool. Read errors are not retried, as JIRA may have processed the request already.
+    def __build_retry(self) -> Retry:
+        return Retry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=0,
+            status=self.max_retries,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            allowed_methods=None,
+            backoff_factor=self.retry_backoff,
+            backoff_max=self.max_retry_delay,
+            backoff_jitter=self.retry_backoff,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+
+    # Get the operation type of a JIRA REST API call from its method and URL, e.g. `search`, `create` or `update`
+    def get_jira_operation(self, method: str, url: str) -> str:
+
+        path = re.sub(r'^.*/rest/api/[^/]+/', '', urlparse(url).path)
+
+        if path.startswith('search'):
+            return 'search'
+        if path == 'issue/bulk':
+            return 'bulk_create'
+        if path == 'issue':
+            return 'create'
+        if re.match(r'^issue/[^/]+/transitions$', path):
+            return 'transition'
+        if re.match(r'^issue/[^/]+/properties/', path):
+            return 'property'
+        if re.match(r'^issue/[^/]+$', path):
+            return 'update' if method == 'PUT' else 'get' if method == 'GET' else method.lower()
+        if path.split('/')[0] in ['serverInfo', 'field', 'project', 'myself']:
+            return 'metadata'
+
+        return 'other'
+
+    # Count the responses and the ones JIRA sent compressed, and record the call in the run report
+    def __count_response(self, response: Response, *args, **kwargs):
+
+        with self.__lock:
+            self.response_count += 1
+            if response.headers.get('Content-Encoding') in ['gzip', 'deflate']:
+                self.compressed_response_count += 1
+
+        if self.run_report is not None:
+
+            # The retries made by the connection pool before this response
+            retries = getattr(response.raw, 'retries', None)
+            request_body = response.request.body or b''
+
+            self.run_report.record_jira_call(
+                operation=self.get_jira_operation(method=response.request.method, url=response.request.url),
+                seconds=response.elapsed.total_seconds(),
+                retries=len(retries.history) if retries is not None else 0,
+                error=not response.ok,
+                bytes_sent=len(request_body.encode('utf-8') if isinstance(request_body, str) else request_body),
+                bytes_received=int(response.headers.get('Content-Length', len(response.content)))
+            )
+
+    # Create a JIRA client using the tuned HTTP session
+    def create_client(self, server: str, basic_auth: tuple) -> JIRA:
+
+        # The server info is fetched once the session is tuned, so that the first call goes through the connection pool too
+        jira = JIRA(
+            server=server,
+            basic_auth=basic_auth,
+            timeout=self.timeout,
+            max_retries=self.max_retries,
+            get_server_info=False,
+            options={'headers': {'Accept-Encoding': 'gzip, deflate'}}
+        )
+
+        # The connection pool retries with jitter, so the JIRA session makes a single attempt per call.
+        # A 429 that outlasts the retries is raised as a JIRAError, for the upsert executor to back off all of its workers.
+        jira._session.max_retries = 0
+
+        if self.fake_jira is not None:
+            self.session_adapter = FakeJiraAdapter(fake_jira=self.fake_jira)
+        else:
+            self.adapter = self.session_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=self.__build_retry())
+
+        if self.plan_file_path:
+            self.session_adapter = DryRunAdapter(logger=self.logger, adapter=self.session_adapter, plan_file_path=self.plan_file_path, get_operation=self.get_jira_operation)
+
+        jira._session.mount('https://', self.session_adapter)
+        jira._session.mount('http://', self.session_adapter)
+        jira._session.hooks['response'].append(self.__count_response)
+
+        # Same as JIRA(get_server_info=True). The version and deployment type select the API calls, e.g. the search endpoint on JIRA Cloud
+        server_info = jira.server_info()
+        jira._version = tuple(server_info["versionNumbers"])
+        jira.deploymentType = server_info.get("deploymentType")
+
+        self.logger.debug(
+            "JIRA transport - pool size " + str(self.pool_size) + ", timeout " + str(self.timeout) + "s, " + str(self.max_retries) + " retries" + \
+            (", fake JIRA" if self.fake_jira is not None else "") + (", dry run" if self.plan_file_path else "")
+        )
+        return jira
+
+    # Close the connections, and the plan file of a dry run
+    def close(self):
+
+        if self.__closed_connection_stats is None:
+            self.__closed_connection_stats = self.get_connection_stats()
+
+        if self.session_adapter is not None:
+            self.session_adapter.close()
+
+    # Get the number of connections opened and the number of requests sent over the connection pool. There is no connection to the fake JIRA.
+    # Once the connections are closed, returns the stats taken when they were closed
+    def get_connection_stats(self) -> tuple[int, int]:
+
+        if self.__closed_connection_stats is not None:
+            return self.__closed_connection_stats
+
+        opened_count = request_count = 0
+
+        if self.adapter is not None:
+            for pool_key in self.adapter.poolmanager.pools.keys():
+                pool = self.adapter.poolmanager.pools[pool_key]
+                opened_count += pool.num_connections
+                request_count += pool.num_requests
+
+        return opened_count, request_count
+
+    # Log the connections opened and reused, to confirm the connection pool is used under load
+    def log_connection_stats(self):
+
+        opened_count, request_count = self.get_connection_stats()
+
+        self.logger.info(
+            "JIRA requests sent - " + str(request_count) + " over " + str(opened_count) + " connection(s) opened, " + \
+            str(max(0, request_count - opened_count)) + " connection reuse(s), " + \
+            str(self.compressed_response_count) + " of " + str(self.response_count) + " response(s) compressed."
+        )
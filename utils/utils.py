@@ -1,5 +1,7 @@
 import logging
 import os
+from pagination.pagination import DescriptionPaginator
+from findings.findings import Finding
 
 class Utils:
 
@@ -11,30 +13,43 @@ class Utils:
     def __init__(self, logger: logging.Logger):
         self.logger = logger
 
+    # Get the workspace directory, the current working directory or the GITHUB_WORKSPACE environment variable if running inside GitHub Actions
+    def get_workspace_directory(self) -> str:
+
+        if 'GITHUB_ACTIONS' in os.environ.keys():
+            return os.environ.get('GITHUB_WORKSPACE')
+
+        return os.getcwd()
+
     # Check if a finding attribute exists, returns True 
     def check_if_finding_attribute_exists(self, source: any, key_str: str) -> bool:
 
         if type(source) == type([]) or type(source) == type({}):
             return key_str in source
         
-    # Serializes attributes into a string of findings, returns str 
-    def serialize_finding_attributes(self, finding_file_key: str, findings: dict) -> str:
+    # Serializes the attributes of a finding into a string, returns str
+    def serialize_finding_attributes(self, finding_file_key: str, findings: Finding) -> str:
 
-        result_str = ''
-        for attribute in findings.keys():
+        result_str = findings.ruleId + ': ' + findings.message + ' - ' + (findings.file or finding_file_key)
 
-            if attribute == "ruleId":
-                result_str = findings[attribute] + ': ' + result_str
+        for attribute in Finding.REGION_FIELDS:
 
-            if attribute == "message":
-                result_str += findings[attribute] + ' - ' + finding_file_key + "\n"
+            value = getattr(findings, attribute)
+            if value is not None:
+                result_str += "\n" + attribute + ' = ' + str(value)
 
-        for attribute in findings.keys():
+        return result_str
 
-            if attribute not in [ "ruleId", "message" ]:
-                result_str += attribute + ' = ' + str(findings[attribute]) + "\n"
+    # Serializes the findings of a file into descriptions split into pages that fit in a JIRA issue description, see DescriptionPaginator. Returns a list of str, one per page.
+    def serialize_findings_pages(self, finding_file_key: str, findings: list, paginator: DescriptionPaginator) -> list[str]:
 
-        if result_str[-1:] == '\n':
-            return result_str[:-1]
-        
-        return result_str
\ No newline at end of file
+        separator = "\n___\n"
+
+        pages = paginator.paginate(
+            blocks=[self.serialize_finding_attributes(finding_file_key=finding_file_key, findings=finding) + separator for finding in findings],
+            get_length=len,
+            continuation_block="Findings continued from " + finding_file_key + separator,
+            truncate_block=lambda block, max_length: block[:max(0, max_length - len('…' + separator))] + '…' + separator
+        )
+
+        return [ ''.join(page) for page in pages ]